@@ -1,6 +1,7 @@
 from transformers import T5Tokenizer, T5ForConditionalGeneration
 import torch
 import json
+import logging
 import re
 import os
 import fitz  # PyMuPDF
@@ -9,16 +10,18 @@ from typing import Dict, List
 import time
 from tqdm import tqdm
 
+logger = logging.getLogger('resume_extraction.flan_t5_parser')
+
 class FlanT5ResumeParser:
     def __init__(self):
         model_name = "google/flan-t5-base"
-        print(f"🤖 Loading {model_name}...")
+        logger.info('Loading %s...', model_name)
         
         self.tokenizer = T5Tokenizer.from_pretrained(model_name)
         self.model = T5ForConditionalGeneration.from_pretrained(model_name)
         self.output_dir = "parsed_data"
         os.makedirs(self.output_dir, exist_ok=True)
-        print("✅ Model loaded successfully!")
+        logger.info('Model loaded successfully!')
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF file"""
@@ -30,13 +33,13 @@ class FlanT5ResumeParser:
             doc.close()
             return text.strip()
         except Exception as e:
-            print(f"❌ Error extracting text from {pdf_path}: {e}")
+            logger.error('Error extracting text from %s: %s', pdf_path, e)
             return ""
     
     def parse_resume_with_flan(self, resume_text: str, filename: str = "") -> Dict:
         """Parse resume with visual progress"""
         if filename:
-            print(f"🔍 Analyzing: {filename}")
+            logger.info('Analyzing: %s', filename, extra={'sampled': True})
         
         # Use structured prompts for better results
         return {
@@ -105,48 +108,48 @@ class FlanT5ResumeParser:
         """Process all PDF files with visual progress"""
         all_resumes = []
         
-        print(f"📂 Scanning directory: {resume_dir}")
+        logger.info('Scanning directory: %s', resume_dir)
         
         if not os.path.exists(resume_dir):
-            print(f"❌ Directory does not exist: {resume_dir}")
+            logger.error('Directory does not exist: %s', resume_dir)
             return all_resumes
         
         # Find all PDF files
         pdf_files = []
-        print("🔍 Finding PDF files...")
+        logger.info('Finding PDF files...')
         
         for item in os.listdir(resume_dir):
             item_path = os.path.join(resume_dir, item)
             
             if os.path.isdir(item_path):
                 category = item.upper()
-                print(f"📁 Checking folder: {category}")
+                logger.info('Checking folder: %s', category)
                 
                 for file in os.listdir(item_path):
                     if file.lower().endswith('.pdf'):
                         file_path = os.path.join(item_path, file)
                         pdf_files.append((file_path, category))
         
-        print(f"📄 Found {len(pdf_files)} PDF files to process")
+        logger.info('Found %s PDF files to process', len(pdf_files))
         
         if len(pdf_files) == 0:
-            print("❌ No PDF files found!")
+            logger.warning('No PDF files found!')
             return all_resumes
         
         # Process each PDF with progress
         for i, (pdf_path, category) in enumerate(pdf_files, 1):
             filename = os.path.basename(pdf_path)
-            print(f"\n[{i}/{len(pdf_files)}] Processing: {filename}")
+            logger.info('[%s/%s] Processing: %s', i, len(pdf_files), filename, extra={'sampled': True})
             
             try:
                 # Extract text
                 resume_text = self.extract_text_from_pdf(pdf_path)
                 
                 if not resume_text:
-                    print(f"⚠️ No text extracted from {filename}")
+                    logger.warning('No text extracted from %s', filename)
                     continue
                 
-                print(f"📝 Extracted {len(resume_text)} characters")
+                logger.info('Extracted %s characters', len(resume_text), extra={'sampled': True})
                 
                 # Parse with FLAN-T5
                 parsed_resume = self.parse_resume_with_flan(resume_text, filename)
@@ -155,26 +158,26 @@ class FlanT5ResumeParser:
                     parsed_resume["filename"] = filename
                     parsed_resume["category"] = category
                     all_resumes.append(parsed_resume)
-                    print(f"✅ Successfully parsed {filename}")
-                    print(f"   Summary: {parsed_resume['summary'][:100]}...")
+                    logger.info('Successfully parsed %s', filename, extra={'sampled': True})
+                    logger.info('Summary: %.100s...', parsed_resume['summary'], extra={'sampled': True})
                 
                 time.sleep(1)  # Small delay
                 
             except Exception as e:
-                print(f"❌ Error processing {filename}: {e}")
+                logger.error('Error processing %s: %s', filename, e)
                 continue
         
         return all_resumes
     
     def save_results(self, parsed_resumes: List[Dict]):
         """Save results to JSON and CSV"""
-        print("\n💾 Saving results...")
+        logger.info('Saving results...')
         
         # Save JSON
         json_path = os.path.join(self.output_dir, "flan_t5_parsed_resumes.json")
         with open(json_path, "w", encoding="utf-8") as f:
             json.dump(parsed_resumes, f, indent=2, ensure_ascii=False)
-        print(f"📄 JSON saved: {json_path}")
+        logger.info('JSON saved: %s', json_path)
         
         # Convert to DataFrame for CSV
         df_rows = []
@@ -203,12 +206,13 @@ class FlanT5ResumeParser:
         df = pd.DataFrame(df_rows)
         csv_path = os.path.join(self.output_dir, "flan_t5_parsed_resumes.csv")
         df.to_csv(csv_path, index=False, encoding='utf-8')
-        print(f"📊 CSV saved: {csv_path}")
+        logger.info('CSV saved: %s', csv_path)
         
         return df
 
 # Main execution
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     RESUME_DIR = r"C:\Users\User\OneDrive - Asia Pacific University\Side Project\Resume Project\Resume Dataset\pdf data"
     
     print("🚀 === FLAN-T5 RESUME PARSER ===")
@@ -1,11 +1,14 @@
 import fitz
 import json
+import logging
 import os
 import requests
 import pandas as pd
 from typing import Dict, List
 import time
 
+logger = logging.getLogger('resume_extraction.llm_resume_scraper')
+
 class LLMResumeParser:
     def __init__(self, model_name="gemma3:latest"):
         self.model_name = model_name
@@ -25,7 +28,7 @@ class LLMResumeParser:
             doc.close()
             return text.strip()
         except Exception as e:
-            print(f"Error extracting text from {pdf_path}: {e}")
+            logger.error('Error extracting text from %s: %s', pdf_path, e)
             return ""
     
     def parse_resume_with_llm(self, resume_text: str) -> Dict:
@@ -83,7 +86,7 @@ class LLMResumeParser:
         }
         
         try:
-            print("Sending request to Ollama...")
+            logger.info('Sending request to Ollama...', extra={'sampled': True})
             response = requests.post(self.ollama_url, json=payload, timeout=180)
             
             if response.status_code == 200:
@@ -100,22 +103,21 @@ class LLMResumeParser:
                         json_str = response_text[start_idx:end_idx]
                         return json.loads(json_str)
                     else:
-                        print("No JSON found in response")
+                        logger.warning('No JSON found in response')
                         return self._get_empty_structure()
                         
                 except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")
-                    print(f"Response: {response_text[:500]}...")
+                    logger.error('JSON decode error: %s; response: %.500s...', e, response_text)
                     return self._get_empty_structure()
             else:
-                print(f"HTTP Error: {response.status_code}")
+                logger.error('HTTP Error: %s', response.status_code)
                 return self._get_empty_structure()
                 
         except requests.exceptions.Timeout:
-            print("Request timeout - Ollama might be slow")
+            logger.error('Request timeout - Ollama might be slow')
             return self._get_empty_structure()
         except Exception as e:
-            print(f"LLM parsing error: {e}")
+            logger.error('LLM parsing error: %s', e)
             return self._get_empty_structure()
     
     def _get_empty_structure(self):
@@ -146,16 +148,16 @@ class LLMResumeParser:
     def process_resume_file(self, pdf_path: str) -> Dict:
         """Process a single resume file"""
         filename = os.path.basename(pdf_path)
-        print(f"\nProcessing: {filename}")
+        logger.info('Processing: %s', filename, extra={'sampled': True})
         
         # Extract text
         resume_text = self.extract_text_from_pdf(pdf_path)
         
         if not resume_text:
-            print(f"No text extracted from {filename}")
+            logger.warning('No text extracted from %s', filename)
             return None
         
-        print(f"Extracted {len(resume_text)} characters")
+        logger.info('Extracted %s characters', len(resume_text), extra={'sampled': True})
         
         # Parse with LLM
         parsed_data = self.parse_resume_with_llm(resume_text)
@@ -172,24 +174,24 @@ class LLMResumeParser:
         
         # Check if directory exists
         if not os.path.exists(resume_dir):
-            print(f"❌ Directory does not exist: {resume_dir}")
+            logger.error('Directory does not exist: %s', resume_dir)
             return all_resumes
         
-        print(f"📁 Scanning directory: {resume_dir}")
+        logger.info('Scanning directory: %s', resume_dir)
         
         # Look for PDFs in subdirectories (category folders)
         pdf_files = []
         
         try:
             items = os.listdir(resume_dir)
-            print(f"Found {len(items)} items in directory")
+            logger.info('Found %s items in directory', len(items))
             
             for item in items:
                 item_path = os.path.join(resume_dir, item)
                 
                 if os.path.isdir(item_path):
                     category = item.upper()
-                    print(f"📂 Checking category folder: {category}")
+                    logger.info('Checking category folder: %s', category)
                     
                     try:
                         files_in_category = os.listdir(item_path)
@@ -201,41 +203,41 @@ class LLMResumeParser:
                                 pdf_files.append((file_path, category))
                                 pdf_count += 1
                         
-                        print(f"   Found {pdf_count} PDF files in {category}")
+                        logger.info('Found %s PDF files in %s', pdf_count, category)
                         
                     except Exception as e:
-                        print(f"   ❌ Error reading {category}: {e}")
+                        logger.error('Error reading %s: %s', category, e)
         
         except Exception as e:
-            print(f"❌ Error reading main directory: {e}")
+            logger.error('Error reading main directory: %s', e)
             return all_resumes
         
         total_files = len(pdf_files)
-        print(f"\n🎯 Total PDF files found: {total_files}")
+        logger.info('Total PDF files found: %s', total_files)
         
         if total_files == 0:
-            print("❌ No PDF files found! Check your directory structure.")
+            logger.warning('No PDF files found! Check your directory structure.')
             return all_resumes
         
         # Process files
         for i, (pdf_path, category) in enumerate(pdf_files, 1):
             filename = os.path.basename(pdf_path)
-            print(f"\n[{i}/{total_files}] Processing: {filename} (Category: {category})")
+            logger.info('[%s/%s] Processing: %s (Category: %s)', i, total_files, filename, category, extra={'sampled': True})
             
             try:
                 parsed_resume = self.process_resume_file(pdf_path)
                 if parsed_resume:
                     parsed_resume["category"] = category
                     all_resumes.append(parsed_resume)
-                    print(f"✅ Successfully parsed {filename}")
+                    logger.info('Successfully parsed %s', filename, extra={'sampled': True})
                 else:
-                    print(f"❌ Failed to parse {filename}")
+                    logger.error('Failed to parse %s', filename)
                 
                 # Small delay to avoid overwhelming Ollama
                 time.sleep(2)
                 
             except Exception as e:
-                print(f"❌ Error processing {filename}: {e}")
+                logger.error('Error processing %s: %s', filename, e)
                 continue
         
         return all_resumes
@@ -283,14 +285,13 @@ class LLMResumeParser:
         csv_path = os.path.join(self.output_dir, "llm_parsed_resumes.csv")
         df.to_csv(csv_path, index=False, encoding='utf-8')
         
-        print(f"\n✓ Results saved:")
-        print(f"  JSON: {json_path}")
-        print(f"  CSV: {csv_path}")
+        logger.info('Results saved: JSON %s, CSV %s', json_path, csv_path)
         
         return df
 
 # Main execution
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     # Configuration
     RESUME_DIR = r"C:\Users\User\OneDrive - Asia Pacific University\Side Project\Resume Project\Resume Dataset\pdf data"
     
@@ -2,30 +2,58 @@ import os
 import fitz  # PyMuPDF for PDF text extraction
 import re
 import json
+import logging
+import zipfile
+
+# The web app routes 'resume_extraction' loggers to its JSON log handler
+logger = logging.getLogger('resume_extraction.resume_scraper')
 
 # --- Configuration ---
 RESUME_DATASET_DIR = r"C:\Users\User\OneDrive - Asia Pacific University\Side Project\Resume Project\Resume Dataset\pdf data" # Assuming this is in the same directory as your script
 OUTPUT_DIR = "parsed_data"
 
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
 # --- PDF Text Extraction Function ---
 def extract_text_from_pdf(pdf_path):
     """Extracts text from a given PDF file."""
     text = ""
     try:
-        doc = fitz.open(pdf_path)
-        for page_num in range(doc.page_count):
-            page = doc.load_page(page_num)
-            text += page.get_text()
-        doc.close()
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                text += page.get_text()
     except Exception as e:
-        print(f"Error extracting text from {pdf_path}: {e}")
+        logger.error('Error extracting text from %s: %s', pdf_path, e)
     return text
 
+def extract_text_from_docx_file(docx_file):
+    """Extracts paragraph text from a DOCX file path or file object."""
+    with zipfile.ZipFile(docx_file) as docx:
+        xml = docx.read("word/document.xml").decode("utf-8", errors="ignore")
+    paragraphs = re.split(r'</w:p>', xml)
+    return "\n".join(re.sub(r'<[^>]+>', '', paragraph) for paragraph in paragraphs)
+
 # --- Parsing Functions (Generalized for common resume sections) ---
 
+def parse_contact(text):
+    """Extracts name, email, phone and LinkedIn URL from the resume header."""
+    email_match = re.search(r'[\w.+-]+@[\w-]+\.[\w.-]+', text)
+    linkedin_match = re.search(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?', text, re.IGNORECASE)
+    phone_match = re.search(r'(?:\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b', text)
+
+    # The name is usually the first short line without digits or an email
+    name = ""
+    for line in text.split('\n')[:5]:
+        line = line.strip()
+        if line and len(line.split()) <= 4 and not re.search(r'[@\d]', line):
+            name = line
+            break
+
+    return {
+        "name": name,
+        "email": email_match.group(0) if email_match else "",
+        "phone": phone_match.group(0).strip() if phone_match else "",
+        "linkedin_url": linkedin_match.group(0) if linkedin_match else ""
+    }
+
 def parse_summary(text):
     """Extracts the summary section."""
     summary = ""
@@ -254,11 +282,11 @@ def process_resumes_in_directory(root_dir):
     for category_name in os.listdir(root_dir):
         category_path = os.path.join(root_dir, category_name)
         if os.path.isdir(category_path):
-            print(f"Processing category: {category_name}")
+            logger.info('Processing category: %s', category_name)
             for filename in os.listdir(category_path):
                 if filename.lower().endswith(".pdf"):
                     pdf_path = os.path.join(category_path, filename)
-                    print(f"  Extracting text from: {filename}")
+                    logger.info('Extracting text from: %s', filename, extra={'sampled': True})
                     resume_text = extract_text_from_pdf(pdf_path)
 
                     if resume_text:
@@ -275,12 +303,14 @@ def process_resumes_in_directory(root_dir):
                         }
                         all_parsed_resumes.append(parsed_resume)
                     else:
-                        print(f"  Skipping {filename} due to empty content or extraction error.")
+                        logger.warning('Skipping %s due to empty content or extraction error.', filename)
     return all_parsed_resumes
 
 # --- Run the scraper ---
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("Starting resume scraping process...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     # Process all resumes
     parsed_data = process_resumes_in_directory(RESUME_DATASET_DIR)
@@ -1,8 +1,74 @@
 import hashlib
+import logging
 from datetime import datetime
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth.models import User
-from ..views import MongoDBConnection
+from ..views import AsyncMongoDBConnection, MongoDBConnection
+from ..utils.write_behind import get_buffer
+from ..utils.profile_cache import PROFILE_PROJECTION, acache_profile, cache_profile
+
+logger = logging.getLogger(__name__)
+
+# Django User fields mirrored from the resume_login document
+MIRRORED_FIELDS = {
+    'email': ('email', ''),
+    'first_name': ('first_name', ''),
+    'last_name': ('last_name', ''),
+    'is_active': ('is_active', True),
+    'is_staff': ('is_staff', False),
+    'is_superuser': ('is_superuser', False),
+}
+
+# Only what a login needs from resume_login: the mirrored fields plus the cached profile
+LOGIN_PROJECTION = {**PROFILE_PROJECTION, 'is_active': 1, 'is_staff': 1, 'is_superuser': 1}
+
+
+def last_login_buffer():
+    return get_buffer('resume_login', 'last_login', lambda: MongoDBConnection().get_collection())
+
+
+def _mirrored_values(user_data):
+    return {field: user_data.get(key, default) for field, (key, default) in MIRRORED_FIELDS.items()}
+
+
+def _apply_changes(user, values):
+    """Copy changed mirrored values onto user; returns the names of the fields that changed"""
+    changed = [field for field, value in values.items() if getattr(user, field) != value]
+    for field in changed:
+        setattr(user, field, values[field])
+    return changed
+
+
+def sync_django_user(username, user_data):
+    """Get or create the Django User mirroring a Mongo user, saving only fields that changed"""
+    values = _mirrored_values(user_data)
+    # get_or_create absorbs the race between two first logins of the same user
+    user, created = User.objects.get_or_create(username=username, defaults=values)
+    if created:
+        # We don't store password in Django
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+        return user
+
+    changed = _apply_changes(user, values)
+    if changed:
+        user.save(update_fields=changed)
+    return user
+
+
+async def async_sync_django_user(username, user_data):
+    """sync_django_user through the async ORM"""
+    values = _mirrored_values(user_data)
+    user, created = await User.objects.aget_or_create(username=username, defaults=values)
+    if created:
+        user.set_unusable_password()
+        await user.asave(update_fields=['password'])
+        return user
+
+    changed = _apply_changes(user, values)
+    if changed:
+        await user.asave(update_fields=changed)
+    return user
 
 class MongoDBAuthBackend(BaseBackend):
     """
@@ -18,57 +84,52 @@ class MongoDBAuthBackend(BaseBackend):
             mongo = MongoDBConnection()
             password_hash = hashlib.sha256(password.encode()).hexdigest()
             
-            user_data = mongo.find_user({
+            user_data = mongo.get_collection().find_one({
                 'username': username,
                 'password_hash': password_hash,
                 'is_active': True
-            })
+            }, LOGIN_PROJECTION)
             
             if user_data:
-                # Update last_login in MongoDB
-                mongo.get_collection().update_one(
-                    {'username': username},
-                    {'$set': {'last_login': datetime.utcnow()}}
-                )
+                # last_login is written behind, batched with other logins
+                last_login_buffer().record('username', username, datetime.utcnow())
                 
                 # Create or get Django User object for session management
-                try:
-                    user = User.objects.get(username=username)
-                except User.DoesNotExist:
-                    # Create a Django user for session management
-                    user = User.objects.create_user(
-                        username=username,
-                        email=user_data.get('email', ''),
-                        first_name=user_data.get('first_name', ''),
-                        last_name=user_data.get('last_name', ''),
-                        password=None  # We don't store password in Django
-                    )
-                
-                # Update user info from MongoDB
-                user.email = user_data.get('email', '')
-                user.first_name = user_data.get('first_name', '')
-                user.last_name = user_data.get('last_name', '')
-                user.is_active = user_data.get('is_active', True)
-                user.is_staff = user_data.get('is_staff', False)
-                user.is_superuser = user_data.get('is_superuser', False)
-                user.save()
+                user = sync_django_user(username, user_data)
                 
-                # Store MongoDB user data in session for later use
-                if hasattr(request, 'session'):
-                    request.session['mongodb_user_data'] = {
-                        'company': user_data.get('company', ''),
-                        'role': user_data.get('role', ''),
-                        'permissions': user_data.get('permissions', {}),
-                        'profile': user_data.get('profile', {}),
-                        'preferences': user_data.get('preferences', {})
-                    }
+                # Prime the profile cache that pages and the template context read
+                cache_profile(username, user_data)
                 
                 return user
                 
         except Exception as e:
-            print(f"Authentication error: {e}")
+            logger.exception('Authentication error')
             
         return None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """authenticate() for async callers: the lookup goes through the async client"""
+        if username is None or password is None:
+            return None
+
+        try:
+            password_hash = hashlib.sha256(password.encode()).hexdigest()
+            user_data = await AsyncMongoDBConnection().get_collection().find_one({
+                'username': username,
+                'password_hash': password_hash,
+                'is_active': True
+            }, LOGIN_PROJECTION)
+
+            if user_data:
+                last_login_buffer().record('username', username, datetime.utcnow())
+                user = await async_sync_django_user(username, user_data)
+                await acache_profile(username, user_data)
+                return user
+
+        except Exception as e:
+            logger.exception('Authentication error')
+
+        return None
     
     def get_user(self, user_id):
         try:
@@ -1,9 +1,20 @@
+import logging
+from ..views import MongoDBConnection
+from ..utils.profile_cache import get_profile
+
+logger = logging.getLogger(__name__)
+
+
 def mongodb_user_data(request):
     """
     Add MongoDB user data to template context
     """
-    if request.user.is_authenticated and hasattr(request, 'session'):
-        mongodb_data = request.session.get('mongodb_user_data', {})
+    if request.user.is_authenticated:
+        try:
+            mongodb_data = get_profile(request.user.username, lambda: MongoDBConnection().get_collection()) or {}
+        except Exception as e:
+            logger.exception('Error loading user profile for context')
+            mongodb_data = {}
         return {
             'user_company': mongodb_data.get('company', ''),
             'user_role': mongodb_data.get('role', ''),
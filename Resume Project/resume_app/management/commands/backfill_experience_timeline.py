@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection
+from resume_app.utils.experience_timeline import current_month, experience_timeline
+
+
+class Command(BaseCommand):
+    help = 'Compute experience start/end months, experience_years and title_years for existing candidates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute every candidate, not only those missing the fields (brings "Current" positions up to date)'
+        )
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        candidate_collection = mongo.get_collection('candidates')
+        query = {} if options['all'] else {'experience_years': {'$exists': False}}
+        batch_size = options['batch_size']
+        as_of = current_month()
+
+        updated = 0
+        batch = []
+        cursor = candidate_collection.find(query, {'experience': 1}).batch_size(batch_size)
+
+        for candidate in cursor:
+            batch.append(UpdateOne(
+                {'_id': candidate['_id']},
+                {'$set': experience_timeline(candidate.get('experience'), as_of=as_of)}
+            ))
+            if len(batch) >= batch_size:
+                candidate_collection.bulk_write(batch, ordered=False)
+                updated += len(batch)
+                batch = []
+                self.stdout.write(f'  {updated} candidates updated...')
+
+        if batch:
+            candidate_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Experience timeline written for {updated} candidates.'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection
+from resume_app.utils.identity_utils import identity_keys
+
+
+class Command(BaseCommand):
+    help = 'Compute identity_keys for existing candidate documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute keys for every candidate, not only those missing them'
+        )
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        candidate_collection = mongo.get_collection('candidates')
+        query = {} if options['all'] else {'identity_keys': {'$exists': False}}
+        batch_size = options['batch_size']
+
+        updated = 0
+        batch = []
+        cursor = candidate_collection.find(
+            query, {'email': 1, 'phone': 1, 'first_name': 1, 'last_name': 1}
+        ).batch_size(batch_size)
+
+        for candidate in cursor:
+            batch.append(UpdateOne(
+                {'_id': candidate['_id']},
+                {'$set': {'identity_keys': identity_keys(candidate)}}
+            ))
+            if len(batch) >= batch_size:
+                candidate_collection.bulk_write(batch, ordered=False)
+                updated += len(batch)
+                batch = []
+                self.stdout.write(f'  {updated} candidates updated...')
+
+        if batch:
+            candidate_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Identity keys written for {updated} candidates.'))
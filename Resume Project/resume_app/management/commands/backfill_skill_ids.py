@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection
+from resume_app.utils.skill_taxonomy import SKILL_TAXONOMY_COLLECTION, SkillTaxonomy
+
+
+class Command(BaseCommand):
+    help = 'Intern candidate skills in the skill taxonomy and store their skill_ids'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute IDs for every candidate, not only those missing them (e.g. after adding aliases)'
+        )
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        candidate_collection = mongo.get_collection('candidates')
+        taxonomy = SkillTaxonomy(mongo.get_collection(SKILL_TAXONOMY_COLLECTION))
+        taxonomy.load()
+        query = {} if options['all'] else {'skill_ids': {'$exists': False}}
+        batch_size = options['batch_size']
+
+        updated = 0
+        batch = []
+        cursor = candidate_collection.find(query, {'skills': 1}).batch_size(batch_size)
+
+        for candidate in cursor:
+            batch.append(UpdateOne(
+                {'_id': candidate['_id']},
+                {'$set': {'skill_ids': taxonomy.skill_ids(candidate.get('skills'))}}
+            ))
+            if len(batch) >= batch_size:
+                candidate_collection.bulk_write(batch, ordered=False)
+                updated += len(batch)
+                batch = []
+                self.stdout.write(f'  {updated} candidates updated...')
+
+        if batch:
+            candidate_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+
+        skills = mongo.get_collection(SKILL_TAXONOMY_COLLECTION).count_documents({})
+        self.stdout.write(self.style.SUCCESS(f'Skill IDs written for {updated} candidates ({skills} skills in the taxonomy).'))
@@ -0,0 +1,114 @@
+import hashlib
+import statistics
+import threading
+import time
+from datetime import datetime
+import pymongo
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from resume_app.auth.auth_backends import MongoDBAuthBackend, last_login_buffer
+from resume_app.views import MongoDBConnection
+
+BENCH_USERNAME = 'benchmark_login_user'
+BENCH_PASSWORD = 'benchmark-password'
+
+
+def legacy_authenticate(request, username, password):
+    """The login path before the shared client and write-behind: kept here as the baseline"""
+    if 'connection_string' in getattr(settings, 'MONGODB_SETTINGS', {}):
+        client = pymongo.MongoClient(settings.MONGODB_SETTINGS['connection_string'])
+    else:
+        client = pymongo.MongoClient('localhost', 27017)
+    collection = client['resume_admin']['resume_login']
+    user_data = collection.find_one({
+        'username': username,
+        'password_hash': hashlib.sha256(password.encode()).hexdigest(),
+        'is_active': True
+    })
+    if not user_data:
+        return None
+    collection.update_one({'username': username}, {'$set': {'last_login': datetime.utcnow()}})
+    user, _ = User.objects.get_or_create(username=username)
+    user.email = user_data.get('email', '')
+    user.first_name = user_data.get('first_name', '')
+    user.last_name = user_data.get('last_name', '')
+    user.save()
+    client.close()
+    return user
+
+
+class Command(BaseCommand):
+    help = 'Measure MongoDB-backed login throughput, optionally against the previous login path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=500)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--compare', action='store_true', help='Also run the previous (uncached) login path')
+        parser.add_argument('--keep-user', action='store_true', help='Leave the benchmark user in resume_login')
+
+    def handle(self, *args, **options):
+        collection = MongoDBConnection().get_collection()
+        collection.update_one(
+            {'username': BENCH_USERNAME},
+            {'$set': {
+                'username': BENCH_USERNAME,
+                'email': f'{BENCH_USERNAME}@example.com',
+                'password_hash': hashlib.sha256(BENCH_PASSWORD.encode()).hexdigest(),
+                'first_name': 'Benchmark',
+                'last_name': 'User',
+                'is_active': True,
+            }},
+            upsert=True
+        )
+
+        try:
+            if options['compare']:
+                self.run('previous path', legacy_authenticate, options)
+            backend = MongoDBAuthBackend()
+            self.run('current path', backend.authenticate, options)
+            last_login_buffer().flush()
+        finally:
+            if not options['keep_user']:
+                collection.delete_one({'username': BENCH_USERNAME})
+                User.objects.filter(username=BENCH_USERNAME).delete()
+
+    def run(self, label, authenticate, options):
+        factory = RequestFactory()
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+        remaining = iter(range(options['logins']))
+
+        def worker():
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                request = factory.post('/login/')
+                request.session = SessionStore()
+                started = time.perf_counter()
+                user = authenticate(request, username=BENCH_USERNAME, password=BENCH_PASSWORD)
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    if user is None:
+                        failures.append(elapsed)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+        self.stdout.write(self.style.SUCCESS(
+            f'{label}: {len(latencies) / wall:.0f} logins/s over {options["threads"]} threads, '
+            f'mean {statistics.mean(latencies):.1f} ms, p50 {percentile(0.50):.1f} ms, '
+            f'p95 {percentile(0.95):.1f} ms, {len(failures)} failed'
+        ))
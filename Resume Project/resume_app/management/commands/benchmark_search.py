@@ -0,0 +1,114 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from resume_app.utils.search_index import get_connection, index_candidates, search_candidates
+
+SKILLS = [
+    'Python', 'JavaScript', 'Java', 'React', 'Node.js', 'SQL', 'MongoDB', 'AWS', 'Docker', 'Kubernetes',
+    'Machine Learning', 'Data Analysis', 'Project Management', 'Agile', 'Scrum', 'Git', 'Linux', 'Azure',
+    'Angular', 'Django', 'Flask', 'Spring Boot', 'Microservices', 'GraphQL', 'Excel', 'Tableau',
+    'Accounting', 'Payroll', 'Budgeting', 'Recruiting', 'Salesforce', 'SAP', 'QuickBooks', 'Figma',
+]
+TITLES = ['Software Engineer', 'Accountant', 'Data Analyst', 'HR Manager', 'Product Manager',
+          'Sales Associate', 'Designer', 'Teacher', 'Nurse', 'Chef', 'Consultant', 'Tech Lead']
+COMPANIES = ['Google', 'Microsoft', 'Amazon', 'Deloitte', 'KPMG', 'Walmart', 'Pfizer', 'Oracle',
+             'Accenture', 'IBM', 'Netflix', 'Spotify', 'Uber', 'Airbnb', 'Tesla', 'Shell']
+DEGREES = ['Bachelor of Science', 'Master of Science', 'MBA', 'Bachelor of Arts', 'Ph.D']
+FIELDS = ['Computer Science', 'Finance', 'Accounting', 'Marketing', 'Nursing', 'Economics']
+UNIVERSITIES = ['MIT', 'Stanford', 'Harvard University', 'Berkeley', 'Monash University', 'APU']
+STATUSES = ['new', 'screening', 'interview', 'offer', 'hired', 'rejected']
+DEPARTMENTS = ['Engineering', 'Finance', 'HR', 'Sales', 'Marketing', 'Operations']
+WORDS = ['led', 'managed', 'built', 'scalable', 'reporting', 'customer', 'team', 'growth',
+         'analysis', 'pipeline', 'automation', 'budget', 'compliance', 'cloud', 'platform']
+
+QUERIES = [
+    'python', 'skills:django', 'accounting AND excel', '"machine learning"', 'pyth*',
+    'kubernetes OR docker', 'engineer -java', 'experience:deloitte', 'education:"master of science"',
+    'payroll budgeting', 'summary:automation cloud', 'react angular',
+]
+
+
+def synthetic_candidate(rng, number):
+    return {
+        '_id': f'synthetic-{number}',
+        'first_name': f'First{number}',
+        'last_name': f'Last{number % 9973}',
+        'skills': rng.sample(SKILLS, rng.randint(4, 12)),
+        'experience': [
+            {
+                'title': rng.choice(TITLES),
+                'company': rng.choice(COMPANIES),
+                'description': ' '.join(rng.choices(WORDS, k=12)),
+            }
+            for _ in range(rng.randint(1, 4))
+        ],
+        'education': [{
+            'degree': rng.choice(DEGREES),
+            'field': rng.choice(FIELDS),
+            'university': rng.choice(UNIVERSITIES),
+        }],
+        'summary': ' '.join(rng.choices(WORDS + [skill.lower() for skill in SKILLS], k=30)),
+        'status': rng.choice(STATUSES),
+        'department': rng.choice(DEPARTMENTS),
+        'ai_score': rng.randint(0, 100),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Load synthetic candidates into a scratch search index and measure query latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=100000)
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--index-path', default=None,
+            help='Scratch index file (defaults to a temporary file; an existing index is reused)'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        index_path = options['index_path'] or os.path.join(tempfile.gettempdir(), 'search_benchmark.sqlite3')
+        connection = get_connection(index_path)
+
+        existing = connection.execute('SELECT COUNT(*) FROM candidate_docs').fetchone()[0]
+        if existing < options['candidates']:
+            started = time.perf_counter()
+            batch = []
+            for number in range(existing, options['candidates']):
+                batch.append(synthetic_candidate(rng, number))
+                if len(batch) >= options['batch_size']:
+                    index_candidates(batch, connection)
+                    batch = []
+                    self.stdout.write(f'  {number + 1} candidates indexed...')
+            if batch:
+                index_candidates(batch, connection)
+            with connection:
+                connection.execute("INSERT INTO candidate_fts (candidate_fts) VALUES ('optimize')")
+            elapsed = time.perf_counter() - started
+            loaded = options['candidates'] - existing
+            self.stdout.write(f'Indexed {loaded} candidates in {elapsed:.1f}s ({loaded / elapsed:.0f}/s)')
+
+        latencies = []
+        for number in range(options['queries']):
+            query = QUERIES[number % len(QUERIES)]
+            filters = {}
+            if number % 3 == 1:
+                filters['status'] = rng.choice(STATUSES)
+            if number % 4 == 2:
+                filters['min_score'] = 70
+            started = time.perf_counter()
+            search_candidates(query, limit=20, connection=connection, **filters)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        latencies.sort()
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(latencies)} queries over {options["candidates"]} candidates: '
+            f'mean {statistics.mean(latencies):.1f} ms, p50 {percentile(0.50):.1f} ms, '
+            f'p95 {percentile(0.95):.1f} ms, p99 {percentile(0.99):.1f} ms'
+        ))
@@ -0,0 +1,66 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from resume_app.management.commands.benchmark_search import synthetic_candidate
+from resume_app.utils.similarity_index import IndexBuilder, SimilarityIndex, embed_candidate
+
+
+class Command(BaseCommand):
+    help = 'Build a similarity index over synthetic candidates and compare IVF recall and latency with brute force'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=100000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--nprobe', default='1,2,4,8,16,32', help='Comma separated nprobe values to try')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--index-path', default=None,
+            help='Scratch index directory (defaults to a temporary directory; an existing build is reused)'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        path = options['index_path'] or os.path.join(tempfile.gettempdir(), 'similarity_benchmark')
+        index = SimilarityIndex(path)
+
+        if len(index) < options['candidates']:
+            started = time.perf_counter()
+            builder = IndexBuilder(path)
+            for number in range(options['candidates']):
+                builder.add(f'synthetic-{number}', embed_candidate(synthetic_candidate(rng, number)))
+            manifest = builder.finish()
+            self.stdout.write(f"Built {manifest['count']} vectors in {manifest['nlist']} lists "
+                              f"in {time.perf_counter() - started:.1f}s")
+            index = SimilarityIndex(path)
+
+        k = options['k']
+        query_ids = [f'synthetic-{rng.randrange(len(index))}' for _ in range(options['queries'])]
+        queries = [(candidate_id, index.vector_for(candidate_id)) for candidate_id in query_ids]
+
+        exact, exact_latencies = {}, []
+        for candidate_id, vector in queries:
+            started = time.perf_counter()
+            exact[candidate_id] = {match for match, _ in index.exact_search(vector, k, exclude=candidate_id)}
+            exact_latencies.append((time.perf_counter() - started) * 1000)
+        self.report('brute force', exact_latencies, 1.0)
+
+        for nprobe in [int(value) for value in options['nprobe'].split(',') if value.strip()]:
+            latencies, recalls = [], []
+            for candidate_id, vector in queries:
+                started = time.perf_counter()
+                found = index.search(vector, k, nprobe=nprobe, exclude=candidate_id)
+                latencies.append((time.perf_counter() - started) * 1000)
+                recalls.append(len(exact[candidate_id] & {match for match, _ in found}) / max(len(exact[candidate_id]), 1))
+            self.report(f'nprobe={nprobe}', latencies, statistics.mean(recalls))
+
+    def report(self, label, latencies, recall):
+        latencies = sorted(latencies)
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+        self.stdout.write(
+            f'{label:>12}: recall@k {recall:.3f}, mean {statistics.mean(latencies):.2f} ms, '
+            f'p50 {percentile(0.50):.2f} ms, p95 {percentile(0.95):.2f} ms'
+        )
@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from resume_app.views import MongoDBConnection
+from resume_app.utils.similarity_index import EMBEDDED_FIELDS, IndexBuilder, embed_candidate
+
+
+class Command(BaseCommand):
+    help = 'Embed every candidate and write a new IVF build of the similar-candidates index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--nlist', type=int, default=None, help='IVF lists (defaults to sqrt of the corpus size)')
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        started = time.perf_counter()
+        builder = IndexBuilder()
+
+        cursor = mongo.get_collection('candidates').find({}, EMBEDDED_FIELDS).batch_size(options['batch_size'])
+        for count, candidate in enumerate(cursor, start=1):
+            builder.add(candidate['_id'], embed_candidate(candidate))
+            if count % 50000 == 0:
+                self.stdout.write(f'  {count} candidates embedded...')
+
+        manifest = builder.finish(nlist=options['nlist'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Similarity index built with {manifest['count']} candidates in {manifest['nlist']} lists "
+            f"({time.perf_counter() - started:.1f}s)."
+        ))
@@ -0,0 +1,81 @@
+import time
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection
+from resume_app.utils.near_duplicates import MAX_LINKS, SIGNATURE_FIELDS, cluster_candidates, signature_fields
+
+
+class Command(BaseCommand):
+    help = 'Backfill MinHash signatures and link near-duplicate candidates into clusters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--recompute', action='store_true',
+            help='Recompute signatures for every candidate, not only those missing one'
+        )
+        parser.add_argument(
+            '--max-bucket-size', type=int, default=1000,
+            help='Skip LSH buckets with more members than this (shared boilerplate)'
+        )
+
+    def handle(self, *args, **options):
+        candidate_collection = MongoDBConnection().get_collection('candidates')
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        signed = self.backfill(candidate_collection, options['recompute'], batch_size)
+        self.stdout.write(f'Signatures written for {signed} candidates ({time.perf_counter() - started:.1f}s).')
+
+        clusters = cluster_candidates(candidate_collection, batch_size, options['max_bucket_size'])
+        members = defaultdict(list)
+        for candidate_id, root_id in clusters.items():
+            members[root_id].append(candidate_id)
+
+        batch = []
+        for candidate_id, root_id in clusters.items():
+            others = sorted(member for member in members[root_id] if member != candidate_id)
+            batch.append(UpdateOne(
+                {'_id': candidate_id},
+                {'$set': {'duplicate_cluster': root_id, 'likely_duplicates': others[:MAX_LINKS]}}
+            ))
+            if len(batch) >= batch_size:
+                candidate_collection.bulk_write(batch, ordered=False)
+                batch = []
+
+        # Links from earlier runs or uploads that no longer hold, e.g. after a threshold change
+        for stale in candidate_collection.find({'likely_duplicates.0': {'$exists': True}}, {'_id': 1}):
+            if stale['_id'] not in clusters:
+                batch.append(UpdateOne(
+                    {'_id': stale['_id']}, {'$unset': {'duplicate_cluster': '', 'likely_duplicates': ''}}
+                ))
+            if len(batch) >= batch_size:
+                candidate_collection.bulk_write(batch, ordered=False)
+                batch = []
+        if batch:
+            candidate_collection.bulk_write(batch, ordered=False)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(clusters)} candidates in {len(members)} near-duplicate clusters '
+            f'({time.perf_counter() - started:.1f}s).'
+        ))
+        self.stdout.write('Links made by uploads while the command ran may be overwritten; rerun to restore them.')
+
+    def backfill(self, candidate_collection, recompute, batch_size):
+        query = {} if recompute else {'minhash': {'$exists': False}}
+        updated = 0
+        batch = []
+        for candidate in candidate_collection.find(query, SIGNATURE_FIELDS).batch_size(batch_size):
+            # Candidates without any text get an empty signature so they are not revisited
+            fields = signature_fields(candidate) or {'minhash': None, 'lsh_buckets': []}
+            batch.append(UpdateOne({'_id': candidate['_id']}, {'$set': fields}))
+            if len(batch) >= batch_size:
+                candidate_collection.bulk_write(batch, ordered=False)
+                updated += len(batch)
+                batch = []
+                self.stdout.write(f'  {updated} candidates signed...')
+        if batch:
+            candidate_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+        return updated
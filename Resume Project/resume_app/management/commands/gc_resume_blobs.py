@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection
+from resume_app.utils.blob_storage import BLOB_COLLECTION, BLOB_PREFIX
+
+
+class Command(BaseCommand):
+    help = 'Remove content-addressed resume blobs that are no longer referenced'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recount', action='store_true',
+            help='Recompute reference counts from resume_uploads before collecting'
+        )
+        parser.add_argument(
+            '--orphans', action='store_true',
+            help='Also delete stored files that have no resume_blobs document'
+        )
+        parser.add_argument(
+            '--grace-hours', type=int, default=24,
+            help='Keep blobs referenced within this many hours (protects in-flight uploads)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report without deleting')
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        blob_collection = mongo.get_collection(BLOB_COLLECTION)
+        dry_run = options['dry_run']
+
+        if options['recount']:
+            self.recount(mongo, blob_collection, dry_run)
+
+        cutoff = datetime.now() - timedelta(hours=options['grace_hours'])
+        unreferenced = {'ref_count': {'$lte': 0}, 'last_referenced': {'$lt': cutoff}}
+        removed = 0
+        for blob in blob_collection.find(unreferenced, {'path': 1}):
+            if not dry_run:
+                # The document goes first and only while still unreferenced: a blob stored again since
+                # the cursor read it keeps its file, and a later store_blob starts a fresh document
+                if not blob_collection.delete_one({'_id': blob['_id'], **unreferenced}).deleted_count:
+                    continue
+                if default_storage.exists(blob['path']):
+                    default_storage.delete(blob['path'])
+                if blob_collection.find_one({'_id': blob['_id']}, {'_id': 1}):
+                    self.stderr.write(f"Blob {blob['_id']} was stored again while it was collected; "
+                                      f"its file is gone and the upload must be repeated")
+            removed += 1
+        self.stdout.write(f'Unreferenced blobs removed: {removed}')
+
+        if options['orphans']:
+            known_paths = set(doc['path'] for doc in blob_collection.find({}, {'path': 1}))
+            orphans = [path for path in self.walk(BLOB_PREFIX) if path not in known_paths]
+            if not dry_run:
+                for path in orphans:
+                    default_storage.delete(path)
+            self.stdout.write(f'Orphaned files removed: {len(orphans)}')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('Dry run - nothing was deleted.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Blob garbage collection complete.'))
+
+    def recount(self, mongo, blob_collection, dry_run):
+        counts = {
+            row['_id']: row['count'] for row in mongo.get_collection('resume_uploads').aggregate([
+                {'$match': {'content_hash': {'$exists': True}}},
+                {'$group': {'_id': '$content_hash', 'count': {'$sum': 1}}}
+            ])
+        }
+        updates = [
+            UpdateOne({'_id': blob['_id']}, {'$set': {'ref_count': counts.get(blob['_id'], 0)}})
+            for blob in blob_collection.find({}, {'ref_count': 1})
+            if blob.get('ref_count') != counts.get(blob['_id'], 0)
+        ]
+        if updates and not dry_run:
+            blob_collection.bulk_write(updates, ordered=False)
+        self.stdout.write(f'Reference counts corrected: {len(updates)}')
+
+    def walk(self, path):
+        if not default_storage.exists(path):
+            return
+        directories, files = default_storage.listdir(path)
+        for name in files:
+            yield f'{path}/{name}'
+        for name in directories:
+            yield from self.walk(f'{path}/{name}')
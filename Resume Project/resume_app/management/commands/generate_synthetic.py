@@ -0,0 +1,278 @@
+import hashlib
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+from bson import ObjectId
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from resume_app.views import MongoDBConnection
+from resume_app.utils.blob_storage import BLOB_COLLECTION, blob_path
+from resume_app.utils.experience_timeline import experience_timeline
+from resume_app.utils.history_utils import HISTORY_COLLECTION, HISTORY_RECENT_LIMIT
+from resume_app.utils.identity_utils import identity_keys
+from resume_app.utils.pipeline_utils import PIPELINE_STAGES, STAGE_EVENTS_COLLECTION
+from resume_app.utils.skill_taxonomy import SKILL_TAXONOMY_COLLECTION, SkillTaxonomy
+from resume_app.utils.synthetic_data import synthetic_resume
+
+RECRUITER_PREFIX = 'synthetic_recruiter_'
+
+# (job title, department, relative volume)
+JOBS = [
+    ('Software Engineer', 'Engineering', 30), ('Senior Developer', 'Engineering', 12),
+    ('Data Analyst', 'Engineering', 10), ('Product Manager', 'Product', 8),
+    ('Accountant', 'Finance', 9), ('HR Manager', 'HR', 5), ('Sales Associate', 'Sales', 14),
+    ('Marketing Specialist', 'Marketing', 7), ('Operations Analyst', 'Operations', 5),
+]
+SOURCE_WEIGHTS = {'resume_upload': 50, 'linkedin': 20, 'job_board': 15, 'referral': 10, 'website': 5}
+# Where candidates end up; rejected ones drop out of a random earlier stage
+FINAL_STAGE_WEIGHTS = {'new': 38, 'screening': 22, 'interview': 13, 'offer': 5, 'hired': 4, 'rejected': 18}
+MEAN_DAYS_IN_STAGE = 5
+
+
+def _skewed_weights(count, skew):
+    """Zipf-like weights: the i-th recruiter gets 1/(i+1)^skew of the traffic (skew 0 is uniform)"""
+    return list(accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-load seeded synthetic candidates, resume_uploads, resume_login recruiters, resume history '
+        'buckets and stage events into a local MongoDB, with a skewed split of uploads across recruiters'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=1_000_000)
+        parser.add_argument('--recruiters', type=int, default=200)
+        parser.add_argument('--skew', type=float, default=1.2,
+                            help='Zipf exponent of uploads per recruiter; 0 spreads them evenly (default: %(default)s)')
+        parser.add_argument('--reupload-rate', type=float, default=0.05,
+                            help='Share of candidates uploaded a second time (default: %(default)s)')
+        parser.add_argument('--failure-rate', type=float, default=0.02,
+                            help='Failed uploads per candidate, with no candidate created (default: %(default)s)')
+        parser.add_argument('--days', type=int, default=365, help='Spread created dates over this many days')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--mongo-uri', default='mongodb://localhost:27017')
+        parser.add_argument('--database', default=getattr(settings, 'MONGODB_SETTINGS', {}).get('database', 'resume_admin'))
+        parser.add_argument('--allow-remote', action='store_true',
+                            help='Allow a non-local --mongo-uri (never the configured production cluster)')
+        parser.add_argument('--drop', action='store_true', help='Drop the target database first')
+        parser.add_argument('--rebuild-derived', action='store_true',
+                            help='Rebuild dashboard rollups, the search index, the similarity index and near-duplicate clusters afterwards')
+
+    def handle(self, *args, **options):
+        uri = options['mongo_uri']
+        if uri == getattr(settings, 'MONGODB_SETTINGS', {}).get('connection_string'):
+            raise CommandError('Refusing to load synthetic data into the configured production cluster')
+        if not options['allow_remote'] and not uri.startswith(('mongodb://localhost', 'mongodb://127.0.0.1')):
+            raise CommandError(f'{uri} is not local; pass --allow-remote to use it anyway')
+
+        with override_settings(MONGODB_SETTINGS={'connection_string': uri, 'database': options['database']}):
+            MongoDBConnection.reset_client()
+            try:
+                if options['drop']:
+                    MongoDBConnection.get_client().drop_database(options['database'])
+                    self.stdout.write(f"Dropped database {options['database']}")
+                self.generate(MongoDBConnection(), options)
+                if options['rebuild_derived']:
+                    for command in ('rebuild_dashboard_rollups', 'rebuild_search_index', 'build_similarity_index',
+                                    'cluster_near_duplicates'):
+                        self.stdout.write(f'Running {command}...')
+                        call_command(command, stdout=self.stdout)
+                else:
+                    self.stdout.write(
+                        'Dashboard rollups, the search index, the similarity index and near-duplicate clusters '
+                        'were not updated; rerun with --rebuild-derived or run their rebuild commands.'
+                    )
+            finally:
+                MongoDBConnection.reset_client()
+
+    def generate(self, mongo, options):
+        rng = random.Random(options['seed'])
+        now = datetime.now().replace(microsecond=0)
+        started = time.perf_counter()
+
+        recruiters = [f'{RECRUITER_PREFIX}{number:04d}' for number in range(options['recruiters'])]
+        password_hash = hashlib.sha256(b'synthetic-password').hexdigest()
+        mongo.get_collection().insert_many([
+            {
+                'username': username,
+                'email': f'{username}@example.com',
+                'password_hash': password_hash,
+                'first_name': 'Synthetic',
+                'last_name': f'Recruiter {number}',
+                'full_name': f'Synthetic Recruiter {number}',
+                'company': 'Synthetic Corp',
+                'role': 'recruiter',
+                'is_active': True,
+                'date_joined': now - timedelta(days=options['days']),
+                'profile': {'location': '', 'device_info': '', 'browser_info': ''},
+                'preferences': {'email_alerts': True, 'application_updates': True, 'theme': 'light', 'language': 'en'},
+            }
+            for number, username in enumerate(recruiters)
+        ])
+
+        self.recruiters = recruiters
+        # The synthetic skill pool is small, so IDs come from the in-memory alias map after the first few
+        self.taxonomy = SkillTaxonomy(mongo.get_collection(SKILL_TAXONOMY_COLLECTION))
+        self.taxonomy.load()
+        self.recruiter_weights = _skewed_weights(len(recruiters), options['skew'])
+        self.jobs = JOBS
+        self.job_weights = list(accumulate(weight for *_, weight in JOBS))
+        self.sources = list(SOURCE_WEIGHTS)
+        self.source_weights = list(accumulate(SOURCE_WEIGHTS.values()))
+        self.stages = list(FINAL_STAGE_WEIGHTS)
+        self.stage_weights = list(accumulate(FINAL_STAGE_WEIGHTS.values()))
+
+        collections = {
+            'candidates': mongo.get_collection('candidates'),
+            'resume_uploads': mongo.get_collection('resume_uploads'),
+            HISTORY_COLLECTION: mongo.get_collection(HISTORY_COLLECTION),
+            STAGE_EVENTS_COLLECTION: mongo.get_collection(STAGE_EVENTS_COLLECTION),
+            BLOB_COLLECTION: mongo.get_collection(BLOB_COLLECTION),
+        }
+        totals = dict.fromkeys(collections, 0)
+        total = options['candidates']
+        for batch_start in range(0, total, options['batch_size']):
+            batch = {name: [] for name in collections}
+            for number in range(batch_start, min(batch_start + options['batch_size'], total)):
+                self.add_candidate(batch, rng, number, now, options)
+            for name, documents in batch.items():
+                if documents:
+                    collections[name].insert_many(documents, ordered=False)
+                    totals[name] += len(documents)
+            done = min(batch_start + options['batch_size'], total)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'  {done}/{total} candidates ({done / elapsed:.0f}/s)')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {len(recruiters)} recruiters, '
+            + ', '.join(f'{count} {name}' for name, count in totals.items())
+            + f' in {time.perf_counter() - started:.1f}s (seed {options["seed"]}).'
+        ))
+
+    def add_candidate(self, batch, rng, number, now, options):
+        parsed = synthetic_resume(rng, number)
+        job_title, department, _ = rng.choices(self.jobs, cum_weights=self.job_weights)[0]
+        source = rng.choices(self.sources, cum_weights=self.source_weights)[0]
+        # Most candidates are recent: created dates bunch towards now
+        created = now - timedelta(days=options['days'] * rng.random() ** 1.5, seconds=rng.randint(0, 86399))
+
+        uploads = [self.upload(rng, number, 0, parsed, job_title, department, created, is_duplicate=False)]
+        if rng.random() < options['reupload_rate']:
+            uploaded_at = created + (now - created) * rng.random()
+            uploads.append(self.upload(rng, number, 1, parsed, job_title, department, uploaded_at, is_duplicate=True))
+        if rng.random() < options['failure_rate']:
+            failed = self.upload(rng, number, 2, parsed, job_title, department, created, is_duplicate=False)
+            failed.update(status='failed', error='Parsing exceeded the per-document time limit')
+            batch['resume_uploads'].append(failed)
+            batch[BLOB_COLLECTION].append(self.blob(failed))
+
+        # Timestamp of the created date followed by the candidate number: unique and time-ordered
+        candidate_id = ObjectId(ObjectId.from_datetime(created).binary[:4] + number.to_bytes(8, 'big'))
+        history = [
+            {'file_path': upload['file_path'], 'content_hash': upload['content_hash'],
+             'upload_date': upload['upload_date'], 'uploaded_by': upload['uploaded_by']}
+            for upload in uploads
+        ]
+        status, stage_entered_at, events = self.pipeline(rng, candidate_id, created, now, department, source)
+        candidate = {
+            '_id': candidate_id,
+            'first_name': parsed['first_name'],
+            'last_name': parsed['last_name'],
+            'email': parsed['email'],
+            'phone': parsed['phone'],
+            'location': parsed['location'],
+            'linkedin_url': parsed['linkedin_url'],
+            **experience_timeline(parsed['experience']),
+            'education': parsed['education'],
+            'skills': parsed['skills'],
+            'skill_ids': self.taxonomy.skill_ids(parsed['skills']),
+            'certifications': parsed['certifications'],
+            'summary': parsed['summary'],
+            'resume_file_path': uploads[-1]['file_path'],
+            'identity_keys': identity_keys(parsed),
+            'job_title_applied': job_title,
+            'department': department,
+            'tags': ['synthetic'],
+            'ai_score': rng.randint(0, 100),
+            'quality_score': parsed['quality_score'],
+            'status': status,
+            'stage_entered_at': stage_entered_at,
+            'source': source,
+            'created_date': created,
+            'created_by': uploads[0]['uploaded_by'],
+            'last_updated': max(stage_entered_at, uploads[-1]['upload_date']),
+            'resume_history': history[-HISTORY_RECENT_LIMIT:],
+            'resume_count': len(history),
+        }
+        for upload in uploads:
+            upload['candidate_id'] = candidate_id
+            batch['resume_uploads'].append(upload)
+            batch[BLOB_COLLECTION].append(self.blob(upload))
+        batch['candidates'].append(candidate)
+        batch[HISTORY_COLLECTION].append({
+            'candidate_id': candidate_id, 'entries': history, 'count': len(history),
+            'first_date': history[0]['upload_date'], 'last_date': history[-1]['upload_date'],
+        })
+        batch[STAGE_EVENTS_COLLECTION].extend(events)
+
+    def upload(self, rng, number, attempt, parsed, job_title, department, uploaded_at, is_duplicate):
+        file_type = '.pdf' if rng.random() < 0.8 else '.docx'
+        content_hash = hashlib.sha256(f'synthetic-{number}-{attempt}'.encode()).hexdigest()
+        return {
+            'filename': f"{parsed['first_name']}_{parsed['last_name']}_{number}{file_type}",
+            'file_path': blob_path(content_hash, file_type),
+            'file_size': rng.randint(40_000, 900_000),
+            'file_type': file_type,
+            'content_hash': content_hash,
+            'parse_result_id': content_hash,
+            'job_title': job_title,
+            'department': department,
+            'tags': ['synthetic'],
+            'status': 'completed',
+            'upload_date': uploaded_at,
+            'uploaded_by': rng.choices(self.recruiters, cum_weights=self.recruiter_weights)[0],
+            'processing_time': round(rng.uniform(0.2, 3.0), 3),
+            'is_duplicate': is_duplicate,
+        }
+
+    def blob(self, upload):
+        return {
+            '_id': upload['content_hash'], 'path': upload['file_path'], 'ref_count': 1,
+            'file_size': upload['file_size'], 'file_type': upload['file_type'],
+            'created_date': upload['upload_date'], 'last_referenced': upload['upload_date'],
+        }
+
+    def pipeline(self, rng, candidate_id, created, now, department, source):
+        """Final stage plus the stage events that led there, spaced out but never in the future"""
+        final = rng.choices(self.stages, cum_weights=self.stage_weights)[0]
+        if final == 'rejected':
+            path = PIPELINE_STAGES[:rng.randint(1, PIPELINE_STAGES.index('offer') + 1)] + ['rejected']
+        else:
+            path = PIPELINE_STAGES[:PIPELINE_STAGES.index(final) + 1]
+
+        events = []
+        entered = created
+        for from_stage, to_stage in zip(path, path[1:]):
+            changed_at = min(entered + timedelta(days=rng.expovariate(1 / MEAN_DAYS_IN_STAGE)), now)
+            event = {
+                'candidate_id': candidate_id,
+                'from_stage': from_stage,
+                'to_stage': to_stage,
+                'changed_at': changed_at,
+                'changed_by': rng.choice(self.recruiters),
+                'details': {},
+                'note': '',
+                'department': department,
+                'source': source,
+                'time_in_stage_days': round((changed_at - entered).total_seconds() / 86400, 4),
+            }
+            if to_stage == 'hired':
+                event['days_to_hire'] = round((changed_at - created).total_seconds() / 86400, 4)
+            events.append(event)
+            entered = changed_at
+        return path[-1], entered, events
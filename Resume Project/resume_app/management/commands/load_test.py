@@ -0,0 +1,452 @@
+import contextvars
+import hashlib
+import inspect
+import json
+import logging
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import wraps
+import pymongo
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from resume_app.utils.async_adapter import AsyncClientAdapter
+from resume_app.utils.db_metrics import current_request
+from resume_app.views import AsyncMongoDBConnection, MongoDBConnection, simulate_ai_parsing
+
+LOAD_TEST_DATABASE = 'resume_loadtest'
+USER_PREFIX = 'loadtest_'
+PASSWORD = 'load-test-password'
+
+# Loggers whose ERROR records count against the request they were logged under
+ERROR_LOGGERS = ['', 'resume_app', 'resume_extraction', 'django.request']
+
+# Messages of the ERROR records logged while serving the current request; contextvars follow the
+# request into async_to_sync, sync_to_async and map_concurrently threads
+_request_errors = contextvars.ContextVar('load_test_request_errors', default=None)
+
+# Collection methods that cost one round trip against a real server
+MONGOMOCK_COMMANDS = [
+    'find', 'find_one', 'find_one_and_update', 'find_one_and_delete', 'insert_one', 'insert_many',
+    'update_one', 'update_many', 'replace_one', 'delete_one', 'delete_many', 'count_documents',
+    'aggregate', 'bulk_write', 'distinct', 'create_index',
+]
+
+
+def _instrument_mongomock(mongomock):
+    """mongomock emits no command events; charge each collection call to the current request instead"""
+    collection_class = mongomock.collection.Collection
+    if getattr(collection_class, '_load_test_instrumented', False):
+        return
+
+    # find_one calls find, bulk_write calls update_one...: only the outermost call is a round trip
+    nested = threading.local()
+
+    def timed(name, method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if getattr(nested, 'active', False):
+                return method(self, *args, **kwargs)
+            nested.active = True
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                nested.active = False
+                stats = current_request.get()
+                if stats is not None:
+                    stats.add(name, self.name, time.perf_counter() - started)
+        return wrapper
+
+    for name in MONGOMOCK_COMMANDS:
+        setattr(collection_class, name, timed(name, getattr(collection_class, name)))
+
+    # pymongo 4.9+ passes bulk builders a `sort` argument that mongomock 4.3 does not take
+    builder_class = mongomock.collection.BulkOperationBuilder
+    for name in ('add_update', 'add_replace'):
+        method = getattr(builder_class, name)
+        if 'sort' not in inspect.signature(method).parameters:
+            setattr(builder_class, name, _without_sort(method))
+    collection_class._load_test_instrumented = True
+
+
+def _without_sort(method):
+    @wraps(method)
+    def wrapper(self, *args, sort=None, **kwargs):
+        if sort is not None:
+            raise NotImplementedError('mongomock does not support sorted bulk updates')
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class _ErrorRecorder(logging.Handler):
+    """Charges ERROR records to the load-test request they were logged under"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+
+    def emit(self, record):
+        errors = _request_errors.get()
+        if errors is not None:
+            errors.append(record.getMessage())
+
+
+def _resume_text(number):
+    parsed = simulate_ai_parsing(f'loadtest-{number}.txt', '.txt')
+    experience = parsed['experience'][0]
+    education = parsed['education'][0]
+    return (
+        f"{parsed['first_name']} {parsed['last_name']}\n{parsed['email']}\n{parsed['phone']}\n\n"
+        f"SUMMARY\n{parsed['summary']} Reference {number}.\n\n"
+        f"SKILLS\n{', '.join(parsed['skills'])}\n\n"
+        f"EXPERIENCE\n{experience['title']} at {experience['company']} ({experience['duration']})\n"
+        f"{experience['description']}\n\n"
+        f"EDUCATION\n{education['degree']} in {education['field']}, {education['university']} {education['year']}\n"
+    ).encode()
+
+
+class Scenario:
+    """One scripted flow; `login` says whether each worker signs in first"""
+
+    def __init__(self, name, login, run, expected_status):
+        self.name = name
+        self.login = login
+        self.run = run
+        self.expected_status = expected_status
+
+
+def _login(client, worker):
+    return client.post('/login/', {'username': worker['username'], 'password': PASSWORD})
+
+
+def _fresh_login(client, worker):
+    # Drop the previous session, or the login view just redirects the signed-in user
+    client.cookies.clear()
+    return _login(client, worker)
+
+
+def _register(client, worker):
+    client.cookies.clear()
+    username = f'{USER_PREFIX}reg_{uuid.uuid4().hex[:12]}'
+    return client.post('/register/', {
+        'full_name': 'Load Test', 'username': username, 'email': f'{username}@example.com',
+        'company': 'Load Test Inc', 'role': 'recruiter', 'password1': PASSWORD, 'password2': PASSWORD,
+    })
+
+
+def _upload(client, worker):
+    worker['iteration'] += 1
+    number = f"{worker['index']}-{worker['iteration']}-{uuid.uuid4().hex[:8]}"
+    resume = SimpleUploadedFile(f'resume-{number}.txt', _resume_text(number), content_type='text/plain')
+    return client.post('/resume-upload/', {
+        'resume_files': [resume], 'job_title': 'Software Engineer', 'department': 'Engineering', 'tags': 'load-test',
+    })
+
+
+def _settings_update(client, worker):
+    worker['iteration'] += 1
+    return client.post('/settings/', {
+        'form_type': 'profile', 'first_name': 'Load', 'last_name': f"Test {worker['iteration']}",
+        'address': 'Kuala Lumpur', 'device_info': 'load test', 'browser_info': 'django.test.Client',
+    })
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in [
+        Scenario('login', False, _fresh_login, 302),
+        Scenario('register', False, _register, 302),
+        Scenario('upload_page', True, lambda client, worker: client.get('/resume-upload/'), 200),
+        Scenario('upload', True, _upload, 302),
+        Scenario('settings_page', True, lambda client, worker: client.get('/settings/'), 200),
+        Scenario('settings_update', True, _settings_update, 302),
+    ]
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the login, registration, resume upload and settings flows in-process against a '
+        'local mongod or an in-memory MongoDB stand-in (mongomock), with seeded data. Reports '
+        'requests/sec, latency percentiles and MongoDB round trips per request.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mongo-uri', default='mongodb://localhost:27017',
+                            help='Local MongoDB to test against (default: %(default)s)')
+        parser.add_argument('--in-memory', action='store_true',
+                            help='Use an in-process mongomock database instead of a server')
+        parser.add_argument('--database', default=LOAD_TEST_DATABASE,
+                            help='Scratch database, dropped afterwards unless --keep-data (default: %(default)s)')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                            help='Comma-separated subset of: ' + ', '.join(SCENARIOS))
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=8, help='Worker threads per scenario')
+        parser.add_argument('--users', type=int, default=20, help='Seeded recruiter accounts')
+        parser.add_argument('--uploads-per-user', type=int, default=50, help='Seeded upload history per user')
+        parser.add_argument('--simulated-parser', action='store_true',
+                            help='Use simulate_ai_parsing instead of the worker-pool regex parser')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed p95 / round-trip growth over the baseline before failing (default: 20%%)')
+        parser.add_argument('--keep-data', action='store_true', help='Keep the scratch database and accounts')
+        parser.add_argument('--allow-remote', action='store_true',
+                            help='Allow a non-local --mongo-uri (never the configured production cluster)')
+
+    def handle(self, *args, **options):
+        unknown = set(options['scenarios'].split(',')) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Unknown scenario(s): {", ".join(sorted(unknown))}')
+        scenarios = [SCENARIOS[name] for name in options['scenarios'].split(',')]
+
+        uri = options['mongo_uri']
+        if not options['in_memory']:
+            if uri == getattr(settings, 'MONGODB_SETTINGS', {}).get('connection_string'):
+                raise CommandError('Refusing to load-test the configured production cluster')
+            if not options['allow_remote'] and not uri.startswith(('mongodb://localhost', 'mongodb://127.0.0.1')):
+                raise CommandError(f'{uri} is not local; pass --allow-remote to use it anyway')
+
+        scratch_dir = tempfile.mkdtemp(prefix='resume-loadtest-')
+        overrides = {
+            'MONGODB_SETTINGS': {'connection_string': options['mongo_uri'], 'database': options['database']},
+            'MONGO_METRICS_HEADERS': True,
+            'ALLOWED_HOSTS': ['testserver'],
+            'MEDIA_ROOT': f'{scratch_dir}/media',
+            'SEARCH_INDEX_PATH': f'{scratch_dir}/search_index.sqlite3',
+            'SIMILARITY_INDEX_PATH': f'{scratch_dir}/similarity_index',
+        }
+        if options['simulated_parser']:
+            overrides['RESUME_PARSER_BACKEND'] = 'simulated'
+
+        # Access lines for every request would drown the report; warnings still show
+        access_logger = logging.getLogger('resume_app.middleware')
+        access_level = access_logger.level
+        access_logger.setLevel(logging.WARNING)
+        # A request that logged an error failed, whatever status it returned
+        error_recorder = _ErrorRecorder()
+        for name in ERROR_LOGGERS:
+            logging.getLogger(name).addHandler(error_recorder)
+        try:
+            with override_settings(**overrides), self.mongo(options):
+                mongo = MongoDBConnection()
+                # Keys of the sessions the test clients hold, so cleanup leaves real users signed in
+                self.session_keys = set()
+                try:
+                    self.seed(mongo, options)
+                    results = {scenario.name: self.run(scenario, options) for scenario in scenarios}
+                finally:
+                    if not options['keep_data']:
+                        mongo.client.drop_database(options['database'])
+                        User.objects.filter(username__startswith=USER_PREFIX).delete()
+                        Session.objects.filter(session_key__in=self.session_keys).delete()
+        finally:
+            for name in ERROR_LOGGERS:
+                logging.getLogger(name).removeHandler(error_recorder)
+            access_logger.setLevel(access_level)
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['tolerance'])
+
+    @contextmanager
+    def mongo(self, options):
+        """Point the shared MongoDBConnection client at the test database for the duration of the run"""
+        if options['in_memory']:
+            try:
+                import mongomock
+            except ImportError:
+                raise CommandError('--in-memory needs mongomock (pip install -r requirements-dev.txt)')
+            _instrument_mongomock(mongomock)
+            client = mongomock.MongoClient()
+            AsyncMongoDBConnection.reset_client(lambda: AsyncClientAdapter(client, threaded=False))
+        else:
+            uri = options['mongo_uri']
+            client = None
+            probe = pymongo.MongoClient(uri, serverSelectionTimeoutMS=2000)
+            try:
+                probe.admin.command('ping')
+            except pymongo.errors.PyMongoError:
+                raise CommandError(f'Cannot reach MongoDB at {uri}; start mongod or use --in-memory')
+            finally:
+                probe.close()
+
+        MongoDBConnection.reset_client(client)
+        try:
+            yield
+        finally:
+            MongoDBConnection.reset_client()
+            AsyncMongoDBConnection.reset_client()
+
+    def seed(self, mongo, options):
+        """Recruiter accounts with an upload history each, so pages read realistic amounts of data"""
+        started = time.perf_counter()
+        password_hash = hashlib.sha256(PASSWORD.encode()).hexdigest()
+        now = datetime.now()
+        users = []
+        uploads = []
+        for index in range(options['users']):
+            username = f'{USER_PREFIX}user_{index}'
+            users.append({
+                'username': username,
+                'email': f'{username}@example.com',
+                'password_hash': password_hash,
+                'first_name': 'Load',
+                'last_name': f'Test {index}',
+                'full_name': f'Load Test {index}',
+                'company': 'Load Test Inc',
+                'role': 'recruiter',
+                'is_active': True,
+                'date_joined': now,
+                'profile': {'location': '', 'device_info': '', 'browser_info': ''},
+                'preferences': {'email_alerts': True, 'application_updates': True, 'theme': 'light', 'language': 'en'},
+            })
+            for number in range(options['uploads_per_user']):
+                uploads.append({
+                    'filename': f'seed-{index}-{number}.pdf',
+                    'file_type': '.pdf',
+                    'file_size': 120000,
+                    'content_hash': hashlib.sha256(f'seed-{index}-{number}'.encode()).hexdigest(),
+                    'job_title': 'Software Engineer',
+                    'department': 'Engineering',
+                    'tags': ['seed'],
+                    'status': 'completed' if number % 10 else 'failed',
+                    'upload_date': now - timedelta(minutes=number),
+                    'uploaded_by': username,
+                    'processing_time': 0.5,
+                })
+        if users:
+            mongo.get_collection().insert_many(users)
+        if uploads:
+            mongo.get_collection('resume_uploads').insert_many(uploads)
+        self.stdout.write(
+            f'Seeded {len(users)} users and {len(uploads)} uploads in {time.perf_counter() - started:.1f}s'
+        )
+
+    def run(self, scenario, options):
+        latencies = []
+        round_trips = []
+        db_times = []
+        failures = []
+        lock = threading.Lock()
+        remaining = iter(range(options['requests']))
+        users = max(options['users'], 1)
+        # Workers sign in first; the clock starts once all of them are ready
+        ready = threading.Barrier(options['concurrency'] + 1)
+
+        def worker(index):
+            client = Client()
+            state = {'index': index, 'username': f'{USER_PREFIX}user_{index % users}', 'iteration': 0}
+            signed_in = not scenario.login or _login(client, state).status_code == 302
+            self.remember_session(client)
+            ready.wait()
+            if not signed_in:
+                with lock:
+                    failures.append(f'worker {index} could not log in')
+                return
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                errors = []
+                token = _request_errors.set(errors)
+                started = time.perf_counter()
+                try:
+                    response = scenario.run(client, state)
+                except Exception as e:
+                    with lock:
+                        failures.append(repr(e))
+                    continue
+                finally:
+                    _request_errors.reset(token)
+                    self.remember_session(client)
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    round_trips.append(int(response.get('X-DB-Queries', 0)))
+                    db_times.append(float(response.get('X-DB-Time-Ms', 0)))
+                    if response.status_code != scenario.expected_status:
+                        failures.append(f'HTTP {response.status_code}')
+                    elif errors:
+                        failures.append(f'logged ERROR: {errors[0]}')
+
+        # Warm-up request so the first measured one does not pay for imports, pools and indexes
+        warmup = Client()
+        if scenario.login:
+            _login(warmup, {'username': f'{USER_PREFIX}user_0'})
+        scenario.run(warmup, {'index': -1, 'username': f'{USER_PREFIX}user_0', 'iteration': 0})
+        self.remember_session(warmup)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        ready.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0.0
+        return {
+            'requests': len(latencies),
+            'failures': len(failures),
+            'failure_samples': sorted(set(failures))[:5],
+            'requests_per_second': round(len(latencies) / wall, 1) if wall else 0.0,
+            'mean_ms': round(statistics.mean(latencies), 2) if latencies else 0.0,
+            'p50_ms': round(percentile(0.50), 2),
+            'p95_ms': round(percentile(0.95), 2),
+            'p99_ms': round(percentile(0.99), 2),
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+            'db_round_trips': round(statistics.mean(round_trips), 2) if round_trips else 0.0,
+            'db_ms': round(statistics.mean(db_times), 2) if db_times else 0.0,
+        }
+
+    def remember_session(self, client):
+        # Called after every request: a login rotates the key and deletes the old session itself,
+        # and a key dropped by cookies.clear() was recorded after the request that set it
+        cookie = client.cookies.get(settings.SESSION_COOKIE_NAME)
+        if cookie is not None and cookie.value:
+            self.session_keys.add(cookie.value)
+
+    def report(self, results):
+        header = f'{"scenario":<16}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"max ms":>9}{"DB/req":>8}{"DB ms":>8}{"fail":>6}'
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, result in results.items():
+            line = (
+                f'{name:<16}{result["requests_per_second"]:>9.1f}{result["p50_ms"]:>9.1f}{result["p95_ms"]:>9.1f}'
+                f'{result["p99_ms"]:>9.1f}{result["max_ms"]:>9.1f}{result["db_round_trips"]:>8.1f}'
+                f'{result["db_ms"]:>8.1f}{result["failures"]:>6}'
+            )
+            self.stdout.write(self.style.ERROR(line) if result['failures'] else line)
+            for sample in result['failure_samples']:
+                self.stdout.write(f'    {sample}')
+
+    def compare(self, results, baseline_path, tolerance):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if not before:
+                continue
+            for metric in ('p95_ms', 'db_round_trips'):
+                if before[metric] and result[metric] > before[metric] * (1 + tolerance):
+                    regressions.append(f'{name} {metric}: {before[metric]} -> {result[metric]}')
+        if regressions:
+            raise CommandError('Performance regressions over baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions over {baseline_path} (tolerance {tolerance:.0%})'))
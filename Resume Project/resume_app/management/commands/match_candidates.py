@@ -0,0 +1,82 @@
+import time
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection
+from resume_app.utils.matching_engine import JOBS_COLLECTION, find_job_skills, get_matching_engine
+from resume_app.utils.search_index import update_candidates_field
+
+
+class Command(BaseCommand):
+    help = 'Rank candidates against a job\'s required skills and optionally persist ai_score'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job-title', required=True)
+        parser.add_argument('--skills', default='', help='Comma separated required skills')
+        parser.add_argument('--department', default='')
+        parser.add_argument(
+            '--save-job', action='store_true',
+            help='Create or update the job posting with --skills so uploads are scored against it'
+        )
+        parser.add_argument('--top', type=int, default=20, help='Number of best matches to print')
+        parser.add_argument(
+            '--persist', action='store_true',
+            help='Write the match score to ai_score for every candidate who applied to this job'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        candidate_collection = mongo.get_collection('candidates')
+        jobs_collection = mongo.get_collection(JOBS_COLLECTION)
+        job_title = options['job_title']
+
+        skills = [skill.strip() for skill in options['skills'].split(',') if skill.strip()]
+        if options['save_job']:
+            if not skills:
+                raise CommandError('--save-job needs --skills')
+            jobs_collection.update_one(
+                {'title': job_title},
+                {
+                    '$set': {'required_skills': skills, 'department': options['department'],
+                             'last_updated': datetime.now()},
+                    '$setOnInsert': {'created_date': datetime.now()}
+                },
+                upsert=True
+            )
+        skills = skills or find_job_skills(jobs_collection, job_title)
+        if not skills:
+            raise CommandError(f'No skills given and no job posting found for "{job_title}"')
+
+        started = time.perf_counter()
+        engine = get_matching_engine(candidate_collection)
+        self.stdout.write(f'Skill matrix ready in {time.perf_counter() - started:.1f}s '
+                          f'({engine.matrix.shape[0]} rows x {engine.matrix.shape[1]} skills)')
+
+        started = time.perf_counter()
+        matches = engine.top_k(skills, k=options['top'])
+        self.stdout.write(f'Top {len(matches)} of all candidates in {(time.perf_counter() - started) * 1000:.1f} ms:')
+        for candidate_id, score in matches:
+            self.stdout.write(f'  {candidate_id}  {score:5.1f}')
+
+        if options['persist']:
+            self.persist(candidate_collection, engine, job_title, skills, options['batch_size'])
+
+    def persist(self, candidate_collection, engine, job_title, skills, batch_size):
+        applicant_ids = [
+            doc['_id'] for doc in candidate_collection.find({'job_title_applied': job_title}, {'_id': 1})
+        ]
+        scores = engine.score_all(skills, applicant_ids)
+
+        # Each batch is one bulk write in Mongo and one transaction in the search index
+        scores = list(scores.items())
+        written = 0
+        for start in range(0, len(scores), batch_size):
+            batch = scores[start:start + batch_size]
+            candidate_collection.bulk_write(
+                [UpdateOne({'_id': candidate_id}, {'$set': {'ai_score': score}}) for candidate_id, score in batch],
+                ordered=False
+            )
+            update_candidates_field('ai_score', batch)
+            written += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'ai_score written for {written} applicants to "{job_title}".'))
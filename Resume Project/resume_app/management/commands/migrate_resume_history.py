@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection
+from resume_app.utils.history_utils import (
+    HISTORY_COLLECTION, PARSE_RESULTS_COLLECTION, migrate_candidate_history
+)
+
+
+class Command(BaseCommand):
+    help = ('Move embedded resume_history into bucketed history documents and '
+            'replace parsed_data copies on resume_uploads with parse_result_id references')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        self.batch_size = options['batch_size']
+        self.migrate_history(mongo)
+        self.migrate_parse_results(mongo)
+        self.stdout.write(self.style.SUCCESS('Resume history migration complete.'))
+
+    def migrate_history(self, mongo):
+        candidate_collection = mongo.get_collection('candidates')
+        history_collection = mongo.get_collection(HISTORY_COLLECTION)
+
+        # Candidates written before the migration have no resume_count. Each one's buckets
+        # and marker are written before moving on, so an interrupted run can simply be rerun.
+        migrated = 0
+        cursor = candidate_collection.find(
+            {'resume_count': {'$exists': False}}, {'resume_history': 1}
+        ).batch_size(self.batch_size)
+
+        for candidate in cursor:
+            migrate_candidate_history(candidate_collection, history_collection, candidate)
+            migrated += 1
+            if migrated % self.batch_size == 0:
+                self.stdout.write(f'  {migrated} candidates migrated...')
+        self.stdout.write(f'Candidates migrated: {migrated}')
+
+    def migrate_parse_results(self, mongo):
+        upload_collection = mongo.get_collection('resume_uploads')
+        parse_results_collection = mongo.get_collection(PARSE_RESULTS_COLLECTION)
+
+        migrated = 0
+        result_updates = []
+        upload_updates = []
+        cursor = upload_collection.find(
+            {'parsed_data': {'$exists': True}}, {'parsed_data': 1, 'content_hash': 1}
+        ).batch_size(self.batch_size)
+
+        for upload in cursor:
+            # Uploads stored before content hashing keep a result of their own
+            parse_result_id = upload.get('content_hash') or upload['_id']
+            result_updates.append(UpdateOne(
+                {'_id': parse_result_id},
+                {'$setOnInsert': {'parsed_data': upload['parsed_data']}},
+                upsert=True
+            ))
+            upload_updates.append(UpdateOne(
+                {'_id': upload['_id']},
+                {'$set': {'parse_result_id': parse_result_id}, '$unset': {'parsed_data': ''}}
+            ))
+            if len(upload_updates) >= self.batch_size:
+                parse_results_collection.bulk_write(result_updates, ordered=False)
+                upload_collection.bulk_write(upload_updates, ordered=False)
+                migrated += len(upload_updates)
+                result_updates, upload_updates = [], []
+                self.stdout.write(f'  {migrated} uploads migrated...')
+
+        if upload_updates:
+            parse_results_collection.bulk_write(result_updates, ordered=False)
+            upload_collection.bulk_write(upload_updates, ordered=False)
+            migrated += len(upload_updates)
+        self.stdout.write(f'Uploads migrated: {migrated}')
@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from resume_app.views import MongoDBConnection
+from resume_app.utils.rollup_utils import ROLLUP_COLLECTION, rebuild_rollups
+from resume_app.utils.pipeline_utils import STAGE_EVENTS_COLLECTION
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard rollup documents from candidates, resume_uploads and stage events'
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        started = time.perf_counter()
+        count = rebuild_rollups(
+            mongo.get_collection('candidates'),
+            mongo.get_collection('resume_uploads'),
+            mongo.get_collection(ROLLUP_COLLECTION),
+            mongo.get_collection(STAGE_EVENTS_COLLECTION)
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {count} dashboard rollup documents in {time.perf_counter() - started:.1f}s.'
+        ))
+        self.stdout.write('Writes made while the rebuild ran are not included; run it during a quiet period.')
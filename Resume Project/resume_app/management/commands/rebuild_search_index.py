@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from resume_app.views import MongoDBConnection
+from resume_app.utils.search_index import get_connection, index_candidates
+
+# Candidate fields read from Mongo to build the index
+INDEXED_FIELDS = {
+    'first_name': 1, 'last_name': 1, 'skills': 1, 'experience': 1, 'education': 1,
+    'summary': 1, 'status': 1, 'department': 1, 'ai_score': 1,
+}
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text candidate search index from the candidates collection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Upsert into the existing index instead of clearing it first'
+        )
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        connection = get_connection()
+        batch_size = options['batch_size']
+
+        if not options['keep']:
+            with connection:
+                connection.execute('DELETE FROM candidate_fts')
+                connection.execute('DELETE FROM candidate_docs')
+
+        indexed = 0
+        batch = []
+        cursor = mongo.get_collection('candidates').find({}, INDEXED_FIELDS).batch_size(batch_size)
+        for candidate in cursor:
+            batch.append(candidate)
+            if len(batch) >= batch_size:
+                index_candidates(batch, connection)
+                indexed += len(batch)
+                batch = []
+                self.stdout.write(f'  {indexed} candidates indexed...')
+        if batch:
+            index_candidates(batch, connection)
+            indexed += len(batch)
+
+        with connection:
+            connection.execute("INSERT INTO candidate_fts (candidate_fts) VALUES ('optimize')")
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt with {indexed} candidates.'))
@@ -0,0 +1,158 @@
+import os
+import time
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from resume_app.views import MongoDBConnection, parse_resume_data, parsed_profile_fields
+from resume_app.management.commands.rebuild_search_index import INDEXED_FIELDS
+from resume_app.utils.blob_storage import local_blob_path
+from resume_app.utils.history_utils import PARSE_RESULTS_COLLECTION
+from resume_app.utils.parser_pool import ResumeParseError, parser_stamp, stale_parse_query
+from resume_app.utils.search_index import get_connection, index_candidates
+from resume_app.utils.skill_taxonomy import SKILL_TAXONOMY_COLLECTION, get_skill_taxonomy
+from resume_app.utils.upload_utils import map_concurrently
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-parse stored resumes whose parse results were produced by an older parser version '
+        'or another backend, and refresh the candidates created from them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Documents parsed concurrently (default: RESUME_PARSER_WORKERS or the CPU count)'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.5,
+            help='Seconds to sleep between batches, leaving the parser pool and Mongo to live traffic'
+        )
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many parse results')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the stale parse results')
+
+    def handle(self, *args, **options):
+        mongo = MongoDBConnection()
+        parse_results_collection = mongo.get_collection(PARSE_RESULTS_COLLECTION)
+        upload_collection = mongo.get_collection('resume_uploads')
+        candidate_collection = mongo.get_collection('candidates')
+        taxonomy = get_skill_taxonomy(mongo.get_collection(SKILL_TAXONOMY_COLLECTION))
+
+        stamp = parser_stamp()
+        query = stale_parse_query(stamp)
+        total = parse_results_collection.count_documents(query)
+        if options['limit'] is not None:
+            total = min(total, options['limit'])
+        self.stdout.write(
+            f"{total} parse results to re-parse with {stamp['parser_backend']} v{stamp['parser_version']}."
+        )
+        if options['dry_run'] or not total:
+            return
+
+        workers = options['workers'] or getattr(settings, 'RESUME_PARSER_WORKERS', None) or os.cpu_count() or 2
+        connection = get_connection()
+        started = time.perf_counter()
+        done = failed = refreshed = 0
+        last_id = None
+
+        # Walks the stale results in _id order, so a run stopped at any point resumes where it left
+        # off (finished results are no longer stale) and failures are not retried until the next run
+        while done < total:
+            batch_query = query if last_id is None else {'$and': [query, {'_id': {'$gt': last_id}}]}
+            cursor = parse_results_collection.find(batch_query, {'_id': 1}).sort('_id', 1)
+            hashes = [result['_id'] for result in cursor.limit(min(options['batch_size'], total - done))]
+            if not hashes:
+                break
+            last_id = hashes[-1]
+
+            sources, candidate_ids = self.sources(upload_collection, hashes)
+            results = map_concurrently(
+                lambda content_hash: self.reparse(content_hash, sources.get(content_hash)), hashes, workers
+            )
+
+            result_updates = []
+            candidate_updates = []
+            updated_ids = []
+            now = datetime.now()
+            for content_hash, parsed_data, error in results:
+                if error is not None:
+                    failed += 1
+                    result_updates.append(UpdateOne(
+                        {'_id': content_hash}, {'$set': {'reparse_error': error, 'reparse_attempted': now}}
+                    ))
+                    continue
+                result_updates.append(UpdateOne(
+                    {'_id': content_hash},
+                    {'$set': {'parsed_data': parsed_data, **stamp, 'reparsed_date': now},
+                     '$unset': {'reparse_error': '', 'reparse_attempted': ''}}
+                ))
+                if candidate_ids.get(content_hash):
+                    fields = parsed_profile_fields(parsed_data, taxonomy)
+                    for candidate_id in candidate_ids[content_hash]:
+                        candidate_updates.append(UpdateOne(
+                            {'_id': candidate_id}, {'$set': {**fields, 'last_updated': now}}
+                        ))
+                        updated_ids.append(candidate_id)
+
+            parse_results_collection.bulk_write(result_updates, ordered=False)
+            if candidate_updates:
+                candidate_collection.bulk_write(candidate_updates, ordered=False)
+                # Full-text search reads profile text; the similarity index and matching engine
+                # pick the changes up through last_updated
+                refreshed_candidates = candidate_collection.find({'_id': {'$in': updated_ids}}, INDEXED_FIELDS)
+                index_candidates(list(refreshed_candidates), connection)
+                refreshed += len(candidate_updates)
+
+            done += len(hashes)
+            elapsed = time.perf_counter() - started
+            rate = done / elapsed if elapsed else 0
+            eta = timedelta(seconds=round((total - done) / rate)) if rate else 'unknown'
+            self.stdout.write(
+                f'  {done}/{total} re-parsed ({failed} failed, {refreshed} candidates refreshed), '
+                f'{rate:.1f}/s, ETA {eta}'
+            )
+            if done < total and options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-parsed {done - failed} of {done} parse results and refreshed {refreshed} candidates '
+            f'({time.perf_counter() - started:.1f}s).'
+        ))
+        if failed:
+            self.stdout.write(f'{failed} failed and stay stale; their reason is in reparse_error. Rerun to retry them.')
+
+    def sources(self, upload_collection, hashes):
+        """
+        ({content_hash: upload holding the stored file}, {content_hash: [candidate ids created from it]}).
+        Candidates merged into by a later upload keep the profile parsed at creation.
+        """
+        sources = {}
+        candidate_ids = {}
+        uploads = upload_collection.find(
+            {'content_hash': {'$in': hashes}, 'status': 'completed'},
+            {'content_hash': 1, 'filename': 1, 'file_path': 1, 'file_type': 1, 'candidate_id': 1, 'is_duplicate': 1}
+        )
+        for upload in uploads:
+            if upload.get('file_path'):
+                sources.setdefault(upload['content_hash'], upload)
+            if not upload.get('is_duplicate') and upload.get('candidate_id') is not None:
+                candidate_ids.setdefault(upload['content_hash'], set()).add(upload['candidate_id'])
+        return sources, candidate_ids
+
+    def reparse(self, content_hash, upload):
+        """(content_hash, parsed_data, None) or (content_hash, None, error)"""
+        if upload is None:
+            return content_hash, None, 'no completed upload references this result'
+        filename = upload.get('filename') or upload['file_path']
+        try:
+            with local_blob_path(upload['file_path']) as local_path:
+                if not os.path.exists(local_path):
+                    return content_hash, None, 'stored file is missing'
+                parsed_data, _ = parse_resume_data(local_path, filename, upload.get('file_type'))
+        except OSError as e:
+            return content_hash, None, f'stored file is unreadable: {e}'
+        except ResumeParseError as e:
+            return content_hash, None, str(e)
+        return content_hash, parsed_data, None
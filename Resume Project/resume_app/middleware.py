@@ -0,0 +1,134 @@
+import logging
+import time
+import uuid
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from .utils.db_metrics import RequestStats, current_request, record_request
+from .utils.log_utils import RequestContext, current_context
+
+logger = logging.getLogger(__name__)
+
+
+class RequestLoggingMiddleware:
+    """
+    Tags every log line of a request with its request ID and view, and logs one
+    access line per request with its status and timings. The ID is taken from
+    an incoming X-Request-ID header when present and echoed on the response.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        context, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_context.reset(token)
+        return self.finish(request, response, context, started)
+
+    async def __acall__(self, request):
+        context, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_context.reset(token)
+        return self.finish(request, response, context, started)
+
+    def start(self, request):
+        request_id = request.headers.get('X-Request-ID', '')[:64] or uuid.uuid4().hex
+        context = RequestContext(request_id)
+        request.request_id = request_id
+        return context, current_context.set(context), time.perf_counter()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        context = current_context.get()
+        if context is not None and request.resolver_match:
+            context.view = request.resolver_match.view_name
+
+    def finish(self, request, response, context, started):
+        stats = getattr(request, 'db_stats', None)
+        status = response.status_code
+        level = logging.ERROR if status >= 500 else logging.WARNING if status >= 400 else logging.INFO
+        logger.log(level, '%s %s %s', request.method, request.path, status, extra={
+            'request_id': context.request_id,
+            'view': context.view or 'unresolved',
+            'status': status,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            'db_queries': stats.queries if stats else None,
+            'db_ms': round(stats.seconds * 1000, 1) if stats else None,
+            'sampled': level == logging.INFO,
+        })
+        response['X-Request-ID'] = context.request_id
+        return response
+
+
+class DBMetricsMiddleware:
+    """
+    Counts the MongoDB commands and DB time of each request, records them per
+    view for /metrics and warns when a request goes over its budget: the view's
+    MONGO_QUERY_BUDGETS entry (or MONGO_QUERY_BUDGET), plus
+    MONGO_QUERY_BUDGET_PER_FILE for every file the request declared with charge_files.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_budget = getattr(settings, 'MONGO_QUERY_BUDGET', 10)
+        self.view_query_budgets = getattr(settings, 'MONGO_QUERY_BUDGETS', {})
+        self.file_query_budget = getattr(settings, 'MONGO_QUERY_BUDGET_PER_FILE', 12)
+        self.time_budget = getattr(settings, 'MONGO_TIME_BUDGET_MS', 250) / 1000
+        self.add_headers = getattr(settings, 'MONGO_METRICS_HEADERS', settings.DEBUG)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = request.db_stats = RequestStats()
+        token = current_request.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = request.db_stats = RequestStats()
+        token = current_request.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or 'unresolved'
+        query_budget = self.view_query_budgets.get(view, self.query_budget) + self.file_query_budget * stats.files
+        over_budget = stats.queries > query_budget or stats.seconds > self.time_budget
+        record_request(view, stats, over_budget)
+
+        if over_budget:
+            slowest = stats.slowest
+            logger.warning(
+                '%s %s made %d MongoDB commands in %.1f ms', request.method, request.path,
+                stats.queries, stats.seconds * 1000,
+                extra={
+                    'view': view,
+                    'slowest_command': slowest[1] if slowest else None,
+                    'slowest_collection': slowest[2] if slowest else None,
+                    'slowest_ms': round(slowest[0] * 1000, 1) if slowest else None,
+                }
+            )
+        if self.add_headers:
+            response['X-DB-Queries'] = str(stats.queries)
+            response['X-DB-Time-Ms'] = f'{stats.seconds * 1000:.1f}'
+        return response
@@ -0,0 +1,278 @@
+// Candidates Page JavaScript
+
+document.addEventListener('DOMContentLoaded', function() {
+    initializeCandidateFilters();
+    loadCandidates(true);
+    loadSkillFacets();
+});
+
+let nextCursor = null;
+let searchOffset = 0;
+
+function initializeCandidateFilters() {
+    const filterForm = document.getElementById('candidate-filters');
+    const loadMoreBtn = document.getElementById('load-more');
+
+    filterForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        loadCandidates(true);
+        loadSkillFacets();
+    });
+
+    loadMoreBtn.addEventListener('click', function() {
+        loadCandidates(false);
+    });
+}
+
+function buildQuery(reset) {
+    const params = new URLSearchParams();
+    const formData = new FormData(document.getElementById('candidate-filters'));
+
+    formData.forEach((value, key) => {
+        if (value) {
+            params.append(key, value);
+        }
+    });
+
+    if (params.get('q')) {
+        // Search results are ranked, so they page by offset instead of cursor
+        params.delete('sort');
+        params.set('offset', reset ? 0 : searchOffset);
+    } else if (!reset && nextCursor) {
+        params.append('cursor', nextCursor);
+    }
+    return params;
+}
+
+function selectedSkillIds() {
+    const value = document.getElementById('filter-skill-ids').value;
+    return value ? value.split(',') : [];
+}
+
+// Most common skills among the filtered candidates; clicking one narrows the listing to it
+function loadSkillFacets() {
+    const container = document.getElementById('skill-facets');
+    const params = buildQuery(true);
+    ['q', 'sort', 'offset'].forEach(key => params.delete(key));
+
+    fetch(`${container.dataset.url}?${params.toString()}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.status !== 'success') {
+                throw new Error(data.message);
+            }
+            const selected = selectedSkillIds();
+            container.innerHTML = '';
+            data.skills.forEach(skill => {
+                const button = document.createElement('button');
+                const active = selected.includes(String(skill.id));
+                button.type = 'button';
+                button.className = `btn btn-sm ${active ? 'btn-primary' : 'btn-outline-secondary'}`;
+                button.textContent = `${skill.name} (${skill.count})`;
+                button.addEventListener('click', () => toggleSkillFilter(String(skill.id)));
+                container.appendChild(button);
+            });
+        })
+        .catch(error => console.error('Error loading skill facets:', error));
+}
+
+function toggleSkillFilter(skillId) {
+    const selected = selectedSkillIds();
+    const index = selected.indexOf(skillId);
+    if (index === -1) {
+        selected.push(skillId);
+    } else {
+        selected.splice(index, 1);
+    }
+    document.getElementById('filter-skill-ids').value = selected.join(',');
+    loadCandidates(true);
+    loadSkillFacets();
+}
+
+function loadCandidates(reset) {
+    const tbody = document.getElementById('candidate-rows');
+    const loadMoreBtn = document.getElementById('load-more');
+    const emptyState = document.getElementById('candidates-empty');
+
+    loadMoreBtn.disabled = true;
+
+    const params = buildQuery(reset);
+    const isSearch = params.has('q');
+    const url = isSearch ? tbody.dataset.searchUrl : tbody.dataset.apiUrl;
+
+    fetch(`${url}?${params.toString()}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.status !== 'success') {
+                throw new Error(data.message);
+            }
+
+            if (reset) {
+                tbody.innerHTML = '';
+                searchOffset = 0;
+            }
+            data.results.forEach(candidate => {
+                tbody.appendChild(isSearch ? renderSearchRow(candidate) : renderCandidateRow(candidate));
+            });
+
+            nextCursor = data.next_cursor;
+            searchOffset += data.results.length;
+            loadMoreBtn.style.display = data.has_more ? 'inline-block' : 'none';
+            emptyState.style.display = tbody.children.length === 0 ? 'block' : 'none';
+        })
+        .catch(error => {
+            console.error('Error loading candidates:', error);
+            alert('Could not load candidates. Please try again.');
+        })
+        .finally(() => {
+            loadMoreBtn.disabled = false;
+        });
+}
+
+function renderCandidateRow(candidate) {
+    const row = document.createElement('tr');
+    const cells = [
+        `${candidate.first_name || ''} ${candidate.last_name || ''}`.trim() || 'Unknown',
+        candidate.email || '',
+        candidate.job_title_applied || '',
+        candidate.department || '',
+        (candidate.skills || []).join(', '),
+        candidate.experience_years ?? '',
+        candidate.ai_score ?? ''
+    ];
+
+    cells.forEach(value => {
+        const cell = document.createElement('td');
+        cell.textContent = value;
+        row.appendChild(cell);
+    });
+
+    const stageCell = document.createElement('td');
+    stageCell.appendChild(renderStageSelect(candidate));
+    row.appendChild(stageCell);
+
+    if ((candidate.likely_duplicates || []).length) {
+        row.firstChild.appendChild(renderDuplicatesLink(candidate, row));
+    }
+    return row;
+}
+
+function renderDuplicatesLink(candidate, row) {
+    const link = document.createElement('a');
+    link.href = '#';
+    link.className = 'd-block small';
+    link.textContent = 'Likely same candidate';
+
+    let detailRow = null;
+    link.addEventListener('click', function(e) {
+        e.preventDefault();
+        if (detailRow) {
+            detailRow.remove();
+            detailRow = null;
+            return;
+        }
+        loadDuplicates(candidate._id)
+            .then(duplicates => {
+                detailRow = renderDuplicatesRow(duplicates, row.children.length);
+                row.after(detailRow);
+            })
+            .catch(error => alert(error.message));
+    });
+    return link;
+}
+
+function loadDuplicates(candidateId) {
+    const tbody = document.getElementById('candidate-rows');
+    return fetch(tbody.dataset.duplicatesUrl.replace('CANDIDATE_ID', candidateId))
+        .then(response => response.json())
+        .then(data => {
+            if (data.status !== 'success') {
+                throw new Error(data.message || 'Could not load duplicates');
+            }
+            return data.results;
+        });
+}
+
+function renderDuplicatesRow(duplicates, columns) {
+    const row = document.createElement('tr');
+    const cell = document.createElement('td');
+    cell.colSpan = columns;
+    cell.className = 'small text-muted';
+
+    const list = document.createElement('ul');
+    list.className = 'mb-0';
+    duplicates.forEach(duplicate => {
+        const item = document.createElement('li');
+        const name = `${duplicate.first_name || ''} ${duplicate.last_name || ''}`.trim() || 'Unknown';
+        const similarity = duplicate.similarity === null ? '' : ` (${Math.round(duplicate.similarity * 100)}% similar resume)`;
+        item.textContent = `${name} ${duplicate.email || ''} - ${duplicate.job_title_applied || 'no role'}, ${duplicate.status || 'new'}${similarity}`;
+        list.appendChild(item);
+    });
+    cell.appendChild(list);
+    row.appendChild(cell);
+    return row;
+}
+
+function renderStageSelect(candidate) {
+    const stages = JSON.parse(document.getElementById('pipeline-stages').textContent);
+    const select = document.createElement('select');
+    select.className = 'form-select form-select-sm';
+
+    stages.forEach(stage => {
+        const option = document.createElement('option');
+        option.value = stage;
+        option.textContent = stage.charAt(0).toUpperCase() + stage.slice(1);
+        option.selected = stage === (candidate.status || 'new');
+        select.appendChild(option);
+    });
+
+    let current = select.value;
+    select.addEventListener('change', function() {
+        moveCandidate(candidate._id, select.value)
+            .then(() => {
+                current = select.value;
+            })
+            .catch(error => {
+                select.value = current;
+                alert(error.message);
+            });
+    });
+    return select;
+}
+
+function moveCandidate(candidateId, stage) {
+    const tbody = document.getElementById('candidate-rows');
+    const body = new URLSearchParams({stage: stage});
+    return fetch(tbody.dataset.stageUrl.replace('CANDIDATE_ID', candidateId), {
+        method: 'POST',
+        headers: {'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value},
+        body: body
+    })
+        .then(response => response.json())
+        .then(data => {
+            if (data.status !== 'success') {
+                throw new Error(data.message || 'Could not update stage');
+            }
+            return data;
+        });
+}
+
+function renderSearchRow(result) {
+    const row = document.createElement('tr');
+    const nameCell = document.createElement('td');
+    nameCell.textContent = result.name || 'Unknown';
+    row.appendChild(nameCell);
+
+    // Snippet HTML is escaped server-side; only <mark> highlights are markup
+    const snippetCell = document.createElement('td');
+    snippetCell.colSpan = 5;
+    snippetCell.innerHTML = result.snippet;
+    row.appendChild(snippetCell);
+
+    [result.ai_score ?? '', result.status || ''].forEach(value => {
+        const cell = document.createElement('td');
+        cell.textContent = value;
+        row.appendChild(cell);
+    });
+    return row;
+}
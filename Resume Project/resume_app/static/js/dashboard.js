@@ -12,8 +12,39 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Add interactive effects
     addInteractiveEffects();
+
+    // Live counter updates pushed by the server
+    subscribeToRollups();
 });
 
+function subscribeToRollups() {
+    if (!window.EventSource) return;
+
+    const source = new EventSource('/api/events/');
+    source.addEventListener('rollup', function(e) {
+        applyRollupDelta(JSON.parse(e.data));
+    });
+    // Events were dropped while the connection lagged: reload the exact figures
+    source.addEventListener('resync', function() {
+        window.location.reload();
+    });
+}
+
+// Adds rollup counter increments to every element bound to a counter with data-rollup
+function applyRollupDelta(delta) {
+    document.querySelectorAll('[data-rollup]').forEach(element => {
+        const increment = delta[element.getAttribute('data-rollup')];
+        if (!increment) return;
+
+        const current = parseInt(element.getAttribute('data-target') || element.textContent) || 0;
+        const value = current + increment;
+        if (element.hasAttribute('data-target')) {
+            element.setAttribute('data-target', value);
+        }
+        element.textContent = value;
+    });
+}
+
 function updateDateTime() {
     const now = new Date();
     const dateElement = document.getElementById('currentDate');
@@ -59,12 +90,16 @@ function initializeSourceChart() {
     const ctx = document.getElementById('sourceChart');
     if (!ctx) return;
     
+    // Source counts are rendered into the page from the dashboard rollups
+    const labels = JSON.parse(document.getElementById('source-labels').textContent);
+    const counts = JSON.parse(document.getElementById('source-data').textContent);
+
     new Chart(ctx, {
         type: 'doughnut',
         data: {
-            labels: ['LinkedIn', 'Job Boards', 'Referrals', 'Company Website'],
+            labels: labels,
             datasets: [{
-                data: [40, 30, 20, 10],
+                data: counts,
                 backgroundColor: [
                     'rgba(102, 126, 234, 0.8)',
                     'rgba(79, 172, 254, 0.8)',
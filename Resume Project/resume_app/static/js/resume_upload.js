@@ -7,6 +7,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
 let selectedFiles = [];
 
+// Chunked uploads: files sent at once, and retries of a chunk before giving up
+const PARALLEL_FILE_UPLOADS = 3;
+const CHUNK_RETRIES = 5;
+
 function initializeUploadArea() {
     const uploadArea = document.getElementById('upload-area');
     const fileInput = document.getElementById('file-input');
@@ -48,9 +52,175 @@ function initializeUploadArea() {
             return;
         }
 
-        // Show processing modal
-        showProcessingModal();
+        // Browsers without fetch fall back to the plain multipart form post
+        if (!window.fetch || !window.Blob || !Blob.prototype.slice) {
+            showProcessingModal();
+            return;
+        }
+
+        e.preventDefault();
+        const modal = showProcessingModal();
+        uploadInChunks(selectedFiles, uploadForm)
+            .then(() => {
+                // The result is flashed as messages on the upload page
+                window.location.href = window.location.pathname;
+            })
+            .catch(error => {
+                modal.hide();
+                showNotification(`Upload interrupted: ${error.message}. Submit again to resume where it stopped.`, 'danger');
+            });
+    });
+}
+
+// Chunked, resumable upload: open a batch, PUT every file in chunks from the
+// offset the server has, then complete the batch to process it
+async function uploadInChunks(files, form) {
+    const csrfToken = form.querySelector('[name=csrfmiddlewaretoken]').value;
+    const batch = await openUploadBatch(files, form, csrfToken);
+    const totalBytes = files.reduce((sum, file) => sum + file.size, 0);
+    const received = batch.files.map(file => file.offset);
+    // The first half of the bar is the upload, the second half server-side processing
+    const reportProgress = () => setUploadProgress(0.5 * received.reduce((sum, bytes) => sum + bytes, 0) / totalBytes);
+    reportProgress();
+    const progressEvents = watchBatchProgress(batch.batch_id, files.length);
+
+    let nextFile = 0;
+    async function uploadWorker() {
+        while (nextFile < files.length) {
+            const index = nextFile++;
+            await uploadFileChunks(batch, index, files[index], csrfToken, offset => {
+                received[index] = offset;
+                reportProgress();
+            });
+        }
+    }
+    const workers = Math.min(PARALLEL_FILE_UPLOADS, files.length);
+    await Promise.all(Array.from({ length: workers }, uploadWorker));
+
+    setProcessingText('AI is extracting candidate information...');
+    try {
+        await requestJSON(`/api/uploads/${batch.batch_id}/complete/`, 'POST', csrfToken);
+    } finally {
+        progressEvents.close();
+    }
+    sessionStorage.removeItem(batchStorageKey(files));
+}
+
+// Per-file states pushed by the server while the batch is processed
+function watchBatchProgress(batchId, fileCount) {
+    if (!window.EventSource) {
+        return { close() {} };
+    }
+    const source = new EventSource('/api/events/');
+    const finished = new Set();
+    source.addEventListener('file', function(e) {
+        const event = JSON.parse(e.data);
+        if (event.batch_id !== batchId) {
+            return;
+        }
+        if (event.state === 'completed' || event.state === 'failed') {
+            finished.add(event.index);
+            setUploadProgress(0.5 + 0.5 * finished.size / fileCount);
+            setProcessingText(`Processed ${finished.size} of ${fileCount} resume${fileCount > 1 ? 's' : ''}...`);
+        } else if (event.state === 'parsing') {
+            setProcessingText(`Extracting ${event.filename} (${finished.size} of ${fileCount} done)...`);
+        }
+    });
+    return source;
+}
+
+// Reuse the batch of an interrupted upload of the same files, else open a new one
+async function openUploadBatch(files, form, csrfToken) {
+    const storageKey = batchStorageKey(files);
+    const previousId = sessionStorage.getItem(storageKey);
+    if (previousId) {
+        try {
+            const batch = await requestJSON(`/api/uploads/${previousId}/`, 'GET', csrfToken);
+            if (batch.status === 'open' && batch.files.length === files.length) {
+                return batch;
+            }
+        } catch (error) {
+            // Expired or unknown: start over below
+        }
+    }
+
+    const batch = await requestJSON('/api/uploads/', 'POST', csrfToken, {
+        files: files.map(file => ({ name: file.name, size: file.size })),
+        job_title: form.querySelector('input[name="job_title"]').value,
+        department: form.querySelector('select[name="department"]').value,
+        tags: form.querySelector('input[name="tags"]').value
     });
+    sessionStorage.setItem(storageKey, batch.batch_id);
+    return batch;
+}
+
+async function uploadFileChunks(batch, index, file, csrfToken, onProgress) {
+    const url = `/api/uploads/${batch.batch_id}/files/${index}/`;
+    let offset = batch.files[index].offset;
+    let failures = 0;
+
+    while (offset < file.size) {
+        const chunk = file.slice(offset, offset + batch.chunk_size);
+        try {
+            const headers = { 'X-CSRFToken': csrfToken, 'Content-Type': 'application/octet-stream' };
+            const checksum = await sha256Hex(chunk);
+            if (checksum) {
+                headers['X-Chunk-SHA256'] = checksum;
+            }
+            const response = await fetch(`${url}?offset=${offset}`, {
+                method: 'PUT', headers: headers, body: chunk, credentials: 'same-origin'
+            });
+            const data = await response.json();
+            if (response.ok || (response.status === 409 && data.offset != null)) {
+                // 409: the server holds a different offset (an earlier try landed); continue from there
+                offset = data.offset;
+                failures = 0;
+                onProgress(offset);
+                continue;
+            }
+            throw new Error(data.message || `HTTP ${response.status}`);
+        } catch (error) {
+            if (++failures > CHUNK_RETRIES) {
+                throw error;
+            }
+            await new Promise(resolve => setTimeout(resolve, 500 * 2 ** failures));
+            // The last chunk may have been stored even though its response was lost
+            try {
+                const status = await requestJSON(`/api/uploads/${batch.batch_id}/`, 'GET', csrfToken);
+                offset = status.files[index].offset;
+                onProgress(offset);
+            } catch (statusError) {
+                // Still offline; retry the same chunk
+            }
+        }
+    }
+}
+
+async function requestJSON(url, method, csrfToken, body) {
+    const options = { method: method, headers: { 'X-CSRFToken': csrfToken }, credentials: 'same-origin' };
+    if (body !== undefined) {
+        options.headers['Content-Type'] = 'application/json';
+        options.body = JSON.stringify(body);
+    }
+    const response = await fetch(url, options);
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.message || `HTTP ${response.status}`);
+    }
+    return data;
+}
+
+async function sha256Hex(blob) {
+    // SubtleCrypto only exists on secure origins; the server still hashes every chunk
+    if (!window.crypto || !window.crypto.subtle) {
+        return null;
+    }
+    const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest)).map(byte => byte.toString(16).padStart(2, '0')).join('');
+}
+
+function batchStorageKey(files) {
+    return 'resume-upload:' + files.map(file => `${file.name}:${file.size}:${file.lastModified}`).join('|');
 }
 
 function handleFiles(files) {
@@ -61,7 +231,7 @@ function handleFiles(files) {
         // Check file type
         const fileExtension = '.' + file.name.split('.').pop().toLowerCase();
         if (!allowedTypes.includes(fileExtension)) {
-            alert(`File "${file.name}" has an unsupported format. Please use PDF, DOC, DOCX, or TXT files.`);
+            alert(`File "${file.name}" has an unsupported format. Please use PDF, DOCX, or TXT files.`);
             return;
         }
 
@@ -198,35 +368,29 @@ function initializeFormValidation() {
 function showProcessingModal() {
     const modal = new bootstrap.Modal(document.getElementById('processingModal'));
     modal.show();
+    setProcessingText('Uploading resumes...');
+    setUploadProgress(0);
+    return modal;
+}
 
-    // Simulate progress
-    const progressBar = document.getElementById('progress-bar');
-    let progress = 0;
-
-    const interval = setInterval(() => {
-        progress += Math.random() * 15;
-        if (progress > 90) progress = 90;
-
-        progressBar.style.width = progress + '%';
-
-        if (progress >= 90) {
-            clearInterval(interval);
-        }
-    }, 200);
+function setUploadProgress(fraction) {
+    document.getElementById('progress-bar').style.width = Math.round(fraction * 100) + '%';
+}
 
-    // Hide modal after form submission completes
-    setTimeout(() => {
-        modal.hide();
-    }, 3000);
+function setProcessingText(text) {
+    const label = document.querySelector('#processingModal .modal-body p');
+    if (label) {
+        label.textContent = text;
+    }
 }
 
 // File validation helpers
 function validateFileType(file) {
-    const allowedTypes = ['application/pdf', 'application/msword',
+    const allowedTypes = ['application/pdf',
                          'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
                          'text/plain'];
     return allowedTypes.includes(file.type) ||
-           file.name.toLowerCase().match(/\.(pdf|doc|docx|txt)$/);
+           file.name.toLowerCase().match(/\.(pdf|docx|txt)$/);
 }
 
 function validateFileSize(file, maxSizeMB = 5) {
@@ -0,0 +1,99 @@
+import io
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from resume_app.utils.blob_storage import BLOB_COLLECTION, release_blob, spool_upload, store_blob
+from resume_app.views import MongoDBConnection, process_resume_batch
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+CONTENT = b'Jane Smith\njane@example.com\nSKILLS\nExcel, SAP\n'
+
+
+@skipUnless(mongomock, 'needs mongomock')
+class BlobStorageTests(SimpleTestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media, FILE_UPLOAD_TEMP_DIR=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        MongoDBConnection.reset_client(mongomock.MongoClient())
+        self.addCleanup(MongoDBConnection.reset_client)
+        self.blobs = MongoDBConnection().get_collection(BLOB_COLLECTION)
+
+    def store(self, content=CONTENT):
+        spool_path, content_hash = spool_upload(SimpleUploadedFile('resume.txt', content))
+        return store_blob(self.blobs, spool_path, content_hash, '.txt', len(content)), content_hash
+
+    def age(self, content_hash, hours=48):
+        self.blobs.update_one({'_id': content_hash},
+                              {'$set': {'last_referenced': datetime.now() - timedelta(hours=hours)}})
+
+    def gc(self, *args):
+        call_command('gc_resume_blobs', *args, stdout=io.StringIO(), stderr=io.StringIO())
+
+    def test_same_content_is_stored_once_and_counted(self):
+        path, content_hash = self.store()
+        self.assertEqual(self.store(), (path, content_hash))
+        self.assertEqual(self.blobs.find_one({'_id': content_hash})['ref_count'], 2)
+        with default_storage.open(path) as stored:
+            self.assertEqual(stored.read(), CONTENT)
+
+        release_blob(self.blobs, content_hash)
+        release_blob(self.blobs, content_hash)
+        release_blob(self.blobs, content_hash)
+        self.assertEqual(self.blobs.find_one({'_id': content_hash})['ref_count'], 0)
+
+    def test_gc_removes_only_old_unreferenced_blobs(self):
+        kept_path, kept_hash = self.store(b'kept')
+        recent_path, recent_hash = self.store(b'recently released')
+        gone_path, gone_hash = self.store(b'gone')
+        self.age(kept_hash)
+        release_blob(self.blobs, recent_hash)
+        release_blob(self.blobs, gone_hash)
+        self.age(gone_hash)
+
+        self.gc()
+        self.assertIsNone(self.blobs.find_one({'_id': gone_hash}))
+        self.assertFalse(default_storage.exists(gone_path))
+        for path, content_hash in ((kept_path, kept_hash), (recent_path, recent_hash)):
+            self.assertIsNotNone(self.blobs.find_one({'_id': content_hash}))
+            self.assertTrue(default_storage.exists(path))
+
+        # Stored again after collection: a fresh document and file
+        path, content_hash = self.store(b'gone')
+        self.assertEqual(self.blobs.find_one({'_id': content_hash})['ref_count'], 1)
+        self.assertTrue(default_storage.exists(path))
+
+    def test_gc_keeps_a_blob_referenced_after_the_scan(self):
+        path, content_hash = self.store()
+        release_blob(self.blobs, content_hash)
+        self.age(content_hash)
+        delete_one = self.blobs.delete_one
+
+        def stored_again_first(*args, **kwargs):
+            self.store()
+            return delete_one(*args, **kwargs)
+
+        with mock.patch.object(type(self.blobs), 'delete_one', autospec=True,
+                               side_effect=lambda collection, *args, **kwargs: stored_again_first(*args, **kwargs)):
+            self.gc()
+        self.assertEqual(self.blobs.find_one({'_id': content_hash})['ref_count'], 1)
+        self.assertTrue(default_storage.exists(path))
+
+    def test_failed_file_releases_its_reference(self):
+        with mock.patch('resume_app.views.parse_resume_data', side_effect=RuntimeError('parser blew up')), \
+                self.assertLogs('resume_app.views', 'ERROR'):
+            outcomes = process_resume_batch([SimpleUploadedFile('resume.txt', CONTENT)], 'tester')
+        self.assertEqual(outcomes, [(False, False, None)])
+        blob, = self.blobs.find()
+        self.assertEqual(blob['ref_count'], 0)
@@ -0,0 +1,27 @@
+from datetime import datetime
+from bson import ObjectId
+from django.test import SimpleTestCase
+from resume_app.utils.candidate_query import InvalidQuery, decode_cursor, encode_cursor
+
+
+class CursorTests(SimpleTestCase):
+    def test_datetime_round_trip(self):
+        document = {'_id': ObjectId(), 'created_date': datetime(2024, 5, 17, 9, 30, 12, 345000)}
+        value, candidate_id = decode_cursor(encode_cursor(document, 'created_date'))
+        self.assertEqual(value, document['created_date'])
+        self.assertEqual(candidate_id, document['_id'])
+
+    def test_number_and_missing_values_round_trip(self):
+        document = {'_id': ObjectId(), 'ai_score': 87.5}
+        self.assertEqual(decode_cursor(encode_cursor(document, 'ai_score')), (87.5, document['_id']))
+        document = {'_id': ObjectId()}
+        self.assertEqual(decode_cursor(encode_cursor(document, 'ai_score')), (None, document['_id']))
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor({'_id': ObjectId(), 'ai_score': 1}, 'ai_score')
+        self.assertRegex(cursor, r'^[A-Za-z0-9_=-]+$')
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in ('', 'not-a-cursor', encode_cursor({'_id': 'abc', 'ai_score': 1}, 'ai_score')):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidQuery):
+                decode_cursor(cursor)
@@ -0,0 +1,74 @@
+import hashlib
+import io
+import shutil
+import tempfile
+from unittest import skipUnless
+from django.test import SimpleTestCase, override_settings
+from resume_app.utils.chunked_upload import (
+    IncompleteBatch, OffsetMismatch, UploadError, claim_batch, create_batch, open_spooled_files, write_chunk
+)
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+CONTENT = b'0123456789' * 5
+
+
+@skipUnless(mongomock, 'needs mongomock')
+class WriteChunkTests(SimpleTestCase):
+    def setUp(self):
+        spool = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool, ignore_errors=True)
+        settings_override = override_settings(RESUME_CHUNK_SPOOL_DIR=spool, RESUME_CHUNK_SIZE=20)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.collection = mongomock.MongoClient().db.upload_batches
+        self.batch = create_batch(self.collection, 'tester', [{'name': 'resume.txt', 'size': len(CONTENT)}])
+
+    def write(self, offset, data, batch=None, checksum=None):
+        return write_chunk(self.collection, batch or self.reload(), 0, offset, io.BytesIO(data), len(data), checksum)
+
+    def reload(self):
+        return self.collection.find_one({'_id': self.batch['_id']})
+
+    def test_chunks_assemble_the_file(self):
+        self.assertEqual(self.write(0, CONTENT[:20]), 20)
+        self.assertEqual(self.write(20, CONTENT[20:40]), 40)
+        self.assertEqual(self.write(40, CONTENT[40:]), 50)
+        batch = self.reload()
+        self.assertTrue(claim_batch(self.collection, batch))
+        self.assertFalse(claim_batch(self.collection, batch))
+        file, = open_spooled_files(batch)
+        with file:
+            self.assertEqual(file.read(), CONTENT)
+
+    def test_offset_mismatch_reports_the_received_offset(self):
+        self.write(0, CONTENT[:20])
+        with self.assertRaises(OffsetMismatch) as raised:
+            self.write(40, CONTENT[40:])
+        self.assertEqual(raised.exception.status, 409)
+        self.assertEqual(raised.exception.offset, 20)
+
+    def test_duplicate_chunk_does_not_advance_twice(self):
+        stale = self.reload()
+        self.write(0, CONTENT[:20], batch=stale)
+        # A retry of the same chunk, checked against the batch as it was before the first write
+        with self.assertRaises(OffsetMismatch) as raised:
+            self.write(0, CONTENT[:20], batch=stale)
+        self.assertEqual(raised.exception.offset, 20)
+        self.assertEqual(self.reload()['files'][0]['received'], 20)
+        self.assertEqual(len(self.reload()['files'][0]['chunks']), 1)
+
+    def test_checksum_mismatch_keeps_the_offset(self):
+        with self.assertRaises(UploadError):
+            self.write(0, CONTENT[:20], checksum=hashlib.sha256(b'other').hexdigest())
+        self.assertEqual(self.reload()['files'][0]['received'], 0)
+        self.assertEqual(self.write(0, CONTENT[:20], checksum=hashlib.sha256(CONTENT[:20]).hexdigest()), 20)
+
+    def test_oversized_chunk_and_incomplete_claim(self):
+        with self.assertRaises(UploadError):
+            self.write(0, CONTENT[:30])
+        with self.assertRaises(IncompleteBatch):
+            claim_batch(self.collection, self.reload())
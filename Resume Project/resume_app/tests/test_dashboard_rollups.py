@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
+from django.test import SimpleTestCase
+from resume_app.management.commands.load_test import _without_sort
+from resume_app.utils.pipeline_utils import funnel_metrics, move_candidate
+from resume_app.utils.rollup_utils import (
+    TOTALS_ID, dashboard_metrics, load_rollups, rebuild_rollups, record_candidate_created, record_upload
+)
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+
+def _without_zeros(document):
+    """Counters moved back to 0 are only left behind by increments"""
+    return {
+        key: _without_zeros(value) if isinstance(value, dict) else value
+        for key, value in document.items() if value != 0
+    }
+
+
+@skipUnless(mongomock, 'needs mongomock')
+class RollupTests(SimpleTestCase):
+    def setUp(self):
+        # pymongo 4.9+ passes bulk builders a `sort` argument that mongomock 4.3 does not take
+        builder = mongomock.collection.BulkOperationBuilder
+        for name in ('add_update', 'add_replace'):
+            patcher = mock.patch.object(builder, name, _without_sort(getattr(builder, name)))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('resume_app.utils.pipeline_utils.update_candidate_fields')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        db = mongomock.MongoClient().db
+        self.candidates, self.uploads, self.events = db.candidates, db.resume_uploads, db.stage_events
+        self.rollups = db.dashboard_rollups
+
+    def create(self, department, source, created_date):
+        candidate = {'department': department, 'source': source, 'status': 'new',
+                     'created_date': created_date, 'stage_entered_at': created_date}
+        self.candidates.insert_one(candidate)
+        record_candidate_created(self.rollups, candidate)
+        return candidate['_id']
+
+    def upload(self, department, status, upload_date, **fields):
+        upload = {'department': department, 'status': status, 'upload_date': upload_date,
+                  'processing_time': 1.5, 'is_duplicate': False, **fields}
+        self.uploads.insert_one(upload)
+        record_upload(self.rollups, upload)
+
+    def move(self, candidate_id, *stages):
+        for stage in stages:
+            move_candidate(self.candidates, self.events, self.rollups, candidate_id, stage, 'tester')
+
+    def populate(self):
+        now = datetime.now()
+        first = self.create('Engineering', 'linkedin', now - timedelta(days=40))
+        second = self.create('Engineering', 'referral', now - timedelta(days=3))
+        third = self.create('Sales', 'resume_upload', now)
+        self.upload('Engineering', 'completed', now - timedelta(days=40))
+        self.upload('Sales', 'completed', now, is_duplicate=True)
+        self.upload('Sales', 'failed', now)
+        # Back into interview after a second screening: one interviewed candidate, two interview entries
+        self.move(first, 'screening', 'interview', 'screening', 'interview', 'offer', 'hired')
+        self.move(second, 'screening', 'rejected')
+        self.move(third, 'screening', 'interview')
+
+    def documents(self):
+        return {doc.pop('_id'): _without_zeros(doc) for doc in self.rollups.find()}
+
+    maxDiff = None
+
+    def test_increments_match_a_rebuild(self):
+        self.populate()
+        incremental = self.documents()
+        rebuild_rollups(self.candidates, self.uploads, self.rollups, self.events)
+        rebuilt = self.documents()
+
+        self.assertEqual(sorted(incremental), sorted(rebuilt))
+        for rollup_id, document in incremental.items():
+            self.assertEqual(document, rebuilt[rollup_id], rollup_id)
+        self.assertIn('Engineering|linkedin|interview', ' '.join(rebuilt))
+
+    def test_funnel_counts_distinct_candidates(self):
+        self.populate()
+        totals = self.rollups.find_one({'_id': TOTALS_ID})
+        self.assertEqual(totals['entered']['interview'], 3)
+        self.assertEqual(totals['reached']['interview'], 2)
+
+        funnel = {stage['stage']: stage for stage in funnel_metrics(totals)}
+        self.assertEqual(funnel['interview']['entered'], 2)
+        self.assertEqual(funnel['interview']['conversion'], round(2 / 3 * 100, 1))
+        self.assertEqual(funnel['hired']['entered'], 1)
+        self.assertEqual(funnel['rejected']['entered'], 1)
+
+        metrics = dashboard_metrics(load_rollups(self.rollups))
+        self.assertEqual(metrics['pipeline'], {'applied': 3, 'interviewed': 2, 'hired': 1})
+        self.assertEqual(metrics['offer_acceptance_rate'], '100%')
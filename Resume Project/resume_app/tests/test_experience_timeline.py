@@ -0,0 +1,63 @@
+from django.test import SimpleTestCase
+from resume_app.utils.experience_timeline import experience_timeline, month_number, parse_date_range, parse_length
+
+
+class ParseDateRangeTests(SimpleTestCase):
+    def test_bare_years_cover_whole_years(self):
+        self.assertEqual(parse_date_range('2012-2014'), (month_number(2012, 1), month_number(2014, 12)))
+
+    def test_month_slash_year_to_current(self):
+        self.assertEqual(parse_date_range('03/2015 to Current'), (month_number(2015, 3), None))
+
+    def test_month_names(self):
+        self.assertEqual(parse_date_range('Jan 2015 - Jun 2017'), (month_number(2015, 1), month_number(2017, 6)))
+
+    def test_iso_months_with_en_dash(self):
+        self.assertEqual(parse_date_range('2015-03 – 2016-11'), (month_number(2015, 3), month_number(2016, 11)))
+
+    def test_rejects_reversed_or_invalid_ranges(self):
+        self.assertIsNone(parse_date_range('2014-2012'))
+        self.assertIsNone(parse_date_range('13/2015 - 2016'))
+        self.assertIsNone(parse_date_range('3 years'))
+        self.assertIsNone(parse_date_range(''))
+
+    def test_length(self):
+        self.assertEqual(parse_length('2 yrs 6 months'), 30)
+        self.assertIsNone(parse_length('since forever'))
+
+
+class ExperienceTimelineTests(SimpleTestCase):
+    def test_overlapping_positions_count_once(self):
+        timeline = experience_timeline([
+            {'title': 'Accountant', 'duration': '2012-2014'},
+            {'title': 'Senior Accountant', 'duration': '06/2014 to 12/2015'},
+        ], as_of=month_number(2020, 1))
+        # 2012-2014 is 36 months; the second position only adds 2015
+        self.assertEqual(timeline['experience_years'], 4.0)
+        self.assertEqual(timeline['title_years'], [
+            {'title': 'accountant', 'years': 3.0},
+            {'title': 'senior accountant', 'years': 1.6},
+        ])
+
+    def test_same_title_overlaps_merge(self):
+        timeline = experience_timeline([
+            {'title': 'Developer', 'duration': '2010 - 2012'},
+            {'title': 'developer ', 'duration': '2011 - 2013'},
+        ], as_of=month_number(2020, 1))
+        self.assertEqual(timeline['title_years'], [{'title': 'developer', 'years': 4.0}])
+
+    def test_current_position_runs_to_as_of(self):
+        timeline = experience_timeline([{'title': 'Dev', 'duration': '03/2015 to Current'}],
+                                       as_of=month_number(2016, 2))
+        entry = timeline['experience'][0]
+        self.assertTrue(entry['current'])
+        self.assertEqual(entry['end_month'], month_number(2016, 2))
+        self.assertEqual(timeline['experience_years'], 1.0)
+
+    def test_undated_lengths_are_added(self):
+        timeline = experience_timeline([
+            {'title': 'Clerk', 'duration': '2 years'},
+            {'title': 'Clerk', 'dates': '2018 - 2018'},
+        ], as_of=month_number(2020, 1))
+        self.assertEqual(timeline['experience_years'], 3.0)
+        self.assertNotIn('start_month', timeline['experience'][0])
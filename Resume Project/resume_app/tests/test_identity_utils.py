@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase, override_settings
+from resume_app.utils.identity_utils import identity_keys, normalize_email, normalize_name, normalize_phone
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_email(self):
+        self.assertEqual(normalize_email('  John.Doe@Example.COM '), 'john.doe@example.com')
+        self.assertEqual(normalize_email('not an email'), '')
+        self.assertEqual(normalize_email(None), '')
+
+    def test_national_phone_gets_default_country_code(self):
+        self.assertEqual(normalize_phone('(555) 123-4567'), '+15551234567')
+        with override_settings(CANDIDATE_DEFAULT_COUNTRY_CODE='44'):
+            self.assertEqual(normalize_phone('20 7946 0958'), '+442079460958')
+
+    def test_international_prefixes(self):
+        self.assertEqual(normalize_phone('+44 20 7946 0958'), '+442079460958')
+        self.assertEqual(normalize_phone('0044 20 7946 0958'), '+442079460958')
+
+    def test_implausible_phones(self):
+        self.assertEqual(normalize_phone('12345'), '')
+        self.assertEqual(normalize_phone('+1234567890123456'), '')
+        self.assertEqual(normalize_phone(None), '')
+
+    def test_name(self):
+        self.assertEqual(normalize_name('José', 'Núñez-García'), 'jose nunez garcia')
+        self.assertEqual(normalize_name('Madonna', ''), '')
+
+    def test_identity_keys(self):
+        keys = identity_keys({'email': 'A@B.com', 'phone': '555-123-4567', 'first_name': 'Ann', 'last_name': 'Lee'})
+        self.assertEqual(keys, ['email:a@b.com', 'phone:+15551234567', 'name:ann lee'])
+        self.assertEqual(identity_keys({}), [])
@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase
+from resume_app.utils.near_duplicates import (
+    LSH_BANDS, NUM_PERM, decode_signature, encode_signature, estimate_similarity, lsh_buckets,
+    minhash_signature, signature_fields
+)
+
+RESUME = {
+    'first_name': 'Ann', 'last_name': 'Lee', 'email': 'ann@example.com',
+    'summary': 'Senior accountant with ten years of experience in audit, tax planning and month-end close.',
+    'experience': [
+        {'title': 'Senior Accountant', 'company': 'Acme Corp', 'duration': '2015 - Current',
+         'description': 'Led the month-end close, prepared consolidated statements and managed two junior staff.'},
+        {'title': 'Accountant', 'company': 'Globex', 'duration': '2010 - 2015',
+         'description': 'Reconciled ledgers, handled accounts payable and supported the annual external audit.'},
+    ],
+    'skills': ['Excel', 'SAP', 'GAAP', 'Tax Planning'],
+}
+
+
+def _signature(data):
+    return decode_signature(signature_fields(data)['minhash'])
+
+
+class NearDuplicateTests(SimpleTestCase):
+    def test_signature_round_trip(self):
+        signature = minhash_signature('python developer with django experience')
+        self.assertEqual(len(signature), NUM_PERM)
+        self.assertTrue((decode_signature(encode_signature(signature)) == signature).all())
+
+    def test_identical_resumes(self):
+        self.assertEqual(estimate_similarity(_signature(RESUME), _signature(dict(RESUME))), 1.0)
+
+    def test_small_edit_stays_similar_and_shares_buckets(self):
+        edited = dict(RESUME, phone='555-123-4567', skills=RESUME['skills'] + ['QuickBooks'])
+        original, other = _signature(RESUME), _signature(edited)
+        self.assertGreaterEqual(estimate_similarity(original, other), 0.7)
+        self.assertTrue(set(lsh_buckets(original)) & set(lsh_buckets(other)))
+
+    def test_unrelated_resumes(self):
+        other = {
+            'first_name': 'Bo', 'last_name': 'Chen',
+            'summary': 'Registered nurse caring for patients in a busy emergency department.',
+            'experience': [{'title': 'Nurse', 'company': 'City Hospital', 'duration': '2018 - 2022',
+                            'description': 'Triaged patients, administered medication and trained new nurses.'}],
+            'skills': ['Patient Care', 'BLS'],
+        }
+        self.assertLess(estimate_similarity(_signature(RESUME), _signature(other)), 0.2)
+
+    def test_buckets(self):
+        buckets = lsh_buckets(_signature(RESUME))
+        self.assertEqual(len(buckets), LSH_BANDS)
+        self.assertTrue(all(-2 ** 63 <= bucket < 2 ** 63 for bucket in buckets))
+
+    def test_no_text_no_signature(self):
+        self.assertIsNone(minhash_signature(''))
+        self.assertEqual(signature_fields({}), {})
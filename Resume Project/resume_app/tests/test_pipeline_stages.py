@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
+from django.test import SimpleTestCase
+from resume_app.management.commands.load_test import _without_sort
+from resume_app.utils.pipeline_utils import PipelineError, move_candidate, stage_candidates
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+
+@skipUnless(mongomock, 'needs mongomock')
+class MoveCandidateTests(SimpleTestCase):
+    def setUp(self):
+        # pymongo 4.9+ passes bulk builders a `sort` argument that mongomock 4.3 does not take
+        builder = mongomock.collection.BulkOperationBuilder
+        for name in ('add_update', 'add_replace'):
+            patcher = mock.patch.object(builder, name, _without_sort(getattr(builder, name)))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('resume_app.utils.pipeline_utils.update_candidate_fields')
+        self.update_index = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        db = mongomock.MongoClient().db
+        self.candidates, self.events, self.rollups = db.candidates, db.stage_events, db.dashboard_rollups
+        created = datetime.now() - timedelta(days=10)
+        self.candidate_id = self.candidates.insert_one({
+            'first_name': 'Jane', 'status': 'new', 'department': 'Engineering', 'source': 'referral',
+            'created_date': created, 'stage_entered_at': created,
+        }).inserted_id
+
+    def move(self, stage, **kwargs):
+        return move_candidate(self.candidates, self.events, self.rollups, self.candidate_id, stage, 'tester', **kwargs)
+
+    def test_move_updates_candidate_and_appends_event(self):
+        event = self.move('interview', details={'interviewer': 'Sam', 'salary': 1, 'location': ''}, note='Phone screen')
+        candidate = self.candidates.find_one({'_id': self.candidate_id})
+        self.assertEqual(candidate['status'], 'interview')
+        # Only the stage's own detail fields, and no blanks
+        self.assertEqual(candidate['stage_details'], {'interviewer': 'Sam'})
+        self.assertEqual(candidate['updated_by'], 'tester')
+
+        self.assertEqual(event['from_stage'], 'new')
+        self.assertEqual(event['to_stage'], 'interview')
+        self.assertEqual(event['note'], 'Phone screen')
+        self.assertEqual((event['department'], event['source']), ('Engineering', 'referral'))
+        self.assertAlmostEqual(event['time_in_stage_days'], 10, places=2)
+        self.assertNotIn('days_to_hire', event)
+        self.assertEqual(self.events.count_documents({'candidate_id': self.candidate_id}), 1)
+        self.update_index.assert_called_once_with(self.candidate_id, status='interview')
+
+    def test_time_in_stage_counts_from_the_previous_move(self):
+        self.move('screening')
+        event = self.move('hired')
+        self.assertEqual(event['from_stage'], 'screening')
+        self.assertLess(event['time_in_stage_days'], 0.01)
+        self.assertAlmostEqual(event['days_to_hire'], 10, places=2)
+
+    def test_invalid_moves(self):
+        with self.assertRaisesMessage(PipelineError, 'Unknown stage'):
+            self.move('archived')
+        with self.assertRaisesMessage(PipelineError, 'already in stage'):
+            self.move('new')
+        with self.assertRaisesMessage(PipelineError, 'not found'):
+            move_candidate(self.candidates, self.events, self.rollups, 'missing', 'screening', 'tester')
+        self.assertEqual(self.events.count_documents({}), 0)
+
+    def test_stage_candidates_most_recent_first(self):
+        other_id = self.candidates.insert_one({'first_name': 'Sam', 'status': 'new'}).inserted_id
+        self.move('interview')
+        self.candidates.update_one({'_id': self.candidate_id},
+                                   {'$set': {'stage_entered_at': datetime.now() - timedelta(hours=1)}})
+        move_candidate(self.candidates, self.events, self.rollups, other_id, 'interview', 'tester')
+        self.assertEqual([candidate['_id'] for candidate in stage_candidates(self.candidates, ['interview'])],
+                         [other_id, self.candidate_id])
+        self.assertEqual(stage_candidates(self.candidates, ['offer']), [])
@@ -0,0 +1,107 @@
+import shutil
+import sqlite3
+import tempfile
+from unittest import mock, skipUnless
+from bson import ObjectId
+from django.test import SimpleTestCase, override_settings
+from resume_app.utils.search_index import (
+    create_schema, index_candidates, search_candidates, update_candidates_field
+)
+from resume_app.views import MongoDBConnection, _search_candidates
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+
+def _candidate(number, skills, **fields):
+    return {'_id': ObjectId(), 'first_name': f'Candidate{number}', 'last_name': 'Smith', 'skills': skills,
+            'status': 'new', 'department': 'Engineering', 'ai_score': 50, **fields}
+
+
+class SearchScopeTests(SimpleTestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(':memory:')
+        self.addCleanup(self.connection.close)
+        create_schema(self.connection)
+        # Indexed oldest first, so rowids follow age like an upload-ordered index
+        self.oldest = _candidate(0, ['Python', 'Fortran'])
+        self.others = [_candidate(number, ['Python']) for number in range(1, 10)]
+        index_candidates([self.oldest, *self.others], self.connection)
+
+    def search(self, query, **options):
+        results, truncated = search_candidates(query, connection=self.connection, **options)
+        return [result['candidate_id'] for result in results], truncated
+
+    def test_scope_limits_results(self):
+        scope = [self.others[0]['_id'], self.others[1]['_id']]
+        found, truncated = self.search('python', candidate_ids=iter(scope))
+        self.assertCountEqual(found, [str(candidate_id) for candidate_id in scope])
+        self.assertFalse(truncated)
+
+    def test_empty_scope_matches_nothing(self):
+        self.assertEqual(self.search('python', candidate_ids=[]), ([], False))
+
+    @override_settings(SEARCH_MAX_RANKED=3)
+    def test_broad_query_is_truncated_but_filtered_match_is_not(self):
+        found, truncated = self.search('python')
+        self.assertEqual(len(found), 3)
+        self.assertTrue(truncated)
+        self.assertNotIn(str(self.oldest['_id']), found)
+
+        # The ranking window is taken after the filters, so an old selective match is still found
+        found, truncated = self.search('python', candidate_ids=[self.oldest['_id'], self.others[-1]['_id']])
+        self.assertIn(str(self.oldest['_id']), found)
+        self.assertFalse(truncated)
+
+    def test_index_columns_filter(self):
+        index_candidates([{**self.others[0], 'status': 'interview'}], self.connection)
+        found, _ = self.search('python', status='interview')
+        self.assertEqual(found, [str(self.others[0]['_id'])])
+
+
+@skipUnless(mongomock, 'needs mongomock')
+class MongoFilteredSearchTests(SimpleTestCase):
+    def setUp(self):
+        index_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, index_dir, ignore_errors=True)
+        settings_override = override_settings(SEARCH_INDEX_PATH=f'{index_dir}/search_index.sqlite3')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        MongoDBConnection.reset_client(mongomock.MongoClient())
+        self.addCleanup(MongoDBConnection.reset_client)
+        self.collection = MongoDBConnection().get_collection('candidates')
+
+    def test_mongo_filter_scopes_the_search(self):
+        hot = _candidate(0, ['Python'], tags=['hot'])
+        cold = _candidate(1, ['Python'], tags=['cold'])
+        self.collection.insert_many([hot, cold])
+        index_candidates([hot, cold])
+
+        results, truncated = _search_candidates('python', {'tags': 'hot'})
+        self.assertEqual([result['candidate_id'] for result in results], [str(hot['_id'])])
+        self.assertFalse(truncated)
+        results, _ = _search_candidates('python', {})
+        self.assertEqual(len(results), 2)
+        self.assertEqual(_search_candidates('python', {'tags': 'none'}), ([], False))
+
+
+class UpdateCandidatesFieldTests(SimpleTestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(':memory:')
+        self.addCleanup(self.connection.close)
+        create_schema(self.connection)
+        self.candidates = [_candidate(number, ['Python']) for number in range(4)]
+        index_candidates(self.candidates, self.connection)
+
+    def test_scores_are_written_for_every_pair(self):
+        with mock.patch('resume_app.utils.search_index.get_connection', return_value=self.connection):
+            update_candidates_field('ai_score', [(candidate['_id'], 90) for candidate in self.candidates[:2]])
+        results, _ = search_candidates('python', min_score=80, connection=self.connection)
+        self.assertCountEqual([result['candidate_id'] for result in results],
+                              [str(candidate['_id']) for candidate in self.candidates[:2]])
+
+    def test_only_filter_columns(self):
+        with self.assertRaises(ValueError):
+            update_candidates_field('name', [])
@@ -0,0 +1,68 @@
+from unittest import skipUnless
+from django.test import SimpleTestCase
+from resume_app.utils.skill_taxonomy import FIRST_INTERNED_ID, SkillTaxonomy, skill_key, skill_keys
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+
+class SkillKeyTests(SimpleTestCase):
+    def test_case_spacing_and_punctuation(self):
+        self.assertEqual(skill_key('  Machine_Learning, '), 'machine learning')
+        self.assertEqual(skill_key('Node.js'), 'node.js')
+        self.assertEqual(skill_key(' - '), '')
+
+    def test_suffix_and_version_variants(self):
+        self.assertEqual(skill_keys('Python programming'), ('python programming', 'python'))
+        self.assertEqual(skill_keys('Rust programming language'), ('rust programming language', 'rust'))
+        self.assertEqual(skill_keys('Java 8'), ('java 8', 'java'))
+        self.assertEqual(skill_keys('Terraform v1.5'), ('terraform v1.5', 'terraform'))
+        self.assertEqual(skill_keys('Python 3 programming'), ('python 3 programming', 'python 3', 'python'))
+
+    def test_digits_that_are_part_of_the_name_stay(self):
+        self.assertEqual(skill_keys('IPv6'), ('ipv6',))
+        self.assertEqual(skill_keys('AWS S3'), ('aws s3',))
+        self.assertEqual(skill_keys(''), ())
+
+
+@skipUnless(mongomock, 'needs mongomock')
+class SkillTaxonomyTests(SimpleTestCase):
+    def setUp(self):
+        self.db = mongomock.MongoClient().db
+        self.db.skill_taxonomy.create_index('aliases', unique=True)
+        self.taxonomy = self.fresh()
+
+    def fresh(self):
+        taxonomy = SkillTaxonomy(self.db.skill_taxonomy)
+        taxonomy.load()
+        return taxonomy
+
+    def test_spellings_share_the_built_in_id(self):
+        python = self.taxonomy.skill_id('Python')
+        self.assertLess(python, FIRST_INTERNED_ID)
+        for spelling in ('python3', 'PYTHON 3', 'Python programming', 'py'):
+            self.assertEqual(self.taxonomy.skill_id(spelling), python, spelling)
+        self.assertEqual(self.taxonomy.names([python]), {python: 'Python'})
+
+    def test_unknown_skills_are_interned_under_their_general_key(self):
+        rust = self.taxonomy.skill_id('Rust programming')
+        self.assertGreater(rust, FIRST_INTERNED_ID)
+        self.assertEqual(self.taxonomy.skill_id('rust'), rust)
+        self.assertEqual(self.taxonomy.names([rust]), {rust: 'Rust programming'})
+        # Another process finds it in Mongo instead of interning it again
+        self.assertEqual(self.fresh().skill_id('Rust'), rust)
+
+    def test_lookup_without_create(self):
+        self.assertIsNone(self.taxonomy.skill_id('Haskell', create=False))
+        self.assertEqual(self.db.skill_taxonomy.count_documents({'name': 'Haskell'}), 0)
+        self.assertEqual(
+            self.taxonomy.skill_ids(['Go', 'golang', 'Haskell', ''], create=False),
+            [self.taxonomy.skill_id('Go')]
+        )
+
+    def test_load_is_repeatable(self):
+        count = self.db.skill_taxonomy.count_documents({})
+        self.fresh()
+        self.assertEqual(self.db.skill_taxonomy.count_documents({}), count)
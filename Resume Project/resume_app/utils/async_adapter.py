@@ -0,0 +1,87 @@
+"""
+AsyncMongoClient look-alike over a synchronous client.
+
+An AsyncMongoClient belongs to the event loop it was created on. Outside an
+ASGI server each async view runs in a loop of its own, so a native client
+would pay DNS, TLS and server discovery on every request. Those requests get
+this adapter over the process's shared MongoClient instead: every call runs
+on a worker thread through sync_to_async and reuses its connection pool.
+load_test runs it inline over mongomock, whose calls never block.
+
+Only the surface the async views use is covered: find (with sort/limit),
+aggregate, to_list, async iteration and the awaitable collection methods.
+"""
+from asgiref.sync import sync_to_async
+
+
+class AsyncCursorAdapter:
+    def __init__(self, cursor, threaded):
+        self.cursor = cursor
+        self.threaded = threaded
+
+    def sort(self, *args, **kwargs):
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, limit):
+        self.cursor = self.cursor.limit(limit)
+        return self
+
+    async def to_list(self, length=None):
+        if length is not None:
+            self.cursor = self.cursor.limit(length)
+        return await _call(list, self.threaded, self.cursor)
+
+    async def __aiter__(self):
+        # Cursors in the async views are bounded, so one round trip fetches them whole
+        for document in await self.to_list():
+            yield document
+
+
+class AsyncCollectionAdapter:
+    def __init__(self, collection, threaded):
+        self.collection = collection
+        self.threaded = threaded
+
+    def find(self, *args, **kwargs):
+        # Building a cursor sends nothing; the query runs on to_list or iteration
+        return AsyncCursorAdapter(self.collection.find(*args, **kwargs), self.threaded)
+
+    async def aggregate(self, *args, **kwargs):
+        return AsyncCursorAdapter(await _call(self.collection.aggregate, self.threaded, *args, **kwargs), self.threaded)
+
+    def __getattr__(self, name):
+        method = getattr(self.collection, name)
+
+        async def call(*args, **kwargs):
+            return await _call(method, self.threaded, *args, **kwargs)
+        return call
+
+
+class AsyncDatabaseAdapter:
+    def __init__(self, database, threaded):
+        self.database = database
+        self.threaded = threaded
+
+    def __getitem__(self, collection_name):
+        return AsyncCollectionAdapter(self.database[collection_name], self.threaded)
+
+
+class AsyncClientAdapter:
+    def __init__(self, client, threaded=True):
+        self.client = client
+        self.threaded = threaded
+
+    def __getitem__(self, database_name):
+        return AsyncDatabaseAdapter(self.client[database_name], self.threaded)
+
+    async def close(self):
+        # The sync client is shared by the whole process and outlives this adapter
+        pass
+
+
+async def _call(function, threaded, *args, **kwargs):
+    if not threaded:
+        return function(*args, **kwargs)
+    # Not thread-sensitive: calls gathered by a view run side by side on the executor
+    return await sync_to_async(function, thread_sensitive=False)(*args, **kwargs)
@@ -0,0 +1,118 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from pymongo import ReturnDocument
+from .upload_utils import HashingFile
+
+# Root of the content-addressed resume store inside default_storage
+BLOB_PREFIX = getattr(settings, 'RESUME_BLOB_PREFIX', 'resumes/blobs')
+
+# Mongo collection holding one document per blob, keyed by its SHA-256
+BLOB_COLLECTION = 'resume_blobs'
+
+
+class SpooledFile(File):
+    """Local spool file that FileSystemStorage can move into place instead of copying"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def blob_path(content_hash, file_extension=''):
+    """Fan-out storage path for a blob, e.g. resumes/blobs/ab/cd/abcd...ef.pdf"""
+    return f'{BLOB_PREFIX}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{file_extension}'
+
+
+def spool_upload(uploaded_file):
+    """
+    Copy an uploaded file to a local spool in chunks, hashing it in the same pass.
+    Returns (spool_path, content_hash); the caller hands the spool to store_blob.
+    """
+    hashed_file = HashingFile(uploaded_file)
+    fd, spool_path = tempfile.mkstemp(
+        prefix='resume-', dir=getattr(settings, 'FILE_UPLOAD_TEMP_DIR', None)
+    )
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            for chunk in hashed_file.chunks():
+                spool.write(chunk)
+    except Exception:
+        os.remove(spool_path)
+        raise
+    return spool_path, hashed_file.hexdigest()
+
+
+def store_blob(collection, spool_path, content_hash, file_extension, file_size):
+    """
+    Add a reference to the blob for content_hash and write the spool to storage
+    only if the blob is not stored yet. The spool is always consumed.
+    Returns the storage path of the blob.
+    """
+    now = datetime.now()
+    try:
+        blob = collection.find_one_and_update(
+            {'_id': content_hash},
+            {
+                '$inc': {'ref_count': 1},
+                '$set': {'last_referenced': now},
+                '$setOnInsert': {
+                    'path': blob_path(content_hash, file_extension),
+                    'file_size': file_size,
+                    'file_type': file_extension,
+                    'created_date': now
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        path = blob['path']
+
+        if not default_storage.exists(path):
+            with open(spool_path, 'rb') as spool:
+                saved_path = default_storage.save(path, SpooledFile(spool, name=path))
+            if saved_path != path:
+                # A concurrent request stored the same content first
+                default_storage.delete(saved_path)
+    finally:
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
+
+    return path
+
+
+@contextmanager
+def local_blob_path(path):
+    """
+    Local filesystem path of a stored blob, for readers that open it themselves.
+    Blobs in a storage without local paths are copied to a temporary file in chunks.
+    """
+    try:
+        local_path = default_storage.path(path)
+    except NotImplementedError:
+        local_path = None
+    if local_path is not None:
+        yield local_path
+        return
+
+    fd, local_path = tempfile.mkstemp(
+        prefix='resume-', suffix=os.path.splitext(path)[1], dir=getattr(settings, 'FILE_UPLOAD_TEMP_DIR', None)
+    )
+    try:
+        with os.fdopen(fd, 'wb') as local_file, default_storage.open(path, 'rb') as stored:
+            for chunk in stored.chunks():
+                local_file.write(chunk)
+        yield local_path
+    finally:
+        os.remove(local_path)
+
+
+def release_blob(collection, content_hash):
+    """Drop one reference to a blob; unreferenced blobs are removed by gc_resume_blobs"""
+    collection.update_one(
+        {'_id': content_hash, 'ref_count': {'$gt': 0}},
+        {'$inc': {'ref_count': -1}}
+    )
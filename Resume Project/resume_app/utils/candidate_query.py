@@ -0,0 +1,193 @@
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from .experience_timeline import title_key
+
+# Sort options for candidate listings: sort key -> field; ties are broken by _id
+CANDIDATE_SORTS = {
+    'recent': 'created_date',
+    'score': 'ai_score',
+}
+
+# Fields a listing may return; full experience/education arrays are never listed
+CANDIDATE_LIST_FIELDS = [
+    'first_name', 'last_name', 'email', 'phone', 'location', 'job_title_applied',
+    'department', 'tags', 'skills', 'status', 'ai_score', 'quality_score',
+    'created_date', 'last_updated', 'likely_duplicates', 'experience_years',
+]
+
+# Skills are trimmed in listings so large profiles stay cheap to page through
+LIST_SKILLS_LIMIT = 8
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+DEFAULT_FACET_SIZE = 20
+MAX_FACET_SIZE = 100
+
+
+class InvalidQuery(ValueError):
+    """Raised for malformed listing parameters or cursors"""
+
+
+def encode_cursor(document, sort_field):
+    value = document.get(sort_field)
+    if isinstance(value, datetime):
+        value = {'$date': value.isoformat()}
+    payload = json.dumps({'v': value, 'id': str(document['_id'])})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = payload['v']
+        if isinstance(value, dict) and '$date' in value:
+            value = datetime.fromisoformat(value['$date'])
+        return value, ObjectId(payload['id'])
+    except Exception:
+        raise InvalidQuery('Invalid cursor')
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def build_candidate_filter(params):
+    """Mongo filter for the status, department, tags, skill ID, experience and score-range parameters"""
+    query = {}
+    statuses = _split(params.get('status', ''))
+    if statuses:
+        query['status'] = statuses[0] if len(statuses) == 1 else {'$in': statuses}
+    if params.get('department'):
+        query['department'] = params['department'].strip()
+    tags = _split(params.get('tags', ''))
+    if tags:
+        query['tags'] = {'$all': tags}
+    try:
+        skill_ids = [int(skill_id) for skill_id in _split(params.get('skill_ids', ''))]
+    except ValueError:
+        raise InvalidQuery('skill_ids must be integers')
+    if skill_ids:
+        query['skill_ids'] = {'$all': skill_ids}
+
+    score_range = {}
+    try:
+        if params.get('min_score'):
+            score_range['$gte'] = float(params['min_score'])
+        if params.get('max_score'):
+            score_range['$lte'] = float(params['max_score'])
+    except ValueError:
+        raise InvalidQuery('Score range must be numeric')
+    if score_range:
+        query['ai_score'] = score_range
+
+    years_range = {}
+    try:
+        if params.get('min_years'):
+            years_range['$gte'] = float(params['min_years'])
+        if params.get('max_years'):
+            years_range['$lte'] = float(params['max_years'])
+        min_title_years = float(params['min_title_years']) if params.get('min_title_years') else None
+    except ValueError:
+        raise InvalidQuery('Years of experience must be numeric')
+    if years_range:
+        query['experience_years'] = years_range
+
+    title = title_key(params.get('experience_title', ''))
+    if title:
+        # Both conditions on one title_years entry, answered from the (title, years) index
+        match = {'title': title}
+        if min_title_years is not None:
+            match['years'] = {'$gte': min_title_years}
+        query['title_years'] = {'$elemMatch': match}
+    elif min_title_years is not None:
+        raise InvalidQuery('min_title_years needs an experience_title')
+    return query
+
+
+def build_projection(params):
+    requested = _split(params.get('fields', ''))
+    fields = [field for field in requested if field in CANDIDATE_LIST_FIELDS] or CANDIDATE_LIST_FIELDS
+    projection = {field: 1 for field in fields}
+    if 'skills' in projection:
+        projection['skills'] = {'$slice': LIST_SKILLS_LIMIT}
+    return projection
+
+
+def _page_query(params):
+    """(query, projection, sort, limit, sort_field) for one page of a candidate listing"""
+    sort_field = CANDIDATE_SORTS.get(params.get('sort', 'recent'))
+    if sort_field is None:
+        raise InvalidQuery('Unknown sort')
+    try:
+        limit = min(max(int(params.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise InvalidQuery('limit must be an integer')
+
+    query = build_candidate_filter(params)
+    if params.get('cursor'):
+        last_value, last_id = decode_cursor(params['cursor'])
+        seek = {'$or': [
+            {sort_field: {'$lt': last_value}},
+            {sort_field: last_value, '_id': {'$lt': last_id}},
+        ]}
+        query = {'$and': [query, seek]} if query else seek
+
+    projection = build_projection(params)
+    projection[sort_field] = projection.get(sort_field, 1)
+    return query, projection, [(sort_field, -1), ('_id', -1)], limit, sort_field
+
+
+def _page_result(documents, limit, sort_field):
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor(documents[-1], sort_field)
+    return documents, next_cursor
+
+
+def fetch_candidate_page(collection, params):
+    """
+    One page of candidates using keyset pagination on (sort field, _id), both descending.
+    Returns (documents, next_cursor); next_cursor is None on the last page.
+    """
+    query, projection, sort, limit, sort_field = _page_query(params)
+    documents = list(collection.find(query, projection).sort(sort).limit(limit + 1))
+    return _page_result(documents, limit, sort_field)
+
+
+async def afetch_candidate_page(collection, params):
+    """fetch_candidate_page on an async collection"""
+    query, projection, sort, limit, sort_field = _page_query(params)
+    documents = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list()
+    return _page_result(documents, limit, sort_field)
+
+
+def skill_facet_pipeline(params):
+    """Aggregation counting filtered candidates per skill ID, most common first"""
+    try:
+        limit = min(max(int(params.get('limit', DEFAULT_FACET_SIZE)), 1), MAX_FACET_SIZE)
+    except ValueError:
+        raise InvalidQuery('limit must be an integer')
+    return [
+        {'$match': build_candidate_filter(params)},
+        {'$unwind': '$skill_ids'},
+        {'$group': {'_id': '$skill_ids', 'count': {'$sum': 1}}},
+        {'$sort': {'count': -1, '_id': 1}},
+        {'$limit': limit},
+    ]
+
+
+def serialize_document(document):
+    """Make a Mongo document JSON-safe (ObjectId and datetime values become strings)"""
+    if isinstance(document, dict):
+        return {key: serialize_document(value) for key, value in document.items()}
+    if isinstance(document, list):
+        return [serialize_document(value) for value in document]
+    if isinstance(document, ObjectId):
+        return str(document)
+    if isinstance(document, datetime):
+        return document.isoformat()
+    return document
@@ -0,0 +1,219 @@
+"""
+Chunked, resumable resume uploads.
+
+A batch is opened with the list of files (init), each file is sent as a run
+of chunks (PUT at an offset) and the batch is processed once every file is
+whole (complete). Chunks are written straight into a per-file spool on local
+disk, hashed as they stream in, so memory stays at one read buffer however
+large the batch. The received offset of every file lives in Mongo, and a
+chunk only advances it when it starts exactly there: a client that lost its
+connection asks for the batch status and resumes from the stored offsets.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from django.conf import settings
+from django.core.files import File
+
+UPLOAD_BATCH_COLLECTION = 'upload_batches'
+
+# Formats the parser can read text from; legacy binary .doc is not one of them
+ALLOWED_EXTENSIONS = ['.pdf', '.docx', '.txt']
+MAX_FILE_SIZE = 5 * 1024 * 1024
+
+# Size of each read from the request stream while a chunk is written to the spool
+READ_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """A request that does not fit the batch; the message is safe to show"""
+    status = 400
+
+
+class OffsetMismatch(UploadError):
+    """A chunk that does not start at the file's received offset"""
+    status = 409
+
+    def __init__(self, message, offset):
+        super().__init__(message)
+        self.offset = offset
+
+
+class IncompleteBatch(UploadError):
+    status = 409
+
+
+def chunk_size():
+    return getattr(settings, 'RESUME_CHUNK_SIZE', 1024 * 1024)
+
+
+def batch_ttl():
+    """Seconds an unfinished batch and its spool are kept after its last chunk"""
+    return getattr(settings, 'RESUME_UPLOAD_BATCH_TTL', 24 * 3600)
+
+
+def spool_root():
+    return getattr(settings, 'RESUME_CHUNK_SPOOL_DIR', None) or os.path.join(tempfile.gettempdir(), 'resume-chunks')
+
+
+def spool_path(batch_id, index):
+    return os.path.join(spool_root(), str(batch_id), f'{index}.part')
+
+
+def create_batch(collection, username, files, job_title='', department='', tags=''):
+    """Open a batch for [{'name', 'size'}, ...]; returns the batch document"""
+    max_files = getattr(settings, 'RESUME_UPLOAD_MAX_BATCH', 500)
+    if not files:
+        raise UploadError('At least one file is required')
+    if len(files) > max_files:
+        raise UploadError(f'At most {max_files} files per batch')
+
+    entries = []
+    for file in files:
+        name = os.path.basename(str(file.get('name', '')))
+        try:
+            size = int(file.get('size'))
+        except (TypeError, ValueError):
+            raise UploadError(f'File {name or "?"} has no valid size')
+        file_type = os.path.splitext(name)[1].lower()
+        if file_type not in ALLOWED_EXTENSIONS:
+            raise UploadError(f'File {name} has unsupported format')
+        if not 0 < size <= MAX_FILE_SIZE:
+            raise UploadError(f'File {name} must be between 1 byte and 5MB')
+        entries.append({'name': name, 'size': size, 'file_type': file_type, 'received': 0, 'chunks': []})
+
+    now = datetime.now()
+    batch = {
+        'uploaded_by': username,
+        'job_title': job_title,
+        'department': department,
+        'tags': tags,
+        'files': entries,
+        'chunk_size': chunk_size(),
+        'status': 'open',
+        'created_date': now,
+        'last_activity': now,
+    }
+    batch['_id'] = collection.insert_one(batch).inserted_id
+    os.makedirs(os.path.join(spool_root(), str(batch['_id'])), exist_ok=True)
+    purge_stale_spools()
+    return batch
+
+
+def batch_status(batch):
+    """What a client needs to resume: the chunk size and each file's received offset"""
+    return {
+        'batch_id': str(batch['_id']),
+        'status': batch['status'],
+        'chunk_size': batch['chunk_size'],
+        'files': [
+            {'index': index, 'name': file['name'], 'size': file['size'], 'offset': file['received']}
+            for index, file in enumerate(batch['files'])
+        ],
+    }
+
+
+def write_chunk(collection, batch, index, offset, stream, length, checksum=None):
+    """
+    Stream one chunk of file `index` from `stream` into its spool at `offset`.
+    `checksum`, when given, is the client's SHA-256 of the chunk and must match.
+    Returns the file's new received offset.
+    """
+    if batch['status'] != 'open':
+        raise UploadError('Batch is no longer accepting chunks')
+    if not 0 <= index < len(batch['files']):
+        raise UploadError('Unknown file index')
+    file = batch['files'][index]
+    if offset != file['received']:
+        raise OffsetMismatch(f'Expected offset {file["received"]}', file['received'])
+    if not 0 < length <= batch['chunk_size'] or offset + length > file['size']:
+        raise UploadError('Chunk size does not fit the file')
+
+    digest = hashlib.sha256()
+    fd = os.open(spool_path(batch['_id'], index), os.O_WRONLY | os.O_CREAT, 0o600)
+    try:
+        position, remaining = offset, length
+        while remaining:
+            data = stream.read(min(READ_SIZE, remaining))
+            if not data:
+                raise UploadError('Chunk body is shorter than its Content-Length')
+            digest.update(data)
+            os.pwrite(fd, data, position)
+            position += len(data)
+            remaining -= len(data)
+    finally:
+        os.close(fd)
+
+    sha256 = digest.hexdigest()
+    if checksum and checksum.lower() != sha256:
+        # The spool past `offset` is garbage now, but the offset was not advanced,
+        # so the retried chunk overwrites it
+        raise UploadError('Chunk checksum mismatch')
+
+    # Only advance from the offset this chunk started at, so a duplicate of a
+    # chunk that was already applied cannot move the offset twice
+    result = collection.update_one(
+        {'_id': batch['_id'], 'status': 'open', f'files.{index}.received': offset},
+        {
+            '$set': {f'files.{index}.received': offset + length, 'last_activity': datetime.now()},
+            '$push': {f'files.{index}.chunks': {'offset': offset, 'size': length, 'sha256': sha256}},
+        }
+    )
+    if result.modified_count == 0:
+        current = collection.find_one({'_id': batch['_id']}, {'files.received': 1})
+        received = current['files'][index]['received'] if current else offset
+        raise OffsetMismatch(f'Expected offset {received}', received)
+    return offset + length
+
+
+def claim_batch(collection, batch):
+    """
+    Mark a fully received batch as processing; returns False if another
+    complete request got there first
+    """
+    incomplete = [file['name'] for file in batch['files'] if file['received'] != file['size']]
+    if incomplete:
+        raise IncompleteBatch(f'{len(incomplete)} file(s) are not fully uploaded')
+    result = collection.update_one(
+        {'_id': batch['_id'], 'status': 'open'},
+        {'$set': {'status': 'processing', 'last_activity': datetime.now()}}
+    )
+    return result.modified_count == 1
+
+
+def open_spooled_files(batch):
+    """The assembled files of a batch, as Django Files named after the uploads"""
+    files = []
+    for index, file in enumerate(batch['files']):
+        path = spool_path(batch['_id'], index)
+        # A failed chunk write may have left bytes past the end
+        os.truncate(path, file['size'])
+        files.append(File(open(path, 'rb'), name=file['name']))
+    return files
+
+
+def discard_spool(batch_id):
+    shutil.rmtree(os.path.join(spool_root(), str(batch_id)), ignore_errors=True)
+
+
+def purge_stale_spools():
+    """Remove spools of batches idle for longer than the TTL (their documents expire by TTL index)"""
+    root = spool_root()
+    cutoff = time.time() - batch_ttl()
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if not entry.is_dir():
+                continue
+            # Writing a chunk touches the part file, not its directory
+            last_write = max([entry.stat().st_mtime] + [part.stat().st_mtime for part in os.scandir(entry.path)])
+            if last_write < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,152 @@
+"""
+MongoDB round-trip accounting per request, exported in Prometheus format.
+
+A pymongo CommandListener attached to the shared client times every command.
+The request being served is found through a context variable set by
+DBMetricsMiddleware, so commands are attributed to the view that issued them
+(background threads such as the write-behind flusher count as no request).
+Histograms are per process; scrape each worker, or aggregate in Prometheus.
+"""
+import contextvars
+import threading
+from bisect import bisect_left
+from pymongo import monitoring
+
+# Histogram bucket upper bounds
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class RequestStats:
+    """DB activity of one request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.slowest = None  # (seconds, command, collection)
+        self.files = 0  # files processed, each adding MONGO_QUERY_BUDGET_PER_FILE to the budget
+        # Files of one upload are processed on several threads
+        self._lock = threading.Lock()
+
+    def add(self, command, collection, seconds):
+        with self._lock:
+            self.queries += 1
+            self.seconds += seconds
+            if self.slowest is None or seconds > self.slowest[0]:
+                self.slowest = (seconds, command, collection)
+
+
+current_request = contextvars.ContextVar('mongo_request_stats', default=None)
+
+
+def charge_files(count):
+    """Declare that the current request processes `count` uploaded files"""
+    stats = current_request.get()
+    if stats is not None:
+        stats.files += count
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, labelnames):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labelnames = labelnames
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: ([*counts], total, count) for labels, (counts, total, count) in self._series.items()}
+        for labels, (counts, total, count) in sorted(series.items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{self.name}_count{{{label_text}}} {count}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_QUERIES = Histogram(
+    'mongo_request_queries', 'MongoDB commands issued per request', QUERY_BUCKETS, ('view',)
+)
+REQUEST_DB_SECONDS = Histogram(
+    'mongo_request_db_seconds', 'Total MongoDB command time per request', SECONDS_BUCKETS, ('view',)
+)
+COMMAND_SECONDS = Histogram(
+    'mongo_command_seconds', 'MongoDB command duration', SECONDS_BUCKETS, ('command', 'collection')
+)
+
+_over_budget = {}
+_over_budget_lock = threading.Lock()
+
+
+def record_request(view, stats, over_budget):
+    REQUEST_QUERIES.observe((view,), stats.queries)
+    REQUEST_DB_SECONDS.observe((view,), stats.seconds)
+    if over_budget:
+        with _over_budget_lock:
+            _over_budget[view] = _over_budget.get(view, 0) + 1
+
+
+def render_metrics():
+    lines = []
+    for histogram in (REQUEST_QUERIES, REQUEST_DB_SECONDS, COMMAND_SECONDS):
+        lines.extend(histogram.render())
+    lines.append('# HELP mongo_requests_over_budget_total Requests over the MongoDB query or time budget')
+    lines.append('# TYPE mongo_requests_over_budget_total counter')
+    with _over_budget_lock:
+        for view, count in sorted(_over_budget.items()):
+            lines.append(f'mongo_requests_over_budget_total{{view="{_escape(view)}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+class CommandTracker(monitoring.CommandListener):
+    """Times each command and charges it to the current request, if any"""
+
+    def __init__(self):
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == 'getMore':
+            collection = event.command.get('collection')
+        if isinstance(collection, str):
+            with self._lock:
+                self._collections[(event.connection_id, event.request_id)] = collection
+
+    def _finished(self, event):
+        with self._lock:
+            collection = self._collections.pop((event.connection_id, event.request_id), '')
+        seconds = event.duration_micros / 1e6
+        COMMAND_SECONDS.observe((event.command_name, collection), seconds)
+        stats = current_request.get()
+        if stats is not None:
+            stats.add(event.command_name, collection, seconds)
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+
+command_tracker = CommandTracker()
@@ -0,0 +1,166 @@
+"""
+Experience timeline: date ranges of experience entries as month numbers.
+
+Parsers keep an entry's dates as written ("03/2015 to Current", "Jan 2015
+- Jun 2017", "2012 - 2014") or only a length ("3 years"). At ingest each
+entry gets `start_month` / `end_month` as year * 12 + month - 1, and the
+candidate gets `experience_years` plus `title_years`, the years spent per
+normalized job title. Both are indexed, so "5+ years as Accountant" is an
+index range scan instead of parsing every resume at query time.
+
+Overlapping positions are counted once. Ranges ending "Current" are counted
+up to the month they were computed in; backfill_experience_timeline --all
+brings them up to date.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+_CURRENT = r'(?:current|present|now|today|date|ongoing)'
+_MONTH_NAME = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_MONTH_DIGITS = r'\d{1,2}'
+_YEAR = r'(?:19|20)\d{2}'
+
+
+def _endpoint_pattern(name):
+    """One side of a range: Current, 03/2015, 2015-03, March 2015 or 2015"""
+    return (
+        rf'(?P<{name}_current>{_CURRENT})'
+        rf'|(?P<{name}_month>{_MONTH_DIGITS})\s*[/.-]\s*(?P<{name}_year>{_YEAR})'
+        rf'|(?P<{name}_iso_year>{_YEAR})-(?P<{name}_iso_month>{_MONTH_DIGITS})'
+        rf'|(?P<{name}_name>{_MONTH_NAME}),?\s+(?P<{name}_name_year>{_YEAR})'
+        rf'|(?P<{name}_bare_year>{_YEAR})'
+    )
+
+
+_RANGE = re.compile(
+    f'(?:{_endpoint_pattern("start")})'
+    r'\s*(?:-|–|—|to|until|till|through|thru)\s*'
+    f'(?:{_endpoint_pattern("end")})',
+    re.IGNORECASE
+)
+_LENGTH = re.compile(r'(\d+(?:\.\d+)?)\s*(years?|yrs?|months?|mos?)\b', re.IGNORECASE)
+
+
+def current_month():
+    today = date.today()
+    return month_number(today.year, today.month)
+
+
+def month_number(year, month):
+    return year * 12 + month - 1
+
+
+def _endpoint(match, name):
+    """Month number of one side of a range match; None for Current"""
+    group = match.groupdict()
+    if group[f'{name}_current']:
+        return None
+    if group[f'{name}_month']:
+        year, month = int(group[f'{name}_year']), int(group[f'{name}_month'])
+    elif group[f'{name}_iso_year']:
+        year, month = int(group[f'{name}_iso_year']), int(group[f'{name}_iso_month'])
+    elif group[f'{name}_name']:
+        year, month = int(group[f'{name}_name_year']), MONTHS[group[f'{name}_name'][:3].lower()]
+    else:
+        # A bare year covers the whole year: January as a start, December as an end
+        year, month = int(group[f'{name}_bare_year']), 1 if name == 'start' else 12
+    if not 1 <= month <= 12:
+        raise ValueError(month)
+    return month_number(year, month)
+
+
+@lru_cache(maxsize=50000)
+def parse_date_range(text):
+    """(start_month, end_month or None if current) of the first date range in text, or None"""
+    match = _RANGE.search(text or '')
+    if not match:
+        return None
+    try:
+        start = _endpoint(match, 'start')
+        end = _endpoint(match, 'end')
+    except ValueError:
+        return None
+    if start is None or (end is not None and end < start):
+        return None
+    return start, end
+
+
+@lru_cache(maxsize=50000)
+def parse_length(text):
+    """Months in a length such as "3 years" or "2 yrs 6 months", or None"""
+    months = 0.0
+    for amount, unit in _LENGTH.findall(text or ''):
+        months += float(amount) * (12 if unit.lower().startswith('y') else 1)
+    return round(months) if months else None
+
+
+def title_key(title):
+    """Lower-case, single-spaced job title used for per-title years"""
+    return ' '.join(re.sub(r'[^\w+#/&.]', ' ', str(title or '').lower()).split())
+
+
+def _merged_months(intervals):
+    """Months covered by a set of inclusive (start, end) intervals, overlaps counted once"""
+    total = 0
+    covered_until = None
+    for start, end in sorted(intervals):
+        if covered_until is not None and start <= covered_until:
+            if end > covered_until:
+                total += end - covered_until
+                covered_until = end
+            continue
+        total += end - start + 1
+        covered_until = end
+    return total
+
+
+def experience_timeline(experience, as_of=None):
+    """
+    Fields to store for a candidate's experience entries: the entries with
+    start_month/end_month/current added, experience_years and title_years.
+    """
+    as_of = current_month() if as_of is None else as_of
+    entries = []
+    intervals = []
+    title_intervals = {}
+    undated = {}  # title key -> months known only from a length
+
+    for entry in experience or []:
+        entry = dict(entry)
+        text = str(entry.get('duration') or entry.get('dates') or '')
+        title = title_key(entry.get('title'))
+        dated = parse_date_range(text)
+        if dated:
+            start, end = dated
+            entry['current'] = end is None
+            end = as_of if end is None else end
+            entry['start_month'], entry['end_month'] = start, end
+            if start <= end:
+                intervals.append((start, end))
+                if title:
+                    title_intervals.setdefault(title, []).append((start, end))
+        else:
+            months = parse_length(text)
+            if months:
+                undated[title] = undated.get(title, 0) + months
+        entries.append(entry)
+
+    total = _merged_months(intervals) + sum(undated.values())
+    titles = {title: _merged_months(spans) for title, spans in title_intervals.items()}
+    for title, months in undated.items():
+        if title:
+            titles[title] = titles.get(title, 0) + months
+    return {
+        'experience': entries,
+        'experience_years': round(total / 12, 1),
+        'title_years': [
+            {'title': title, 'years': round(months / 12, 1)}
+            for title, months in sorted(titles.items())
+        ],
+    }
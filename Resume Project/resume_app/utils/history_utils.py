@@ -0,0 +1,79 @@
+from datetime import datetime
+from django.conf import settings
+from pymongo import UpdateOne
+
+# Full resume history lives here in fixed-size buckets, one series per candidate
+HISTORY_COLLECTION = 'resume_history_buckets'
+
+# Parse output shared by every upload of the same content, keyed by content hash
+PARSE_RESULTS_COLLECTION = 'parse_results'
+
+HISTORY_BUCKET_SIZE = getattr(settings, 'RESUME_HISTORY_BUCKET_SIZE', 50)
+HISTORY_RECENT_LIMIT = getattr(settings, 'RESUME_HISTORY_RECENT_LIMIT', 5)
+
+
+def append_history(history_collection, candidate_id, entry):
+    """Push an entry into the candidate's open bucket, starting a new bucket when it is full"""
+    history_collection.update_one(
+        {'candidate_id': candidate_id, 'count': {'$lt': HISTORY_BUCKET_SIZE}},
+        {
+            '$push': {'entries': entry},
+            '$inc': {'count': 1},
+            '$min': {'first_date': entry['upload_date']},
+            '$max': {'last_date': entry['upload_date']}
+        },
+        upsert=True
+    )
+
+
+def recent_history_update(entry):
+    """Update operators keeping only the latest entries embedded on the candidate"""
+    return {
+        '$push': {'resume_history': {'$each': [entry], '$slice': -HISTORY_RECENT_LIMIT}},
+        '$inc': {'resume_count': 1}
+    }
+
+
+def migrate_candidate_history(candidate_collection, history_collection, candidate):
+    """
+    Copy the full resume_history embedded on a candidate written before the
+    history migration into buckets, then trim it and set resume_count.
+    Buckets are upserted on (candidate_id, seq), so running it again after an
+    interruption adds nothing twice.
+    """
+    history = candidate.get('resume_history') or []
+    buckets = []
+    for seq, start in enumerate(range(0, len(history), HISTORY_BUCKET_SIZE)):
+        entries = history[start:start + HISTORY_BUCKET_SIZE]
+        buckets.append(UpdateOne(
+            {'candidate_id': candidate['_id'], 'seq': seq},
+            {'$setOnInsert': {
+                'entries': entries,
+                'count': len(entries),
+                'first_date': entries[0].get('upload_date'),
+                'last_date': entries[-1].get('upload_date')
+            }},
+            upsert=True
+        ))
+    if buckets:
+        history_collection.bulk_write(buckets, ordered=False)
+    candidate_collection.update_one(
+        {'_id': candidate['_id'], 'resume_count': {'$exists': False}},
+        {'$set': {'resume_history': history[-HISTORY_RECENT_LIMIT:], 'resume_count': len(history)}}
+    )
+
+
+def save_parse_result(parse_results_collection, parse_result_id, parsed_data, stamp=None):
+    """
+    Store a parse result once; uploads reference it by parse_result_id.
+    `stamp` records the parser backend and version that produced it.
+    """
+    parse_results_collection.update_one(
+        {'_id': parse_result_id},
+        {
+            '$set': {'parsed_data': parsed_data, **(stamp or {})},
+            '$setOnInsert': {'created_date': datetime.now()}
+        },
+        upsert=True
+    )
+    return parse_result_id
@@ -0,0 +1,50 @@
+import re
+import unicodedata
+from django.conf import settings
+
+
+def normalize_email(email):
+    email = (email or '').strip().lower()
+    return email if '@' in email else ''
+
+
+def normalize_phone(phone):
+    """Best-effort E.164 form (+<country><number>), or '' if it cannot be a phone number"""
+    phone = (phone or '').strip()
+    digits = re.sub(r'\D', '', phone)
+    if phone.startswith('00'):
+        digits = digits[2:]
+    elif not phone.startswith('+') and len(digits) == 10:
+        # National number without a country code
+        digits = getattr(settings, 'CANDIDATE_DEFAULT_COUNTRY_CODE', '1') + digits
+    if not 8 <= len(digits) <= 15:
+        return ''
+    return f'+{digits}'
+
+
+def normalize_name(first_name, last_name):
+    """Lower-case, accent-free 'first last', or '' unless both parts are present"""
+    parts = []
+    for part in (first_name, last_name):
+        part = unicodedata.normalize('NFKD', part or '')
+        part = ''.join(c for c in part if not unicodedata.combining(c)).lower()
+        part = ' '.join(re.sub(r'[^a-z0-9 ]', ' ', part).split())
+        if not part:
+            return ''
+        parts.append(part)
+    return ' '.join(parts)
+
+
+def identity_keys(data):
+    """Identity keys stored on candidates; any shared key marks the same person"""
+    keys = []
+    email = normalize_email(data.get('email'))
+    if email:
+        keys.append(f'email:{email}')
+    phone = normalize_phone(data.get('phone'))
+    if phone:
+        keys.append(f'phone:{phone}')
+    name = normalize_name(data.get('first_name'), data.get('last_name'))
+    if name:
+        keys.append(f'name:{name}')
+    return keys
@@ -0,0 +1,134 @@
+"""
+Non-blocking structured logging.
+
+Request threads only put records on a bounded in-memory queue; a listener
+thread formats them as JSON lines and writes them to the stream, so a slow
+or contended stdout never stalls a request, and lines from concurrent
+requests are written whole instead of interleaved. When the queue is full
+records are dropped (and counted) rather than blocking.
+
+Each line carries the request ID and view of the request that logged it,
+taken from a context variable set by RequestLoggingMiddleware. High-volume
+success messages are logged with extra={'sampled': True} and only
+LOG_SUCCESS_SAMPLE_RATE of them are kept.
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class RequestContext:
+    """Identity of the request being served; view is filled in once the URL resolves"""
+
+    def __init__(self, request_id, view=None):
+        self.request_id = request_id
+        self.view = view
+
+
+current_context = contextvars.ContextVar('log_request_context', default=None)
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != 'sampled' and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps `rate` of the records flagged sampled=True; everything else passes"""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if getattr(record, 'sampled', False) and record.levelno < logging.WARNING:
+            return random.random() < self.rate
+        return True
+
+
+class QueuedStreamHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a listener thread that writes them to `stream`.
+
+    The listener is restarted in forked children (threads do not survive a
+    fork), so parser pool workers log through their own copy.
+    """
+
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.maxsize = maxsize
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self._pid = None
+        self._listener = None
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread
+        self.target.setFormatter(fmt)
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                if self._pid is not None:
+                    self.queue = queue.Queue(self.maxsize)
+                self._listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+                self._listener.start()
+                self._pid = os.getpid()
+                atexit.register(self.stop)
+
+    def prepare(self, record):
+        # Resolve everything that depends on the calling thread before queueing:
+        # the message arguments, the traceback and the request context
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        context = current_context.get()
+        if context is not None:
+            record.request_id = getattr(record, 'request_id', None) or context.request_id
+            record.view = getattr(record, 'view', None) or context.view
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        listener, self._listener = self._listener, None
+        if listener is not None and self._pid == os.getpid():
+            listener.stop()
+        self.target.flush()
@@ -0,0 +1,289 @@
+"""
+Job-to-candidate matching over a sparse candidate x skill matrix.
+
+Rows are candidates and columns are taxonomy skill IDs (see skill_taxonomy),
+so spellings of one skill share a column. Entries are kept
+binary and IDF weights are applied at query time, so weights always reflect
+the current corpus. A job is scored against every candidate with one
+sparse mat-vec, and the top-k come from a partial sort (argpartition).
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.core.signals import request_started
+from .skill_taxonomy import SKILL_TAXONOMY_COLLECTION, get_skill_taxonomy, skill_key
+
+logger = logging.getLogger(__name__)
+
+# Collection of job postings: {title, department, required_skills, ...}
+JOBS_COLLECTION = 'jobs'
+
+# Pending rows are merged into the CSR matrix once this many accumulate, or before a query
+FLUSH_THRESHOLD = 5000
+
+# Rows masked out by later edits are dropped by rebuilding the matrix once they are
+# this share of all rows (and at least COMPACT_MIN_ROWS)
+COMPACT_RATIO = 0.25
+COMPACT_MIN_ROWS = 1000
+
+
+def _grow(array, size):
+    """Return array with room for at least size items, doubling to keep appends amortized O(1)"""
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array), 1024), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class MatchingEngine:
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self.skill_columns = {}  # skill id -> column
+        self.candidate_ids = []
+        self.candidate_rows = {}
+        self.active = np.zeros(0, dtype=bool)
+        self.inactive_rows = 0
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._pending = {}  # row -> column indices not yet merged into the matrix
+        self._lock = threading.RLock()
+        self.last_sync = None
+        self.synced_at = 0.0
+
+    # --- building -------------------------------------------------------
+
+    def _columns(self, skill_ids, create=True):
+        columns = set()
+        for skill_id in skill_ids or []:
+            if skill_id not in self.skill_columns:
+                if not create:
+                    continue
+                self.skill_columns[skill_id] = len(self.skill_columns)
+            columns.add(self.skill_columns[skill_id])
+        return sorted(columns)
+
+    def _row_columns(self, row):
+        if row in self._pending:
+            return self._pending[row]
+        start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        return self.matrix.indices[start:end].tolist()
+
+    def add_candidate(self, candidate_id, skill_ids, flush=True):
+        """Add or replace a candidate's skill IDs; replaced rows are masked out, not rewritten"""
+        with self._lock:
+            columns = self._columns(skill_ids)
+            self.doc_freq = _grow(self.doc_freq, len(self.skill_columns))
+
+            old_row = self.candidate_rows.get(candidate_id)
+            if old_row is not None:
+                if self._row_columns(old_row) == columns:
+                    return old_row
+                self.active[old_row] = False
+                self.inactive_rows += 1
+                np.subtract.at(self.doc_freq, self._row_columns(old_row), 1)
+
+            row = len(self.candidate_ids)
+            self.candidate_ids.append(candidate_id)
+            self.candidate_rows[candidate_id] = row
+            self.active = _grow(self.active, row + 1)
+            self.active[row] = True
+            np.add.at(self.doc_freq, columns, 1)
+            self._pending[row] = columns
+
+            if flush and len(self._pending) >= FLUSH_THRESHOLD:
+                self._flush()
+            return row
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = sorted(self._pending)
+        indptr = [0]
+        indices = []
+        for row in rows:
+            indices.extend(self._pending[row])
+            indptr.append(len(indices))
+        block = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(len(rows), len(self.skill_columns))
+        )
+        matrix = self.matrix
+        matrix.resize((matrix.shape[0], len(self.skill_columns)))
+        self.matrix = sparse.vstack([matrix, block], format='csr')
+        self._pending = {}
+        # Every edit leaves a dead row behind, so without this the matrix grows with edits, not candidates
+        if self.inactive_rows >= max(COMPACT_MIN_ROWS, COMPACT_RATIO * len(self.candidate_ids)):
+            self._compact()
+
+    def _compact(self):
+        """Rebuild the matrix over active rows only; doc_freq already counts only those"""
+        keep = np.flatnonzero(self.active[:len(self.candidate_ids)])
+        self.matrix = self.matrix[keep]
+        self.candidate_ids = [self.candidate_ids[row] for row in keep]
+        self.candidate_rows = {candidate_id: row for row, candidate_id in enumerate(self.candidate_ids)}
+        self.active = np.ones(len(keep), dtype=bool)
+        self.inactive_rows = 0
+
+    def sync(self, candidate_collection, force=False):
+        """
+        Pull candidates created or updated since the last sync (all of them the
+        first time). Other worker processes' uploads are picked up this way.
+        """
+        interval = getattr(settings, 'MATCHING_SYNC_INTERVAL', 5)
+        if not force and time.monotonic() - self.synced_at < interval:
+            return
+        with self._lock:
+            started = datetime.now()
+            query = {}
+            if self.last_sync is not None:
+                # Small overlap absorbs clock skew between web workers
+                query = {'last_updated': {'$gte': self.last_sync - timedelta(seconds=60)}}
+            for candidate in candidate_collection.find(query, {'skill_ids': 1, 'skills': 1}).batch_size(10000):
+                # Candidates saved before the taxonomy existed are resolved from their skill strings
+                skill_ids = candidate.get('skill_ids')
+                if skill_ids is None:
+                    skill_ids = self.taxonomy.skill_ids(candidate.get('skills'))
+                self.add_candidate(candidate['_id'], skill_ids, flush=False)
+            self._flush()
+            self.last_sync = started
+            self.synced_at = time.monotonic()
+
+    # --- scoring --------------------------------------------------------
+
+    def _weights(self, required_skills):
+        """IDF weight vector over skill columns for a job's required skills (raw strings)"""
+        # Required skills are looked up, never interned: queries must not grow the taxonomy
+        resolved = [self.taxonomy.skill_id(key, create=False) for key in {skill_key(s) for s in required_skills} if key]
+        skill_ids = {skill_id for skill_id in resolved if skill_id is not None}
+        unknown = resolved.count(None)
+        columns = self._columns(skill_ids, create=False)
+        weights = np.zeros(len(self.skill_columns), dtype=np.float32)
+        if not columns:
+            return weights, 0.0
+        total = max(int(self.active[:len(self.candidate_ids)].sum()), 1)
+        idf = np.log((1 + total) / (1 + self.doc_freq[columns])) + 1
+        weights[columns] = idf
+        # Required skills nobody has still count against coverage
+        missing = unknown + len(skill_ids) - len(columns)
+        return weights, float(idf.sum() + missing * (np.log(1 + total) + 1))
+
+    def top_k(self, required_skills, k=20, candidate_ids=None):
+        """
+        [(candidate_id, score)] for the k best matches, score being the IDF-weighted
+        share of required skills (0-100). candidate_ids restricts the ranking.
+        """
+        with self._lock:
+            self._flush()
+            weights, norm = self._weights(required_skills)
+            if norm == 0 or self.matrix.shape[0] == 0:
+                return []
+            scores = self.matrix @ weights
+            mask = self.active[:len(self.candidate_ids)].copy()
+            if candidate_ids is not None:
+                allowed = np.zeros_like(mask)
+                allowed[[self.candidate_rows[c] for c in candidate_ids if c in self.candidate_rows]] = True
+                mask &= allowed
+            scores = np.where(mask, scores, 0) * (100.0 / norm)
+
+            k = min(k, int(np.count_nonzero(scores)))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.candidate_ids[row], round(float(scores[row]), 1)) for row in top]
+
+    def score_skills(self, required_skills, skill_ids):
+        """Score skill IDs that are not (yet) a row, e.g. of a candidate being created"""
+        with self._lock:
+            weights, norm = self._weights(required_skills)
+            if norm == 0:
+                return 0.0
+            columns = self._columns(skill_ids, create=False)
+            return round(float(weights[columns].sum()) * 100.0 / norm, 1)
+
+    def score_all(self, required_skills, candidate_ids):
+        """{candidate_id: score} for the given candidates, computed in one vectorized pass"""
+        with self._lock:
+            self._flush()
+            weights, norm = self._weights(required_skills)
+            known = [c for c in candidate_ids if c in self.candidate_rows]
+            if not known:
+                return {}
+            if norm == 0:
+                return {candidate_id: 0.0 for candidate_id in known}
+            rows = np.array([self.candidate_rows[c] for c in known])
+            scores = (self.matrix[rows] @ weights) * (100.0 / norm)
+            return {candidate_id: round(float(score), 1) for candidate_id, score in zip(known, scores)}
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_matching_engine(candidate_collection):
+    """
+    Process-wide engine, kept in sync with Mongo. Servers start building it on
+    their first request (warm_matching_engine_on_first_request); anything else
+    loads the whole collection on first use.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            started = time.perf_counter()
+            engine = MatchingEngine(get_skill_taxonomy(candidate_collection.database[SKILL_TAXONOMY_COLLECTION]))
+            engine.sync(candidate_collection, force=True)
+            _engine = engine
+            logger.info('Matching engine built with %s candidates in %.1fs',
+                        len(engine.candidate_ids), time.perf_counter() - started)
+    _engine.sync(candidate_collection)
+    return _engine
+
+
+def warm_matching_engine(get_candidate_collection):
+    """
+    Build the engine ahead of the first match so no request pays for loading
+    every candidate. Failures (Mongo unreachable) are logged and the first match retries.
+    """
+    try:
+        get_matching_engine(get_candidate_collection())
+    except Exception:
+        logger.exception('Matching engine could not be built ahead of use')
+
+
+def warm_matching_engine_on_first_request(get_candidate_collection):
+    """
+    Build the engine in a background thread once the server takes its first
+    request. Importing the WSGI/ASGI module (runserver, management commands,
+    a pre-forking master) loads nothing, and only requests that match
+    candidates wait for the build.
+    """
+    def start(**kwargs):
+        # Only the request that wins the disconnect starts the build
+        if request_started.disconnect(dispatch_uid='warm_matching_engine'):
+            threading.Thread(
+                target=warm_matching_engine, args=(get_candidate_collection,),
+                name='matching-engine-warmup', daemon=True
+            ).start()
+
+    request_started.connect(start, weak=False, dispatch_uid='warm_matching_engine')
+
+
+def find_job_skills(jobs_collection, job_title):
+    """Required skills of the job posting with this title, or None if there is none"""
+    if not job_title:
+        return None
+    job = jobs_collection.find_one({'title': job_title}, {'required_skills': 1})
+    return job.get('required_skills') if job else None
+
+
+async def afind_job_skills(jobs_collection, job_title):
+    """find_job_skills on an async collection"""
+    if not job_title:
+        return None
+    job = await jobs_collection.find_one({'title': job_title}, {'required_skills': 1})
+    return job.get('required_skills') if job else None
@@ -0,0 +1,210 @@
+"""
+Near-duplicate resumes: MinHash signatures with an LSH bucket index.
+
+A candidate's resume text is split into word shingles and summarised by a
+MinHash signature of NUM_PERM 32-bit minima (stored as 512 raw bytes), whose
+agreement rate estimates the Jaccard similarity of two shingle sets. The
+signature is cut into LSH_BANDS bands, each hashed to one indexed bucket key,
+so resumes sharing any band are found with an index lookup and only those
+few are compared. With 32 bands of 4 rows, pairs at the default 0.7
+threshold share a bucket more than 99.9% of the time, while unrelated resumes
+(below 0.2) meet in a bucket about 5% of the time and are dropped on comparison.
+
+Upload links a new candidate to the near-duplicates already stored;
+`manage.py cluster_near_duplicates` backfills signatures and groups the whole
+collection into clusters.
+"""
+import hashlib
+import re
+import zlib
+import numpy as np
+from django.conf import settings
+
+NUM_PERM = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 3
+
+# Most links kept on a candidate, and most bucket-mates verified per lookup
+MAX_LINKS = 20
+MAX_BUCKET_CANDIDATES = 200
+
+# Candidate fields the signature is computed from
+SIGNATURE_FIELDS = {
+    'first_name': 1, 'last_name': 1, 'email': 1, 'phone': 1, 'location': 1, 'summary': 1,
+    'experience': 1, 'education': 1, 'skills': 1, 'certifications': 1,
+}
+
+# Universal hashes (a * x + b) mod p over 32-bit shingle hashes; a < 2^31 keeps a * x + b within 64 bits
+_PRIME = np.uint64(4294967311)
+_MASK = np.uint64(0xFFFFFFFF)
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2 ** 31, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 32, NUM_PERM, dtype=np.uint64)
+
+_WORD = re.compile(r'[a-z0-9][a-z0-9+#.@-]*')
+
+
+def threshold():
+    """Estimated Jaccard similarity from which two resumes are linked"""
+    return getattr(settings, 'NEAR_DUPLICATE_THRESHOLD', 0.7)
+
+
+def resume_text(data):
+    """Text of a parsed resume or candidate document, in a stable field order"""
+    parts = [data.get(field) or '' for field in ('first_name', 'last_name', 'email', 'phone', 'location', 'summary')]
+    for entry in data.get('experience') or []:
+        parts.extend(str(entry.get(field) or '') for field in ('title', 'company', 'duration', 'description'))
+    for entry in data.get('education') or []:
+        parts.extend(str(entry.get(field) or '') for field in ('degree', 'field', 'university', 'year'))
+    parts.extend(data.get('skills') or [])
+    parts.extend(data.get('certifications') or [])
+    return '\n'.join(str(part) for part in parts)
+
+
+def shingles(text):
+    """Hashes of the distinct SHINGLE_SIZE-word windows of the text"""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        windows = [' '.join(words)] if words else []
+    else:
+        windows = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return np.fromiter({zlib.crc32(window.encode('utf-8')) for window in windows}, dtype=np.uint64)
+
+
+def minhash_signature(text):
+    """uint32 signature of NUM_PERM minima, or None for text without words"""
+    hashes = shingles(text)
+    if not len(hashes):
+        return None
+    signature = np.full(NUM_PERM, _MASK, dtype=np.uint64)
+    # Bounded chunks keep the (shingles x permutations) matrix small for long resumes
+    for start in range(0, len(hashes), 1024):
+        values = (np.outer(hashes[start:start + 1024], _A) + _B) % _PRIME & _MASK
+        np.minimum(signature, values.min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def encode_signature(signature):
+    return signature.astype('<u4').tobytes()
+
+
+def decode_signature(data):
+    return np.frombuffer(data, dtype='<u4')
+
+
+def lsh_buckets(signature):
+    """One signed 64-bit bucket key per band; the band number is hashed in so bands never collide"""
+    data = signature.astype('<u4').tobytes()
+    width = LSH_ROWS * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + data[band * width:(band + 1) * width], digest_size=8).digest(),
+            'big', signed=True
+        )
+        for band in range(LSH_BANDS)
+    ]
+
+
+def estimate_similarity(signature, other):
+    """Fraction of agreeing minima: an unbiased estimate of the Jaccard similarity"""
+    return float(np.count_nonzero(signature == other)) / NUM_PERM
+
+
+def signature_fields(data):
+    """Fields to store on a candidate for its resume: the packed signature and its bucket keys"""
+    signature = minhash_signature(resume_text(data))
+    if signature is None:
+        return {}
+    return {'minhash': encode_signature(signature), 'lsh_buckets': lsh_buckets(signature)}
+
+
+def find_near_duplicates(candidate_collection, signature, exclude=None, limit=MAX_LINKS):
+    """[(candidate_id, similarity)] of stored candidates sharing a bucket and above the threshold"""
+    query = {'lsh_buckets': {'$in': lsh_buckets(signature)}}
+    if exclude is not None:
+        query['_id'] = {'$ne': exclude}
+    cutoff = threshold()
+    matches = []
+    for candidate in candidate_collection.find(query, {'minhash': 1}).limit(MAX_BUCKET_CANDIDATES):
+        similarity = estimate_similarity(signature, decode_signature(candidate['minhash']))
+        if similarity >= cutoff:
+            matches.append((candidate['_id'], similarity))
+    matches.sort(key=lambda match: -match[1])
+    return matches[:limit]
+
+
+def link_near_duplicates(candidate_collection, candidate_id, fields):
+    """
+    Link a just-saved candidate (with `fields` from signature_fields) and its
+    near-duplicates to each other; returns the matches.
+    Both sides are linked, so of two similar resumes saved concurrently at
+    least the second lookup sees the first.
+    """
+    if 'minhash' not in fields:
+        return []
+    matches = find_near_duplicates(candidate_collection, decode_signature(fields['minhash']), exclude=candidate_id)
+    if matches:
+        match_ids = [match_id for match_id, _ in matches]
+        candidate_collection.update_one(
+            {'_id': candidate_id},
+            {'$addToSet': {'likely_duplicates': {'$each': match_ids}}}
+        )
+        candidate_collection.update_many(
+            {'_id': {'$in': match_ids}, f'likely_duplicates.{MAX_LINKS - 1}': {'$exists': False}},
+            {'$addToSet': {'likely_duplicates': candidate_id}}
+        )
+    return matches
+
+
+def cluster_candidates(candidate_collection, batch_size=1000, max_bucket_size=1000):
+    """
+    Group every candidate with a signature into near-duplicate clusters.
+    Returns {candidate_id: cluster root id} for candidates in a cluster of two
+    or more, the root being its smallest (oldest) id.
+
+    Only candidates sharing a bucket are compared. Buckets larger than
+    max_bucket_size hold boilerplate shared by unrelated resumes and are
+    skipped: near-duplicates agree on most bands, so they also meet in
+    smaller buckets.
+    """
+    cutoff = threshold()
+    parent = {}
+    signatures = {}
+
+    def root(candidate_id):
+        while candidate_id in parent:
+            candidate_id = parent[candidate_id]
+        return candidate_id
+
+    def load(candidate_ids):
+        missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in signatures]
+        for start in range(0, len(missing), batch_size):
+            for candidate in candidate_collection.find({'_id': {'$in': missing[start:start + batch_size]}}, {'minhash': 1}):
+                signatures[candidate['_id']] = decode_signature(candidate['minhash'])
+
+    groups = candidate_collection.aggregate([
+        {'$match': {'lsh_buckets.0': {'$exists': True}}},
+        {'$unwind': '$lsh_buckets'},
+        {'$group': {'_id': '$lsh_buckets', 'ids': {'$push': '$_id'}}},
+        {'$match': {'ids.1': {'$exists': True}}},
+    ], allowDiskUse=True)
+    for group in groups:
+        if len(group['ids']) > max_bucket_size:
+            continue
+        load(group['ids'])
+        # Each member is compared with one representative per cluster met so far in this bucket
+        representatives = []
+        for candidate_id in group['ids']:
+            matched = False
+            for representative in representatives:
+                if estimate_similarity(signatures[candidate_id], signatures[representative]) >= cutoff:
+                    first, second = sorted((root(candidate_id), root(representative)))
+                    if first != second:
+                        parent[second] = first
+                    matched = True
+            if not matched:
+                representatives.append(candidate_id)
+
+    members = set(parent) | set(parent.values())
+    return {candidate_id: root(candidate_id) for candidate_id in members}
@@ -0,0 +1,251 @@
+"""
+Warm process pool running the regex parser from `Resume Data Extraction/resume_scraper.py`.
+Settings are only read in the web process, since workers may be spawned without them.
+"""
+import importlib.util
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Extra seconds the web process waits beyond the per-document limit before giving up
+TIMEOUT_GRACE = 5
+
+# Bump a backend's version whenever its output changes (parser rules, build_parsed_data);
+# `manage.py reparse_resumes` re-parses every result stamped with an older version
+PARSER_VERSIONS = {
+    'regex': 1,
+    'simulated': 1,
+}
+
+
+class ResumeParseError(Exception):
+    """Raised when a document cannot be parsed or exceeds its time limit"""
+
+
+_parser = None  # resume_scraper module, loaded once per worker process
+_pool = None
+_pool_lock = threading.Lock()
+# Workers report their pid here as they start, so a stuck one can be killed without pool internals
+_pid_queue = None
+_worker_pids = set()
+
+
+def _load_parser(parser_path):
+    spec = importlib.util.spec_from_file_location('resume_scraper', parser_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _init_worker(parser_path, pid_queue):
+    global _parser
+    pid_queue.put(os.getpid())
+    _parser = _load_parser(parser_path)
+
+
+def _warm():
+    return os.getpid()
+
+
+def _on_time_limit(signum, frame):
+    raise ResumeParseError('Parsing exceeded the per-document time limit')
+
+
+def _parse_document(path, file_extension, time_limit):
+    """Runs in a worker: extract text from the file at `path` and apply the regex parsers"""
+    use_alarm = hasattr(signal, 'setitimer')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_time_limit)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        if file_extension == '.pdf':
+            # Logs and returns '' for an unreadable PDF, which fails below
+            text = _parser.extract_text_from_pdf(path)
+        elif file_extension == '.docx':
+            text = _parser.extract_text_from_docx_file(path)
+        elif file_extension == '.txt':
+            with open(path, encoding='utf-8', errors='ignore') as text_file:
+                text = text_file.read()
+        else:
+            raise ResumeParseError(f'{file_extension} files are not supported by the regex parser')
+
+        if not text.strip():
+            raise ResumeParseError('No text could be extracted from the document')
+
+        return {
+            'contact': _parser.parse_contact(text),
+            'summary': _parser.parse_summary(text),
+            'skills': _parser.parse_skills(text),
+            'experience': _parser.parse_experience(text),
+            'education': _parser.parse_education(text),
+        }
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _parser_settings():
+    from django.conf import settings
+    return {
+        'parser_path': str(getattr(
+            settings, 'RESUME_PARSER_PATH',
+            settings.BASE_DIR / 'Resume Data Extraction' / 'resume_scraper.py'
+        )),
+        'workers': getattr(settings, 'RESUME_PARSER_WORKERS', None) or os.cpu_count() or 2,
+        'time_limit': getattr(settings, 'RESUME_PARSE_TIMEOUT', 20),
+    }
+
+
+def parser_backend():
+    from django.conf import settings
+    return getattr(settings, 'RESUME_PARSER_BACKEND', 'regex')
+
+
+def parser_stamp(backend=None):
+    """Fields recording which parser backend and version produced a parse result"""
+    backend = backend or parser_backend()
+    return {'parser_backend': backend, 'parser_version': PARSER_VERSIONS.get(backend, 0)}
+
+
+def stale_parse_query(stamp):
+    """Parse results not produced by the parser `stamp` describes, unstamped ones included"""
+    return {'$or': [
+        {'parser_version': {'$lt': stamp['parser_version']}},
+        {'parser_version': None},
+        {'parser_backend': {'$ne': stamp['parser_backend']}},
+    ]}
+
+
+def get_parser_pool():
+    """Return the process-wide pool, starting and warming every worker on first use"""
+    global _pool, _pid_queue
+    with _pool_lock:
+        if _pool is None:
+            config = _parser_settings()
+            _pid_queue = multiprocessing.Queue()
+            pool = ProcessPoolExecutor(
+                max_workers=config['workers'],
+                initializer=_init_worker,
+                initargs=(config['parser_path'], _pid_queue)
+            )
+            # One trivial task per worker forces them all to start and import the parser now
+            for future in [pool.submit(_warm) for _ in range(config['workers'])]:
+                future.result()
+            _pool = pool
+        return _pool
+
+
+def _drain_worker_pids():
+    while _pid_queue is not None:
+        try:
+            _worker_pids.add(_pid_queue.get_nowait())
+        except queue.Empty:
+            break
+
+
+def reset_parser_pool():
+    """Tear down the pool, killing any worker stuck on a document"""
+    global _pool, _pid_queue
+    with _pool_lock:
+        pool, _pool = _pool, None
+        if pool is None:
+            return
+        _drain_worker_pids()
+        pids, pid_queue = set(_worker_pids), _pid_queue
+        _worker_pids.clear()
+        _pid_queue = None
+    pool.shutdown(wait=False, cancel_futures=True)
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            # Already gone
+            pass
+    pid_queue.close()
+
+
+def warm_parser_pool():
+    """Pre-fork the pool at server start-up so the first upload does not pay for it"""
+    try:
+        get_parser_pool()
+    except Exception as e:
+        logger.exception('Resume parser pool could not be started')
+
+
+def parse_resume(path, file_extension):
+    """
+    Parse the resume file at a local `path` in the pool and map the result to the
+    candidate schema. Only the path crosses to the worker, which reads the file itself.
+    """
+    time_limit = _parser_settings()['time_limit']
+    try:
+        future = get_parser_pool().submit(_parse_document, path, file_extension, time_limit)
+        raw = future.result(timeout=time_limit + TIMEOUT_GRACE)
+    except FutureTimeoutError:
+        reset_parser_pool()
+        raise ResumeParseError('Parsing exceeded the per-document time limit')
+    except BrokenProcessPool as e:
+        reset_parser_pool()
+        raise ResumeParseError(f'Parser worker crashed: {e}')
+    except ResumeParseError:
+        raise
+    except Exception as e:
+        raise ResumeParseError(str(e))
+
+    return build_parsed_data(raw)
+
+
+def build_parsed_data(raw):
+    """Map regex parser output onto the fields stored on candidate documents"""
+    contact = raw.get('contact', {})
+    name_parts = contact.get('name', '').split()
+
+    experience = [
+        {
+            'title': entry.get('job_title', ''),
+            'company': entry.get('company_name', ''),
+            'duration': entry.get('dates', ''),
+            'location': entry.get('location', ''),
+            'description': ' '.join(entry.get('responsibilities', []))
+        }
+        for entry in raw.get('experience', [])
+    ]
+    education = [
+        {
+            'degree': entry.get('degree', ''),
+            'field': entry.get('major', ''),
+            'university': entry.get('university', ''),
+            'year': int(entry['year']) if str(entry.get('year', '')).isdigit() else entry.get('year', '')
+        }
+        for entry in raw.get('education', [])
+    ]
+
+    # Completeness of the extracted profile, as a 0-100 quality score
+    found = [
+        contact.get('email'), contact.get('phone'), raw.get('summary'),
+        raw.get('skills'), experience, education
+    ]
+    quality_score = round(100 * sum(1 for value in found if value) / len(found))
+
+    return {
+        'first_name': name_parts[0].title() if name_parts else '',
+        'last_name': ' '.join(name_parts[1:]).title(),
+        'email': contact.get('email', ''),
+        'phone': contact.get('phone', ''),
+        'location': '',
+        'linkedin_url': contact.get('linkedin_url', ''),
+        'experience': experience,
+        'education': education,
+        'skills': raw.get('skills', []),
+        'certifications': [],
+        'summary': raw.get('summary', ''),
+        'ai_score': 0,  # Set by job matching, not by parsing
+        'quality_score': quality_score
+    }
@@ -0,0 +1,147 @@
+"""
+Candidate pipeline stages.
+
+The current stage is kept on the candidate (`status`, `stage_entered_at`,
+`stage_details`) so the interviews and offers pages are plain indexed reads.
+Every move is also appended to the stage_events collection, which is never
+updated, and folded into the dashboard rollups (stage entries, time spent in
+the stage being left, hires, first entries), so funnel figures are read, not
+computed.
+"""
+import logging
+from datetime import datetime
+from pymongo import ReturnDocument
+from .rollup_utils import record_status_change
+from .search_index import update_candidate_fields
+
+logger = logging.getLogger(__name__)
+
+STAGE_EVENTS_COLLECTION = 'stage_events'
+
+# Funnel order; rejected can be reached from any stage
+PIPELINE_STAGES = ['new', 'screening', 'interview', 'offer', 'hired']
+CLOSED_STAGES = ['rejected']
+STAGES = PIPELINE_STAGES + CLOSED_STAGES
+
+# Details a recruiter may attach when moving a candidate into a stage
+STAGE_DETAIL_FIELDS = {
+    'interview': ['interview_date', 'interviewer', 'location'],
+    'offer': ['job_title', 'salary', 'start_date'],
+    'rejected': ['reason'],
+}
+
+_DAY = 86400
+
+
+class PipelineError(ValueError):
+    """Raised when a stage change is not possible"""
+
+
+def _days(delta):
+    return round(delta.total_seconds() / _DAY, 4)
+
+
+def move_candidate(candidate_collection, events_collection, rollup_collection,
+                   candidate_id, stage, changed_by, details=None, note=''):
+    """
+    Move a candidate to a stage. The candidate update is atomic and returns the
+    previous stage, so two recruiters moving the same candidate record two
+    distinct transitions. Returns the event that was appended.
+    """
+    if stage not in STAGES:
+        raise PipelineError(f'Unknown stage "{stage}"')
+    details = {
+        key: value for key, value in (details or {}).items()
+        if key in STAGE_DETAIL_FIELDS.get(stage, []) and value not in (None, '')
+    }
+
+    now = datetime.now()
+    previous = candidate_collection.find_one_and_update(
+        {'_id': candidate_id, 'status': {'$ne': stage}},
+        {'$set': {
+            'status': stage,
+            'stage_entered_at': now,
+            'stage_details': details,
+            'last_updated': now,
+            'updated_by': changed_by,
+        }},
+        projection={'status': 1, 'stage_entered_at': 1, 'created_date': 1, 'department': 1, 'source': 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        if candidate_collection.count_documents({'_id': candidate_id}, limit=1):
+            raise PipelineError(f'Candidate is already in stage "{stage}"')
+        raise PipelineError('Candidate not found')
+
+    from_stage = previous.get('status') or 'new'
+    entered_at = previous.get('stage_entered_at') or previous.get('created_date') or now
+    event = {
+        'candidate_id': candidate_id,
+        'from_stage': from_stage,
+        'to_stage': stage,
+        'changed_at': now,
+        'changed_by': changed_by,
+        'details': details,
+        'note': note,
+        'department': previous.get('department', ''),
+        'source': previous.get('source', ''),
+        'time_in_stage_days': _days(now - entered_at),
+    }
+    if stage == 'hired' and previous.get('created_date'):
+        event['days_to_hire'] = _days(now - previous['created_date'])
+    # Checked before this move's event exists: the funnel counts each candidate once per stage
+    first_entry = not events_collection.count_documents({'candidate_id': candidate_id, 'to_stage': stage}, limit=1)
+    events_collection.insert_one(event)
+
+    record_status_change(rollup_collection, previous, from_stage, stage, when=now,
+                         time_in_stage_days=event['time_in_stage_days'], days_to_hire=event.get('days_to_hire'),
+                         first_entry=first_entry)
+    try:
+        update_candidate_fields(candidate_id, status=stage)
+    except Exception as e:
+        logger.exception('Error updating search index status for candidate %s', candidate_id)
+    return event
+
+
+def stage_candidates(candidate_collection, stages, limit=100):
+    """Candidates currently in the given stages, most recently moved first"""
+    return list(candidate_collection.find(
+        {'status': {'$in': list(stages)}},
+        {'first_name': 1, 'last_name': 1, 'email': 1, 'job_title_applied': 1, 'status': 1,
+         'stage_entered_at': 1, 'stage_details': 1}
+    ).sort('stage_entered_at', -1).limit(limit))
+
+
+def funnel_metrics(totals):
+    """
+    Per-stage funnel from the all-time rollup document: how many distinct
+    candidates ever entered the stage, how many are in it now, conversion from
+    the previous stage and the average days spent in it before moving on.
+    """
+    reached = totals.get('reached', {})
+    current = totals.get('status', {})
+    stage_time = totals.get('stage_time', {})
+    stage_exits = totals.get('stage_exits', {})
+
+    funnel = []
+    previous_count = None
+    for stage in PIPELINE_STAGES:
+        count = totals.get('candidates', 0) if stage == 'new' else reached.get(stage, 0)
+        funnel.append({
+            'stage': stage,
+            'entered': count,
+            'current': current.get(stage, 0),
+            'conversion': round(count / previous_count * 100, 1) if previous_count else None,
+            'avg_days_in_stage': (
+                round(stage_time.get(stage, 0) / stage_exits[stage], 1) if stage_exits.get(stage) else None
+            ),
+        })
+        previous_count = count
+    funnel.append({
+        'stage': 'rejected',
+        'entered': reached.get('rejected', 0),
+        'current': current.get('rejected', 0),
+        'conversion': None,
+        'avg_days_in_stage': None,
+    })
+    return funnel
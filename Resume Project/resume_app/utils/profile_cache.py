@@ -0,0 +1,93 @@
+"""
+Read-through cache of users' resume_login profiles.
+
+Pages and the template context share one cached, projected copy of the
+profile instead of each reading the full document (or a session copy made at
+login that goes stale). Entries expire after PROFILE_CACHE_TIMEOUT seconds,
+and every writer of a cached field calls invalidate_profile() right after its
+update so the next read is fresh.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+# Fields of resume_login that pages and templates read; secrets such as
+# password_hash and verification codes are never cached
+PROFILE_FIELDS = [
+    'username', 'email', 'first_name', 'last_name', 'full_name', 'company', 'role',
+    'profile', 'permissions', 'preferences',
+    'verification.identity_document_type', 'verification.identity_status',
+    'verification.two_factor_enabled', 'verification.two_factor_setup_date',
+]
+PROFILE_PROJECTION = {field: 1 for field in PROFILE_FIELDS}
+
+# Shown on the settings page only, and read from Mongo each time it renders
+VERIFICATION_SECRET_FIELDS = ['identity_document_number', 'two_factor_backup_codes']
+
+
+def _cache_key(username):
+    return f'user_profile:{username}'
+
+
+def _project(user_data):
+    """Keep only PROFILE_FIELDS of a document that may have been read with a wider projection"""
+    projected = {}
+    for field in PROFILE_FIELDS:
+        source, target = user_data, projected
+        *parents, leaf = field.split('.')
+        for parent in parents:
+            source = source.get(parent) if isinstance(source, dict) else None
+            target = target.setdefault(parent, {})
+        if isinstance(source, dict) and leaf in source:
+            target[leaf] = source[leaf]
+    return projected
+
+
+def cache_profile(username, user_data):
+    profile = _project(user_data)
+    cache.set(_cache_key(username), profile, getattr(settings, 'PROFILE_CACHE_TIMEOUT', 300))
+    return profile
+
+
+async def acache_profile(username, user_data):
+    profile = _project(user_data)
+    await cache.aset(_cache_key(username), profile, getattr(settings, 'PROFILE_CACHE_TIMEOUT', 300))
+    return profile
+
+
+def get_profile(username, get_collection):
+    """Cached profile, read from Mongo on a miss; None if the user has no resume_login document"""
+    profile = cache.get(_cache_key(username))
+    if profile is None:
+        user_data = get_collection().find_one({'username': username}, PROFILE_PROJECTION)
+        if user_data is None:
+            return None
+        profile = cache_profile(username, user_data)
+    return profile
+
+
+async def aget_profile(username, collection):
+    """get_profile for async views; `collection` is an async resume_login collection"""
+    profile = await cache.aget(_cache_key(username))
+    if profile is None:
+        user_data = await collection.find_one({'username': username}, PROFILE_PROJECTION)
+        if user_data is None:
+            return None
+        profile = await acache_profile(username, user_data)
+    return profile
+
+
+async def aget_verification_secrets(username, collection):
+    """{field: value} of VERIFICATION_SECRET_FIELDS, read uncached"""
+    user_data = await collection.find_one(
+        {'username': username}, {f'verification.{field}': 1 for field in VERIFICATION_SECRET_FIELDS}
+    )
+    verification = (user_data or {}).get('verification') or {}
+    return {field: verification[field] for field in VERIFICATION_SECRET_FIELDS if field in verification}
+
+
+def invalidate_profile(username):
+    cache.delete(_cache_key(username))
+
+
+async def ainvalidate_profile(username):
+    await cache.adelete(_cache_key(username))
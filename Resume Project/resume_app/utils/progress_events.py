@@ -0,0 +1,166 @@
+"""
+Live upload progress and dashboard deltas, pushed as server-sent events.
+
+The upload pipeline publishes a state change per file (stored, parsing,
+deduplicated, near_duplicate, completed, failed) on its recruiter's channel, and every
+rollup write publishes its counter increments on a shared channel. Each
+open page holds one EventSource connection to api/events/.
+
+The broker fans events out in-process: an event is formatted once and handed
+to the bounded queue of every subscriber of its channel, so publishing never
+waits on a slow client and thousands of idle streams cost one queue each.
+Under ASGI the streams are coroutines on the worker's event loop; under WSGI
+each stream holds a thread. Subscribers only see events published in their
+own process, so run a single ASGI worker (or route a user's requests to one
+worker) for uploads to be seen by every tab.
+"""
+import asyncio
+import itertools
+import json
+import queue
+import threading
+from collections import defaultdict, deque
+from django.conf import settings
+
+ROLLUP_CHANNEL = 'rollups'
+
+KEEPALIVE = b': keepalive\n\n'
+# Sent when a subscriber fell behind and events were dropped: the page reloads its state
+RESYNC = b'event: resync\ndata: {}\n\n'
+
+
+def user_channel(username):
+    return f'user:{username}'
+
+
+def _format(event_id, event_type, data):
+    return f'id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n'.encode()
+
+
+class Subscription:
+    """Bounded queue of formatted events for one stream"""
+
+    def __init__(self, channels, maxsize, asynchronous):
+        self.channels = channels
+        self.overflowed = False
+        # Publishers run on request and worker threads; async queues are only
+        # touched from their own loop
+        self._loop = asyncio.get_running_loop() if asynchronous else None
+        self._queue = asyncio.Queue(maxsize) if asynchronous else queue.Queue(maxsize)
+
+    def deliver(self, message):
+        if self._loop is None:
+            self._put(message)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The stream's loop is gone; it unsubscribes as it closes
+            pass
+
+    def _put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except (asyncio.QueueFull, queue.Full):
+            self.overflowed = True
+
+    async def aget(self, timeout):
+        """Next message, KEEPALIVE after `timeout` seconds of silence or RESYNC after an overflow"""
+        if self.overflowed:
+            self.overflowed = False
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return KEEPALIVE
+
+    def get(self, timeout):
+        if self.overflowed:
+            self.overflowed = False
+            return RESYNC
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return KEEPALIVE
+
+
+class EventBroker:
+    def __init__(self, history_size=200, queue_size=256):
+        self.queue_size = queue_size
+        self._ids = itertools.count(1)
+        self._subscribers = defaultdict(set)
+        # Recent events per channel, replayed to a client reconnecting with Last-Event-ID
+        self._history = defaultdict(lambda: deque(maxlen=history_size))
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event_type, data):
+        with self._lock:
+            event_id = next(self._ids)
+            message = _format(event_id, event_type, data)
+            self._history[channel].append((event_id, message))
+            subscribers = tuple(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+        return event_id
+
+    def subscribe(self, channels, last_event_id=None, asynchronous=True):
+        subscription = Subscription(tuple(channels), self.queue_size, asynchronous)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+            if last_event_id is not None:
+                # Replayed under the lock so nothing published meanwhile can overtake it
+                missed = sorted(
+                    event for channel in subscription.channels
+                    for event in self._history.get(channel, ()) if event[0] > last_event_id
+                )
+                for _, message in missed:
+                    subscription.deliver(message)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+
+broker = EventBroker()
+
+
+def _heartbeat():
+    return getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+
+
+async def aevent_stream(subscription):
+    """SSE body for an ASGI response; unsubscribes when the client goes away"""
+    try:
+        yield b'retry: 3000\n\n'
+        while True:
+            yield await subscription.aget(_heartbeat())
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def event_stream(subscription):
+    """SSE body for a WSGI response, holding its thread while the client is connected"""
+    try:
+        yield b'retry: 3000\n\n'
+        while True:
+            yield subscription.get(_heartbeat())
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def publish_file_state(username, batch_id, index, filename, state, **details):
+    broker.publish(user_channel(username), 'file', {
+        'batch_id': batch_id, 'index': index, 'filename': filename, 'state': state, **details
+    })
+
+
+def publish_rollup_delta(increments):
+    """Counter increments applied to the all-time rollup totals"""
+    broker.publish(ROLLUP_CHANNEL, 'rollup', increments)
@@ -0,0 +1,345 @@
+"""
+Dashboard figures kept as pre-aggregated rollup documents.
+
+Every candidate and upload write increments counters in a handful of
+documents: the all-time totals, the current month and ISO week, and a daily
+document per department, source and status (the stage a candidate was created
+in or moved to, or an upload's outcome). Candidates and uploads carry no
+company, so there is no per-company split. `entered.<stage>` counts moves into
+a stage, `reached.<stage>` the distinct candidates that ever entered it.
+The dashboard reads the few documents it needs by _id instead of scanning
+candidates and uploads, so its cost does not grow with the data.
+`manage.py rebuild_dashboard_rollups` recomputes them all.
+"""
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from .progress_events import publish_rollup_delta
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = 'dashboard_rollups'
+
+TOTALS_ID = 'all'
+
+# Display names for candidate sources on the dashboard chart
+SOURCE_LABELS = {
+    'resume_upload': 'Resume Upload',
+    'linkedin': 'LinkedIn',
+    'job_board': 'Job Boards',
+    'referral': 'Referrals',
+    'website': 'Company Website',
+}
+
+
+def _key(value):
+    """Counter field name for a free-text value (dots and a leading $ are not allowed in Mongo keys)"""
+    value = str(value or 'unknown').replace('.', '_').lstrip('$')
+    return value or 'unknown'
+
+
+def week_id(when):
+    year, week, _ = when.isocalendar()
+    return f'week:{year}-W{week:02d}'
+
+
+def month_id(when):
+    return f'month:{when:%Y-%m}'
+
+
+def day_id(when, department, source, status):
+    return f'day:{when:%Y-%m-%d}|{_key(department)}|{_key(source)}|{_key(status)}'
+
+
+def _day_fields(when, department, source, status):
+    return {'day': f'{when:%Y-%m-%d}', 'department': department or '', 'source': source or '',
+            'status': status or ''}
+
+
+def _rollup_ops(when, department, source, status, increments, total_increments=None):
+    """Upserts applying increments to the totals, month, week and day documents for a write"""
+    ops = [
+        UpdateOne(
+            {'_id': rollup_id},
+            {'$inc': {**increments, **(total_increments or {})} if rollup_id == TOTALS_ID else increments},
+            upsert=True
+        )
+        for rollup_id in (TOTALS_ID, month_id(when), week_id(when))
+    ]
+    ops.append(UpdateOne(
+        {'_id': day_id(when, department, source, status)},
+        {'$inc': increments, '$setOnInsert': _day_fields(when, department, source, status)},
+        upsert=True
+    ))
+    return ops
+
+
+def _apply(rollup_collection, ops):
+    """Rollups never fail the caller's write; a rebuild repairs any missed increments"""
+    try:
+        rollup_collection.bulk_write(ops, ordered=False)
+    except Exception as e:
+        logger.exception('Error updating dashboard rollups')
+
+
+def candidate_increments(candidate, entered_stage=None):
+    """Counters for a new candidate; entered_stage overrides the stage it is counted as entering"""
+    status = _key(candidate.get('status') or 'new')
+    return {
+        'candidates': 1,
+        f"by_source.{_key(candidate.get('source'))}": 1,
+        f"by_department.{_key(candidate.get('department'))}": 1,
+        f'entered.{_key(entered_stage) if entered_stage else status}': 1,
+    }, {f'status.{status}': 1}
+
+
+def upload_increments(upload):
+    increments = {
+        'uploads': 1,
+        f"upload_status.{_key(upload.get('status'))}": 1,
+        'processing_time': float(upload.get('processing_time') or 0),
+    }
+    if upload.get('is_duplicate'):
+        increments['uploads_duplicate'] = 1
+    return increments
+
+
+def record_candidate_created(rollup_collection, candidate):
+    increments, total_increments = candidate_increments(candidate)
+    _apply(rollup_collection, _rollup_ops(
+        candidate.get('created_date') or datetime.now(),
+        candidate.get('department'), candidate.get('source'), candidate.get('status') or 'new',
+        increments, total_increments
+    ))
+    publish_rollup_delta({**increments, **total_increments})
+
+
+def record_upload(rollup_collection, upload):
+    increments = upload_increments(upload)
+    _apply(rollup_collection, _rollup_ops(
+        upload.get('upload_date') or datetime.now(),
+        upload.get('department'), 'resume_upload', upload.get('status'), increments
+    ))
+    publish_rollup_delta(increments)
+
+
+def stage_change_increments(old_status, new_status, time_in_stage_days=None, days_to_hire=None,
+                            first_entry=False):
+    increments = {f'entered.{_key(new_status)}': 1}
+    if first_entry:
+        increments[f'reached.{_key(new_status)}'] = 1
+    if old_status and time_in_stage_days is not None:
+        increments[f'stage_time.{_key(old_status)}'] = time_in_stage_days
+        increments[f'stage_exits.{_key(old_status)}'] = 1
+    if new_status == 'hired' and days_to_hire is not None:
+        increments['hires'] = 1
+        increments['hire_days'] = days_to_hire
+    return increments
+
+
+def record_status_change(rollup_collection, candidate, old_status, new_status, when=None, time_in_stage_days=None,
+                         days_to_hire=None, first_entry=False):
+    """
+    Move a candidate between status counters; hires also add to time-to-hire
+    totals. first_entry marks the candidate's first move into new_status.
+    """
+    if old_status == new_status:
+        return
+    when = when or datetime.now()
+    increments = stage_change_increments(old_status, new_status, time_in_stage_days, days_to_hire, first_entry)
+    total_increments = {f'status.{_key(new_status)}': 1}
+    if old_status:
+        total_increments[f'status.{_key(old_status)}'] = -1
+    _apply(rollup_collection, _rollup_ops(
+        when, candidate.get('department'), candidate.get('source'), new_status, increments, total_increments
+    ))
+    publish_rollup_delta({**increments, **total_increments})
+
+
+def load_rollups(rollup_collection, now=None):
+    """Totals plus this month, last month and this week, in one _id lookup"""
+    now = now or datetime.now()
+    ids = {
+        'all': TOTALS_ID,
+        'month': month_id(now),
+        'last_month': month_id(now.replace(day=1) - timedelta(days=1)),
+        'week': week_id(now),
+    }
+    found = {doc['_id']: doc for doc in rollup_collection.find({'_id': {'$in': list(ids.values())}})}
+    return {name: found.get(rollup_id, {}) for name, rollup_id in ids.items()}
+
+
+def _change(current, previous, suffix='this month'):
+    if not previous:
+        return f'+{current} {suffix}' if current else f'No change {suffix}'
+    change = round((current - previous) / previous * 100)
+    return f'{change:+d}% {suffix}'
+
+
+def _average_days(doc):
+    return doc.get('hire_days', 0) / doc['hires'] if doc.get('hires') else None
+
+
+def dashboard_metrics(rollups):
+    """Template context for the dashboard from load_rollups() output"""
+    totals, month, last_month = rollups.get('all', {}), rollups.get('month', {}), rollups.get('last_month', {})
+    entered, reached = totals.get('entered', {}), totals.get('reached', {})
+
+    time_to_hire = _average_days(totals)
+    month_days, last_month_days = _average_days(month), _average_days(last_month)
+    offers = reached.get('offer', 0)
+    applied = totals.get('candidates', 0)
+    pipeline = {
+        'applied': applied,
+        'interviewed': reached.get('interview', 0),
+        'hired': reached.get('hired', 0),
+    }
+
+    sources = sorted(totals.get('by_source', {}).items(), key=lambda item: item[1], reverse=True)
+    return {
+        'total_candidates': applied,
+        'candidates_change': _change(month.get('candidates', 0), last_month.get('candidates', 0)),
+        'time_to_hire': f'{round(time_to_hire)} days' if time_to_hire is not None else 'N/A',
+        'time_to_hire_change': (
+            _change(round(month_days), round(last_month_days))
+            if month_days is not None and last_month_days else 'No hires yet this month'
+        ),
+        'offer_acceptance_rate': f"{round(reached.get('hired', 0) / offers * 100)}%" if offers else 'N/A',
+        'offers_this_month': month.get('entered', {}).get('offer', 0),
+        'interviews_this_week': rollups.get('week', {}).get('entered', {}).get('interview', 0),
+        'source_labels': [SOURCE_LABELS.get(source, source.replace('_', ' ').title()) for source, _ in sources],
+        'source_data': [count for _, count in sources],
+        'pipeline': pipeline,
+        'pipeline_percent': {
+            stage: round(count / applied * 100) if applied else 0 for stage, count in pipeline.items()
+        },
+    }
+
+
+def _nest(flat):
+    """{'a.b': 1} -> {'a': {'b': 1}}"""
+    nested = {}
+    for path, value in flat.items():
+        target = nested
+        *parents, leaf = path.split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return nested
+
+
+def rebuild_rollups(candidate_collection, upload_collection, rollup_collection, events_collection=None):
+    """
+    Recompute every rollup document from candidates, uploads and stage events,
+    write them to a scratch collection and swap it in. Returns the number of
+    documents.
+    """
+    counters = defaultdict(Counter)
+    day_fields = {}
+
+    def add(when, department, source, status, increments, total_increments=None):
+        counters[TOTALS_ID].update({**increments, **(total_increments or {})})
+        if when is None:
+            return
+        for rollup_id in (month_id(when), week_id(when)):
+            counters[rollup_id].update(increments)
+        rollup_id = day_id(when, department, source, status)
+        counters[rollup_id].update(increments)
+        day_fields[rollup_id] = _day_fields(when, department, source, status)
+
+    def day_of(value):
+        return datetime.strptime(value, '%Y-%m-%d') if value else None
+
+    candidate_groups = candidate_collection.aggregate([
+        {'$group': {
+            '_id': {
+                'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$created_date'}},
+                'department': '$department', 'source': '$source', 'status': '$status'
+            },
+            'count': {'$sum': 1}
+        }}
+    ], allowDiskUse=True)
+    for group in candidate_groups:
+        key = group['_id']
+        # Every candidate enters the funnel as new; later stages come from the events
+        increments, total_increments = candidate_increments(key, entered_stage='new')
+        add(day_of(key.get('day')), key.get('department'), key.get('source'), 'new',
+            {field: value * group['count'] for field, value in increments.items()},
+            {field: value * group['count'] for field, value in total_increments.items()})
+
+    upload_groups = upload_collection.aggregate([
+        {'$group': {
+            '_id': {
+                'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$upload_date'}},
+                'department': '$department', 'status': '$status', 'is_duplicate': '$is_duplicate'
+            },
+            'count': {'$sum': 1},
+            'processing_time': {'$sum': '$processing_time'}
+        }}
+    ], allowDiskUse=True)
+    for group in upload_groups:
+        key = group['_id']
+        increments = {field: value * group['count'] for field, value in upload_increments(key).items()}
+        increments['processing_time'] = float(group.get('processing_time') or 0)
+        add(day_of(key.get('day')), key.get('department'), 'resume_upload', key.get('status'), increments)
+
+    event_groups = events_collection.aggregate([
+        {'$group': {
+            '_id': {
+                'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$changed_at'}},
+                'department': '$department', 'source': '$source',
+                'from_stage': '$from_stage', 'to_stage': '$to_stage'
+            },
+            'count': {'$sum': 1},
+            'time_in_stage_days': {'$sum': '$time_in_stage_days'},
+            'days_to_hire': {'$sum': '$days_to_hire'},
+            'hires': {'$sum': {'$cond': [{'$gt': ['$days_to_hire', None]}, 1, 0]}}
+        }}
+    ], allowDiskUse=True) if events_collection is not None else []
+    for group in event_groups:
+        key = group['_id']
+        increments = {
+            field: value * group['count']
+            for field, value in stage_change_increments(key.get('from_stage'), key.get('to_stage'), 0).items()
+        }
+        increments[f"stage_time.{_key(key.get('from_stage'))}"] = group['time_in_stage_days']
+        if group['hires']:
+            increments['hires'] = group['hires']
+            increments['hire_days'] = group['days_to_hire']
+        add(day_of(key.get('day')), key.get('department'), key.get('source'), key.get('to_stage'), increments)
+
+    # A candidate counts towards reached.<stage> once, on the day it first entered the stage
+    first_entry_groups = events_collection.aggregate([
+        {'$group': {
+            '_id': {'candidate_id': '$candidate_id', 'to_stage': '$to_stage'},
+            'changed_at': {'$min': '$changed_at'},
+            'department': {'$first': '$department'},
+            'source': {'$first': '$source'}
+        }},
+        {'$group': {
+            '_id': {
+                'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$changed_at'}},
+                'department': '$department', 'source': '$source', 'to_stage': '$_id.to_stage'
+            },
+            'count': {'$sum': 1}
+        }}
+    ], allowDiskUse=True) if events_collection is not None else []
+    for group in first_entry_groups:
+        key = group['_id']
+        add(day_of(key.get('day')), key.get('department'), key.get('source'), key.get('to_stage'),
+            {f"reached.{_key(key.get('to_stage'))}": group['count']})
+
+    scratch = rollup_collection.database[f'{rollup_collection.name}_rebuild']
+    scratch.drop()
+    documents = [
+        {'_id': rollup_id, **day_fields.get(rollup_id, {}), **_nest(dict(values))}
+        for rollup_id, values in counters.items()
+    ]
+    if documents:
+        scratch.insert_many(documents)
+        scratch.create_index([('day', 1), ('department', 1)])
+        scratch.rename(rollup_collection.name, dropTarget=True)
+    else:
+        rollup_collection.delete_many({})
+    return len(documents)
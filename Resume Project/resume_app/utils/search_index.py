@@ -0,0 +1,304 @@
+"""
+Local full-text index over parsed candidate fields, stored in an SQLite FTS5
+database next to the project. FTS5 provides the inverted index, BM25 ranking
+and snippets; Mongo stays the source of truth and the index is refreshed on
+upload or rebuilt with `manage.py rebuild_search_index`.
+"""
+import html
+import logging
+import re
+import sqlite3
+import threading
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Searchable columns and their BM25 weights (a skill hit outranks a summary hit)
+SEARCH_FIELDS = {
+    'name': 2.0,
+    'skills': 3.0,
+    'experience': 1.5,
+    'education': 1.0,
+    'summary': 1.0,
+}
+
+# Columns of candidate_docs kept in step with Mongo for filtered searches
+FILTER_COLUMNS = ('status', 'department', 'ai_score')
+
+# Markers placed by FTS5 around matches, swapped for <mark> after HTML escaping
+_HIT_START, _HIT_END = '\x02', '\x03'
+
+_QUERY_TOKEN = re.compile(r'(-)?(?:(\w+):)?("[^"]*"|[^\s"]+)')
+
+_local = threading.local()
+
+
+class InvalidSearch(ValueError):
+    """Raised when a search query has no usable terms"""
+
+
+def _index_path():
+    return str(getattr(settings, 'SEARCH_INDEX_PATH', None) or settings.BASE_DIR / 'search_index.sqlite3')
+
+
+def get_connection(path=None):
+    """Per-thread connection; the schema is created on first use"""
+    path = path or _index_path()
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    if path not in connections:
+        connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        create_schema(connection)
+        connections[path] = connection
+    return connections[path]
+
+
+def create_schema(connection):
+    columns = ', '.join(SEARCH_FIELDS)
+    connection.executescript(f'''
+        CREATE TABLE IF NOT EXISTS candidate_docs (
+            rowid INTEGER PRIMARY KEY,
+            candidate_id TEXT UNIQUE NOT NULL,
+            status TEXT,
+            department TEXT,
+            ai_score REAL
+        );
+        CREATE INDEX IF NOT EXISTS candidate_docs_status ON candidate_docs (status);
+        CREATE INDEX IF NOT EXISTS candidate_docs_department ON candidate_docs (department);
+        CREATE VIRTUAL TABLE IF NOT EXISTS candidate_fts USING fts5(
+            {columns}, tokenize = 'porter unicode61'
+        );
+    ''')
+
+
+def candidate_text(candidate):
+    """Searchable text for each indexed field of a candidate document"""
+    return {
+        'name': f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip(),
+        'skills': ' ; '.join(candidate.get('skills') or []),
+        'experience': ' ; '.join(
+            ' '.join(str(entry.get(key) or '') for key in ('title', 'company', 'description'))
+            for entry in candidate.get('experience') or []
+        ),
+        'education': ' ; '.join(
+            ' '.join(str(entry.get(key) or '') for key in ('degree', 'field', 'university'))
+            for entry in candidate.get('education') or []
+        ),
+        'summary': candidate.get('summary') or '',
+    }
+
+
+def index_candidates(candidates, connection=None):
+    """Insert or replace candidates in the index in a single transaction"""
+    connection = connection or get_connection()
+    placeholders = ', '.join('?' for _ in SEARCH_FIELDS)
+    with connection:
+        for candidate in candidates:
+            candidate_id = str(candidate['_id'])
+            connection.execute(
+                'INSERT INTO candidate_docs (candidate_id, status, department, ai_score) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(candidate_id) DO UPDATE SET status = excluded.status, '
+                'department = excluded.department, ai_score = excluded.ai_score',
+                (candidate_id, candidate.get('status', ''), candidate.get('department', ''),
+                 candidate.get('ai_score', 0))
+            )
+            rowid = connection.execute(
+                'SELECT rowid FROM candidate_docs WHERE candidate_id = ?', (candidate_id,)
+            ).fetchone()[0]
+            text = candidate_text(candidate)
+            connection.execute('DELETE FROM candidate_fts WHERE rowid = ?', (rowid,))
+            connection.execute(
+                f'INSERT INTO candidate_fts (rowid, {", ".join(SEARCH_FIELDS)}) VALUES (?, {placeholders})',
+                (rowid, *(text[field] for field in SEARCH_FIELDS))
+            )
+
+
+def index_candidate(candidate):
+    """Refresh one candidate; indexing problems never fail the caller's write"""
+    try:
+        index_candidates([candidate])
+    except Exception as e:
+        logger.exception('Error updating search index for candidate %s', candidate.get('_id'))
+
+
+def update_candidate_fields(candidate_id, **fields):
+    """Update the filter columns (status, department, ai_score) without re-indexing text"""
+    allowed = {key: value for key, value in fields.items() if key in FILTER_COLUMNS}
+    if not allowed:
+        return
+    assignments = ', '.join(f'{key} = ?' for key in allowed)
+    connection = get_connection()
+    with connection:
+        connection.execute(
+            f'UPDATE candidate_docs SET {assignments} WHERE candidate_id = ?',
+            (*allowed.values(), str(candidate_id))
+        )
+
+
+def update_candidates_field(field, values):
+    """Set one filter column for many candidates in a single transaction; values are (candidate_id, value) pairs"""
+    if field not in FILTER_COLUMNS:
+        raise ValueError(f'{field} is not a filter column')
+    connection = get_connection()
+    with connection:
+        connection.executemany(
+            f'UPDATE candidate_docs SET {field} = ? WHERE candidate_id = ?',
+            ((value, str(candidate_id)) for candidate_id, value in values)
+        )
+
+
+def _quote(term):
+    prefix = term.endswith('*') and not term.startswith('"')
+    term = term.strip('"').rstrip('*')
+    quoted = '"' + term.replace('"', '""') + '"'
+    return quoted + '*' if prefix else quoted
+
+
+def build_match_query(query):
+    """
+    Translate a recruiter query into FTS5 syntax. Supports quoted phrases,
+    prefix terms (pyth*), AND/OR, -term or NOT term exclusions and
+    field:term restrictions on name/skills/experience/education/summary.
+    """
+    required, excluded = [], []
+    negate_next = False
+    for match in _QUERY_TOKEN.finditer(query):
+        minus, field, term = match.groups()
+        if field is None and term in ('AND', 'OR'):
+            if required and required[-1] not in ('AND', 'OR'):
+                required.append(term)
+            continue
+        if field is None and term == 'NOT':
+            negate_next = True
+            continue
+        if not term.strip('"*'):
+            continue
+
+        expression = _quote(term)
+        if field in SEARCH_FIELDS:
+            expression = f'{field} : {expression}'
+        if minus or negate_next:
+            excluded.append(expression)
+        else:
+            required.append(expression)
+        negate_next = False
+
+    while required and required[-1] in ('AND', 'OR'):
+        required.pop()
+    if not required:
+        raise InvalidSearch('Search needs at least one term to match')
+
+    expression = ' '.join(required)
+    for term in excluded:
+        expression = f'{expression} NOT {term}'
+    return expression
+
+
+def _highlight(snippet):
+    return html.escape(snippet).replace(_HIT_START, '<mark>').replace(_HIT_END, '</mark>')
+
+
+def _restrict_to(connection, candidate_ids):
+    """
+    Stream the IDs a search is limited to into this connection's temporary
+    table; returns False if there were none
+    """
+    connection.execute('CREATE TEMP TABLE IF NOT EXISTS search_scope (candidate_id TEXT PRIMARY KEY)')
+    with connection:
+        connection.execute('DELETE FROM search_scope')
+        connection.executemany(
+            'INSERT OR IGNORE INTO search_scope (candidate_id) VALUES (?)',
+            ((str(candidate_id),) for candidate_id in candidate_ids)
+        )
+    return connection.execute('SELECT 1 FROM search_scope LIMIT 1').fetchone() is not None
+
+
+def search_candidates(query, status=None, department=None, min_score=None, max_score=None,
+                      candidate_ids=None, limit=20, offset=0, connection=None):
+    """
+    (results, truncated): BM25-ranked candidates matching the query, with
+    highlighted snippets. `candidate_ids` (any iterable, streamed into SQLite)
+    limits the search to candidates that passed filters the index does not
+    hold. Scoring cost grows with the number of matches, so very broad queries
+    are ranked over the newest SEARCH_MAX_RANKED candidates that match the
+    query and pass the filters; `truncated` says older matches were left out.
+    """
+    connection = connection or get_connection()
+    match = build_match_query(query)
+    max_ranked = getattr(settings, 'SEARCH_MAX_RANKED', 20000)
+
+    filters = ''
+    filter_params = []
+    if status:
+        filters += ' AND d.status = ?'
+        filter_params.append(status)
+    if department:
+        filters += ' AND d.department = ?'
+        filter_params.append(department)
+    if min_score is not None:
+        filters += ' AND d.ai_score >= ?'
+        filter_params.append(min_score)
+    if max_score is not None:
+        filters += ' AND d.ai_score <= ?'
+        filter_params.append(max_score)
+    if candidate_ids is not None:
+        filters += ' AND d.candidate_id IN (SELECT candidate_id FROM search_scope)'
+
+    try:
+        if candidate_ids is not None and not _restrict_to(connection, candidate_ids):
+            return [], False
+
+        # Lowest rowid (oldest candidate) still inside the ranking window, found by a rowid-ordered
+        # seek over the matches that pass the filters
+        cutoff = connection.execute(
+            f'SELECT f.rowid FROM candidate_fts f JOIN candidate_docs d ON d.rowid = f.rowid '
+            f'WHERE candidate_fts MATCH ?{filters} ORDER BY f.rowid DESC LIMIT 1 OFFSET ?',
+            (match, *filter_params, max_ranked)
+        ).fetchone()
+
+        weights = ', '.join(str(weight) for weight in SEARCH_FIELDS.values())
+        sql = (
+            f'SELECT f.rowid, d.candidate_id, d.status, d.department, d.ai_score, '
+            f'bm25(candidate_fts, {weights}) AS rank '
+            f'FROM candidate_fts f JOIN candidate_docs d ON d.rowid = f.rowid '
+            f'WHERE candidate_fts MATCH ?{filters}'
+        )
+        params = [match, *filter_params]
+        if cutoff:
+            sql += ' AND f.rowid > ?'
+            params.append(cutoff[0])
+        sql += ' ORDER BY rank LIMIT ? OFFSET ?'
+        params += [limit, offset]
+        rows = connection.execute(sql, params).fetchall()
+
+        # Names and snippets only for the page being returned
+        snippets = {}
+        if rows:
+            rowids = [row[0] for row in rows]
+            snippets = {
+                rowid: (name, snippet) for rowid, name, snippet in connection.execute(
+                    f"SELECT rowid, name, snippet(candidate_fts, -1, '{_HIT_START}', '{_HIT_END}', '…', 16) "
+                    f"FROM candidate_fts WHERE candidate_fts MATCH ? "
+                    f"AND rowid IN ({', '.join('?' for _ in rowids)})",
+                    (match, *rowids)
+                )
+            }
+    except sqlite3.OperationalError as e:
+        raise InvalidSearch(f'Could not parse search query: {e}')
+
+    results = []
+    for rowid, candidate_id, row_status, row_department, ai_score, rank in rows:
+        name, snippet = snippets.get(rowid, ('', ''))
+        results.append({
+            'candidate_id': candidate_id,
+            'name': name,
+            'status': row_status,
+            'department': row_department,
+            'ai_score': ai_score,
+            'score': round(-rank, 4),
+            'snippet': _highlight(snippet),
+        })
+    return results, cutoff is not None
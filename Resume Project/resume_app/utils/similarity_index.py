@@ -0,0 +1,423 @@
+"""
+"Similar candidates" search over hashed text embeddings.
+
+Each candidate's summary, skills and experience titles are turned into a
+fixed-size float32 vector with a signed hashing vectorizer (no model files,
+CPU only). Vectors live in a memory-mapped matrix on disk, grouped by IVF
+list: k-means centroids split the corpus into lists, and a query only scores
+the few lists whose centroids are closest to it.
+
+`manage.py build_similarity_index` writes a full build. Web processes map it
+read-only and keep candidates uploaded since the build in a small in-memory
+tail, assigned to the same lists, until the next build folds them in.
+"""
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 256
+
+# Field weights in the embedding: shared skills count most, then titles
+EMBEDDING_FIELDS = {
+    'skills': 3.0,
+    'titles': 2.0,
+    'summary': 1.0,
+}
+
+# Candidate fields needed to embed a candidate
+EMBEDDED_FIELDS = {'summary': 1, 'skills': 1, 'experience.title': 1}
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+_STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it of on or our the to we with you your will '
+    'this that who i my me am was were'.split()
+)
+
+_CURRENT = 'CURRENT'
+
+
+class IndexNotBuilt(Exception):
+    """Raised when no build_similarity_index output is on disk yet"""
+
+
+def _index_path():
+    return str(getattr(settings, 'SIMILARITY_INDEX_PATH', None) or settings.BASE_DIR / 'similarity_index')
+
+
+# --- embedding ----------------------------------------------------------
+
+@lru_cache(maxsize=200000)
+def _bucket(token):
+    """Column and sign of a token; the top hash bit picks the sign so collisions tend to cancel"""
+    hashed = zlib.crc32(token.encode('utf-8'))
+    return hashed % EMBEDDING_DIM, (1.0 if hashed & 0x80000000 else -1.0)
+
+
+def _terms(text):
+    words = [word for word in _TOKEN.findall(text.lower()) if word not in _STOP_WORDS]
+    return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+
+def embed_fields(fields):
+    """Unit-length vector for {field: text}; terms get sublinear tf times the field weight"""
+    weights = Counter()
+    for field, text in fields.items():
+        for term, count in Counter(_terms(text)).items():
+            weights[term] += EMBEDDING_FIELDS.get(field, 1.0) * (1 + math.log(count))
+
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for term, weight in weights.items():
+        column, sign = _bucket(term)
+        vector[column] += sign * weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def embed_candidate(candidate):
+    return embed_fields({
+        'summary': candidate.get('summary') or '',
+        'skills': ' ; '.join(candidate.get('skills') or []),
+        'titles': ' ; '.join(str(entry.get('title') or '') for entry in candidate.get('experience') or []),
+    })
+
+
+def embed_text(text):
+    """Embedding of free text such as a pasted job description"""
+    return embed_fields({'summary': text})
+
+
+# --- building -----------------------------------------------------------
+
+def train_centroids(vectors, nlist, iterations=10, sample_size=None, seed=0):
+    """Spherical k-means on a sample of the rows"""
+    rng = np.random.default_rng(seed)
+    count = vectors.shape[0]
+    sample_size = min(count, sample_size or max(64 * nlist, 10000))
+    sample = np.asarray(vectors[np.sort(rng.choice(count, sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        # Empty lists restart from random sample rows
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        norms[empty] = 1
+        centroids = (sums / norms[:, None]).astype(np.float32)
+    return centroids
+
+
+def assign_lists(vectors, centroids, chunk_size=65536):
+    assignment = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], chunk_size):
+        chunk = np.asarray(vectors[start:start + chunk_size])
+        assignment[start:start + chunk_size] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignment
+
+
+class IndexBuilder:
+    """
+    Streams (candidate_id, vector) pairs to a spool file, then trains the IVF
+    lists and writes a build where every list is one contiguous block of rows.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or _index_path()
+        os.makedirs(self.path, exist_ok=True)
+        self.name = f'build-{datetime.now():%Y%m%d%H%M%S%f}'
+        self.build_dir = os.path.join(self.path, self.name)
+        os.makedirs(self.build_dir)
+        self.spool_path = os.path.join(self.build_dir, 'spool.f32')
+        self._spool = open(self.spool_path, 'wb')
+        self.ids = []
+        self.started = datetime.now()
+
+    def add(self, candidate_id, vector):
+        self._spool.write(np.asarray(vector, dtype=np.float32).tobytes())
+        self.ids.append(str(candidate_id))
+
+    def finish(self, nlist=None, chunk_size=65536):
+        """Write the build, point CURRENT at it and drop older builds; returns the manifest"""
+        self._spool.close()
+        count = len(self.ids)
+        nlist = min(nlist or max(1, int(math.sqrt(count))), max(count, 1))
+
+        if count:
+            spool = np.memmap(self.spool_path, dtype=np.float32, mode='r', shape=(count, EMBEDDING_DIM))
+            centroids = train_centroids(spool, nlist)
+            assignment = assign_lists(spool, centroids, chunk_size)
+            order = np.argsort(assignment, kind='stable')
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))])
+
+            vectors = np.memmap(os.path.join(self.build_dir, 'vectors.f32'), dtype=np.float32,
+                                mode='w+', shape=(count, EMBEDDING_DIM))
+            for start in range(0, count, chunk_size):
+                # Read the spool in file order, then place rows in list order
+                rows = order[start:start + chunk_size]
+                sorted_rows = np.sort(rows)
+                vectors[start:start + len(rows)] = spool[sorted_rows][np.searchsorted(sorted_rows, rows)]
+            vectors.flush()
+            del vectors, spool
+            ids = np.array(self.ids)[order]
+        else:
+            centroids = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+            offsets = np.zeros(1, dtype=np.int64)
+            ids = np.array([], dtype=str)
+            open(os.path.join(self.build_dir, 'vectors.f32'), 'wb').close()
+        os.remove(self.spool_path)
+
+        np.save(os.path.join(self.build_dir, 'ids.npy'), ids)
+        np.save(os.path.join(self.build_dir, 'centroids.npy'), centroids)
+        np.save(os.path.join(self.build_dir, 'offsets.npy'), offsets.astype(np.int64))
+        manifest = {
+            'dim': EMBEDDING_DIM,
+            'count': count,
+            'nlist': int(centroids.shape[0]),
+            'built_at': self.started.isoformat(),
+        }
+        with open(os.path.join(self.build_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+
+        # Readers that still map an old build keep its open files; new readers follow CURRENT
+        pointer = os.path.join(self.path, f'{_CURRENT}.tmp')
+        with open(pointer, 'w') as f:
+            f.write(self.name)
+        os.replace(pointer, os.path.join(self.path, _CURRENT))
+        for entry in os.listdir(self.path):
+            if entry.startswith('build-') and entry != self.name:
+                shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
+        return manifest
+
+
+def _grow(array, size):
+    """Return array with room for at least size rows, doubling to keep appends amortized O(1)"""
+    if size <= len(array):
+        return array
+    grown = np.zeros((max(size, 2 * len(array), 1024),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+# --- searching ----------------------------------------------------------
+
+class SimilarityIndex:
+    def __init__(self, path=None):
+        self.path = path or _index_path()
+        self._lock = threading.RLock()
+        self._warned_unbuilt = False
+        self.load()
+
+    def _current_build(self):
+        try:
+            with open(os.path.join(self.path, _CURRENT)) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def load(self):
+        """Map the current build (if any) and start an empty tail"""
+        with self._lock:
+            self.build = self._current_build()
+            self.vectors = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+            self.ids = np.array([], dtype=str)
+            self.centroids = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.built_at = None
+
+            if self.build:
+                build_dir = os.path.join(self.path, self.build)
+                with open(os.path.join(build_dir, 'manifest.json')) as f:
+                    manifest = json.load(f)
+                if manifest['dim'] == EMBEDDING_DIM:
+                    if manifest['count']:
+                        self.vectors = np.memmap(os.path.join(build_dir, 'vectors.f32'), dtype=np.float32,
+                                                 mode='r', shape=(manifest['count'], EMBEDDING_DIM))
+                    self.ids = np.load(os.path.join(build_dir, 'ids.npy'))
+                    self.centroids = np.load(os.path.join(build_dir, 'centroids.npy'))
+                    self.offsets = np.load(os.path.join(build_dir, 'offsets.npy'))
+                    self.built_at = datetime.fromisoformat(manifest['built_at'])
+                else:
+                    logger.warning('Similarity index %s has dim %s, expected %s; run build_similarity_index',
+                                   self.build, manifest['dim'], EMBEDDING_DIM)
+
+            self.base_rows = {candidate_id: row for row, candidate_id in enumerate(self.ids.tolist())}
+            self.base_stale = np.zeros(len(self.ids), dtype=bool)
+
+            self.tail_vectors = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+            self.tail_lists = np.zeros(0, dtype=np.int32)
+            self.tail_active = np.zeros(0, dtype=bool)
+            self.tail_ids = []
+            self.tail_rows = {}
+
+            self.last_sync = self.built_at
+            self.synced_at = 0.0
+
+    @property
+    def built(self):
+        return self.built_at is not None
+
+    def __len__(self):
+        return len(self.ids) - int(self.base_stale.sum()) + int(self.tail_active[:len(self.tail_ids)].sum())
+
+    def add_candidate(self, candidate_id, candidate):
+        """Embed a new or changed candidate into the tail; its older vector is masked out"""
+        self.add_vector(candidate_id, embed_candidate(candidate))
+
+    def add_vector(self, candidate_id, vector):
+        candidate_id = str(candidate_id)
+        with self._lock:
+            if candidate_id in self.base_rows:
+                self.base_stale[self.base_rows[candidate_id]] = True
+            if candidate_id in self.tail_rows:
+                self.tail_active[self.tail_rows[candidate_id]] = False
+
+            row = len(self.tail_ids)
+            self.tail_vectors = _grow(self.tail_vectors, row + 1)
+            self.tail_lists = _grow(self.tail_lists, row + 1)
+            self.tail_active = _grow(self.tail_active, row + 1)
+            self.tail_vectors[row] = vector
+            self.tail_lists[row] = np.argmax(self.centroids @ vector) if len(self.centroids) else -1
+            self.tail_active[row] = True
+            self.tail_ids.append(candidate_id)
+            self.tail_rows[candidate_id] = row
+
+    def sync(self, candidate_collection, force=False):
+        """
+        Pick up a newer build, then embed candidates created or updated since
+        it. Without a build nothing is embedded: that is build_similarity_index's
+        job, not a web request's.
+        """
+        interval = getattr(settings, 'SIMILARITY_SYNC_INTERVAL', 5)
+        if not force and time.monotonic() - self.synced_at < interval:
+            return
+        with self._lock:
+            if self._current_build() != self.build:
+                self.load()
+            if not self.built:
+                if not self._warned_unbuilt:
+                    logger.warning('No similarity index under %s; run build_similarity_index', self.path)
+                    self._warned_unbuilt = True
+                self.synced_at = time.monotonic()
+                return
+            started = datetime.now()
+            # Small overlap absorbs clock skew between web workers
+            query = {'last_updated': {'$gte': self.last_sync - timedelta(seconds=60)}}
+            for candidate in candidate_collection.find(query, EMBEDDED_FIELDS).batch_size(10000):
+                self.add_candidate(candidate['_id'], candidate)
+            self.last_sync = started
+            self.synced_at = time.monotonic()
+
+    def vector_for(self, candidate_id):
+        candidate_id = str(candidate_id)
+        with self._lock:
+            row = self.tail_rows.get(candidate_id)
+            if row is not None and self.tail_active[row]:
+                return self.tail_vectors[row].copy()
+            row = self.base_rows.get(candidate_id)
+            if row is not None and not self.base_stale[row]:
+                return np.array(self.vectors[row])
+        return None
+
+    def search(self, vector, k=20, nprobe=None, exclude=None):
+        """
+        [(candidate_id, cosine similarity)] for the k nearest candidates,
+        scoring only the nprobe IVF lists closest to the query.
+        """
+        nprobe = nprobe or getattr(settings, 'SIMILARITY_NPROBE', 8)
+        with self._lock:
+            tail_count = len(self.tail_ids)
+            tail_mask = self.tail_active[:tail_count].copy()
+            rows, scores = [], []
+
+            if len(self.centroids):
+                nprobe = min(nprobe, len(self.centroids))
+                probes = np.argpartition(-(self.centroids @ vector), nprobe - 1)[:nprobe]
+                for probe in probes:
+                    start, end = self.offsets[probe], self.offsets[probe + 1]
+                    if start == end:
+                        continue
+                    block = np.asarray(self.vectors[start:end]) @ vector
+                    block[self.base_stale[start:end]] = -np.inf
+                    rows.append(np.arange(start, end))
+                    scores.append(block)
+                tail_mask &= np.isin(self.tail_lists[:tail_count], probes)
+
+            # Tail rows carry a negative row number: -1 - tail row
+            tail_rows = np.flatnonzero(tail_mask)
+            if len(tail_rows):
+                rows.append(-1 - tail_rows)
+                scores.append(self.tail_vectors[tail_rows] @ vector)
+            return self._top(rows, scores, k, exclude)
+
+    def exact_search(self, vector, k=20, exclude=None, chunk_size=65536):
+        """Brute-force cosine over every active row; the reference for recall measurements"""
+        with self._lock:
+            rows, scores = [], []
+            for start in range(0, len(self.ids), chunk_size):
+                block = np.asarray(self.vectors[start:start + chunk_size]) @ vector
+                block[self.base_stale[start:start + chunk_size]] = -np.inf
+                rows.append(np.arange(start, start + len(block)))
+                scores.append(block)
+            tail_rows = np.flatnonzero(self.tail_active[:len(self.tail_ids)])
+            if len(tail_rows):
+                rows.append(-1 - tail_rows)
+                scores.append(self.tail_vectors[tail_rows] @ vector)
+            return self._top(rows, scores, k, exclude)
+
+    def _candidate_id(self, row):
+        return self.ids[row] if row >= 0 else self.tail_ids[-1 - row]
+
+    def _top(self, rows, scores, k, exclude):
+        if not rows:
+            return []
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores)
+        if exclude is not None:
+            exclude = str(exclude)
+            if exclude in self.base_rows:
+                scores[rows == self.base_rows[exclude]] = -np.inf
+            if exclude in self.tail_rows:
+                scores[rows == -1 - self.tail_rows[exclude]] = -np.inf
+        k = min(k, int(np.count_nonzero(scores > 0)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(str(self._candidate_id(rows[i])), round(float(scores[i]), 4)) for i in top]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index(candidate_collection):
+    """Process-wide index, mapped on first use and kept in sync afterwards"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = SimilarityIndex()
+            index.sync(candidate_collection, force=True)
+            _index = index
+    _index.sync(candidate_collection)
+    return _index
+
+
+def add_to_similarity_index(candidate_id, candidate):
+    """Embed a just-saved candidate if this process has the index loaded; others pick it up on sync"""
+    if _index is not None and _index.built:
+        _index.add_candidate(candidate_id, candidate)
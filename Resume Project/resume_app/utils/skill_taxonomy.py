@@ -0,0 +1,211 @@
+"""
+Skill taxonomy: raw skill strings interned as canonical integer IDs.
+
+Parsers return skills as free text, so "Python", "python3" and "Python
+programming" would otherwise be three different values. Each skill in the
+`skill_taxonomy` collection has an integer _id, a display name and a list of
+alias keys (normalized strings) under a unique multikey index, so an alias
+belongs to exactly one skill. Built-in skills have fixed IDs from
+CANONICAL_SKILLS; any other string is interned under a new ID the first time
+it is seen.
+
+Candidates store the sorted IDs in `skill_ids`, and matching, facets and
+aggregations work on those. The free-text `skills` are kept for display and
+full-text search. Lookups are answered from a per-process alias map and only
+reach Mongo for strings this process has not seen yet.
+"""
+import logging
+import re
+import threading
+from functools import lru_cache
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+SKILL_TAXONOMY_COLLECTION = 'skill_taxonomy'
+COUNTERS_COLLECTION = 'counters'
+
+# Skills interned at runtime are numbered from here; built-ins take 1..len(CANONICAL_SKILLS)
+FIRST_INTERNED_ID = 10000
+
+# Canonical name -> aliases. Built-in IDs are positions in this list: only append to it.
+CANONICAL_SKILLS = [
+    ('Python', ['python3', 'python 3', 'py']),
+    ('JavaScript', ['js', 'ecmascript', 'es6', 'vanilla js']),
+    ('TypeScript', ['ts']),
+    ('Java', ['java se', 'java ee', 'j2ee']),
+    ('C++', ['cpp', 'c plus plus']),
+    ('C#', ['csharp', 'c sharp']),
+    ('Go', ['golang']),
+    ('Ruby', []),
+    ('PHP', []),
+    ('SQL', ['structured query language']),
+    ('MySQL', []),
+    ('PostgreSQL', ['postgres', 'psql']),
+    ('MongoDB', ['mongo']),
+    ('Redis', []),
+    ('React', ['react.js', 'reactjs', 'react js']),
+    ('Angular', ['angularjs', 'angular.js', 'angular js']),
+    ('Vue.js', ['vue', 'vuejs', 'vue js']),
+    ('Node.js', ['node', 'nodejs', 'node js']),
+    ('Django', ['django rest framework', 'drf']),
+    ('Flask', []),
+    ('Spring Boot', ['springboot', 'spring-boot']),
+    ('REST APIs', ['rest', 'rest api', 'restful', 'restful api', 'restful apis', 'restful services']),
+    ('GraphQL', []),
+    ('Microservices', ['microservice', 'microservice architecture', 'microservices architecture']),
+    ('AWS', ['amazon web services']),
+    ('Azure', ['microsoft azure']),
+    ('Google Cloud', ['gcp', 'google cloud platform']),
+    ('Docker', []),
+    ('Kubernetes', ['k8s']),
+    ('Git', ['github', 'gitlab']),
+    ('Linux', []),
+    ('Machine Learning', ['ml']),
+    ('Data Analysis', ['data analytics']),
+    ('Excel', ['microsoft excel', 'ms excel']),
+    ('Project Management', []),
+    ('Agile', ['agile methodologies', 'agile methodology']),
+    ('Scrum', []),
+    ('HTML', ['html5']),
+    ('CSS', ['css3']),
+]
+
+# Wording around a skill that does not change which skill it is
+_SUFFIXES = (' programming language', ' programming', ' language', ' development', ' framework', ' skills')
+# A version only counts after a space ("Java 8", "Terraform v1.5"), so "IPv6" or "S3" keep their digits
+_VERSION = re.compile(r'^(.*[a-z+#])\s+v?\d+(?:\.\d+)*x?$')
+
+
+@lru_cache(maxsize=100000)
+def skill_key(skill):
+    """Lower-case, single-spaced form of a skill string, or '' if nothing is left"""
+    return ' '.join(str(skill).lower().replace('_', ' ').split()).strip(' .,:;-*')
+
+
+@lru_cache(maxsize=100000)
+def skill_keys(skill):
+    """Keys to look a skill up by, most specific first: as written, without a suffix, without a version"""
+    key = skill_key(skill)
+    if not key:
+        return ()
+    keys = [key]
+    for suffix in _SUFFIXES:
+        if key.endswith(suffix) and len(key) > len(suffix):
+            keys.append(key[:-len(suffix)])
+            break
+    for candidate in list(keys):
+        match = _VERSION.match(candidate)
+        if match:
+            keys.append(match.group(1).strip())
+    return tuple(dict.fromkeys(keys))
+
+
+class SkillTaxonomy:
+    def __init__(self, collection, counters_collection=None):
+        self.collection = collection
+        self.counters = counters_collection if counters_collection is not None else collection.database[COUNTERS_COLLECTION]
+        self._ids = {}    # alias key -> skill id
+        self._names = {}  # skill id -> display name
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _remember(self, skill):
+        self._names[skill['_id']] = skill['name']
+        for alias in skill.get('aliases', []):
+            self._ids[alias] = skill['_id']
+
+    def load(self):
+        """Add the built-in skills if missing, then read the whole alias table"""
+        with self._lock:
+            if self._loaded:
+                return
+            claimed = {skill['_id']: set(skill.get('aliases', [])) for skill in self.collection.find({}, {'aliases': 1})}
+            taken = {alias: skill_id for skill_id, aliases in claimed.items() for alias in aliases}
+            for number, (name, aliases) in enumerate(CANONICAL_SKILLS, start=1):
+                keys = [key for key in dict.fromkeys([skill_key(name)] + [skill_key(alias) for alias in aliases])
+                        if taken.get(key, number) == number]
+                if number in claimed and claimed[number].issuperset(keys):
+                    continue
+                try:
+                    self.collection.update_one(
+                        {'_id': number},
+                        {'$setOnInsert': {'name': name}, '$addToSet': {'aliases': {'$each': keys}}},
+                        upsert=True
+                    )
+                except DuplicateKeyError:
+                    # Interned concurrently by another process; that skill keeps the alias
+                    logger.warning('Skill aliases of %s are already taken', name)
+            for skill in self.collection.find({}, {'name': 1, 'aliases': 1}):
+                self._remember(skill)
+            self._loaded = True
+
+    def skill_id(self, skill, create=True):
+        """ID of a raw skill string; unknown skills are interned unless create is False"""
+        keys = skill_keys(skill)
+        if not keys:
+            return None
+        for key in keys:
+            if key in self._ids:
+                return self._ids[key]
+
+        # Possibly interned by another process since this one loaded
+        existing = self.collection.find_one({'aliases': {'$in': list(keys)}}, {'name': 1, 'aliases': 1})
+        if existing is not None:
+            with self._lock:
+                self._remember(existing)
+            return existing['_id']
+        if not create:
+            return None
+
+        counter = self.counters.find_one_and_update(
+            {'_id': 'skill_id'}, {'$inc': {'value': 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        # Interned under its most general key, so "Rust programming" and a later "Rust" share an ID
+        skill = {'_id': FIRST_INTERNED_ID + counter['value'], 'name': ' '.join(str(skill).split()), 'aliases': [keys[-1]]}
+        try:
+            self.collection.insert_one(skill)
+        except DuplicateKeyError:
+            # The same skill was interned concurrently; its ID wins and this one is unused
+            skill = self.collection.find_one({'aliases': keys[-1]}, {'name': 1, 'aliases': 1})
+        for key in keys[:-1]:
+            try:
+                self.collection.update_one({'_id': skill['_id']}, {'$addToSet': {'aliases': key}})
+                skill['aliases'] = list(dict.fromkeys(skill['aliases'] + [key]))
+            except DuplicateKeyError:
+                # Claimed concurrently by another skill, which keeps it
+                pass
+        with self._lock:
+            self._remember(skill)
+        return skill['_id']
+
+    def skill_ids(self, skills, create=True):
+        """Sorted, distinct IDs of a list of raw skills; unknown ones are dropped when create is False"""
+        ids = {self.skill_id(skill, create) for skill in skills or []}
+        ids.discard(None)
+        return sorted(ids)
+
+    def names(self, skill_ids):
+        """{id: display name} for the given IDs"""
+        missing = [skill_id for skill_id in skill_ids if skill_id not in self._names]
+        if missing:
+            with self._lock:
+                for skill in self.collection.find({'_id': {'$in': missing}}, {'name': 1, 'aliases': 1}):
+                    self._remember(skill)
+        return {skill_id: self._names[skill_id] for skill_id in skill_ids if skill_id in self._names}
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_skill_taxonomy(collection):
+    """Process-wide taxonomy over `collection`, loaded on first use"""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            taxonomy = SkillTaxonomy(collection)
+            taxonomy.load()
+            _taxonomy = taxonomy
+    return _taxonomy
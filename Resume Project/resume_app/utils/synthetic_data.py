@@ -0,0 +1,78 @@
+"""
+Synthetic resume data shared by simulate_ai_parsing and generate_synthetic.
+
+synthetic_resume() builds the parsed-resume document the upload pipeline
+works with from a caller-supplied random.Random, so output is reproducible
+from a seed and never disturbs the global random state.
+"""
+FIRST_NAMES = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'Robert', 'Lisa', 'James', 'Maria']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
+
+SKILLS = [
+    'Python', 'JavaScript', 'Java', 'React', 'Node.js', 'SQL', 'MongoDB', 'AWS', 'Docker', 'Kubernetes',
+    'Machine Learning', 'Data Analysis', 'Project Management', 'Agile', 'Scrum', 'Git', 'Linux', 'Azure',
+    'Angular', 'Vue.js', 'Django', 'Flask', 'Spring Boot', 'Microservices', 'REST APIs', 'GraphQL'
+]
+
+COMPANIES = ['Google', 'Microsoft', 'Amazon', 'Apple', 'Meta', 'Netflix', 'Spotify', 'Uber', 'Airbnb', 'Tesla']
+UNIVERSITIES = ['MIT', 'Stanford', 'Harvard', 'Berkeley', 'CMU', 'Caltech', 'Princeton', 'Yale', 'Columbia', 'Cornell']
+LOCATIONS = ['New York, NY', 'San Francisco, CA', 'Seattle, WA', 'Austin, TX', 'Boston, MA']
+TITLES = ['Software Engineer', 'Senior Developer', 'Tech Lead', 'Product Manager']
+DEGREES = ['Bachelor of Science', 'Master of Science', 'Bachelor of Engineering']
+FIELDS = ['Computer Science', 'Software Engineering', 'Information Technology']
+CERTIFICATIONS = ['AWS Certified', 'Google Cloud Certified', 'Microsoft Azure Certified']
+SUMMARY_ROLES = ['software engineer', 'developer', 'technical lead']
+
+# Wider pools for bulk generation, so name identity keys are not all shared
+MORE_FIRST_NAMES = FIRST_NAMES + [
+    'Wei', 'Aisha', 'Carlos', 'Priya', 'Kenji', 'Fatima', 'Liam', 'Olivia', 'Noah', 'Ava', 'Mateo', 'Sofia',
+    'Arjun', 'Mei', 'Omar', 'Chloe', 'Lucas', 'Zara', 'Ethan', 'Nur', 'Daniel', 'Hannah', 'Ravi', 'Yuki',
+]
+MORE_LAST_NAMES = LAST_NAMES + [
+    'Lee', 'Tan', 'Wong', 'Kumar', 'Singh', 'Nguyen', 'Kim', 'Chen', 'Lim', 'Ahmad', 'Ibrahim', 'Patel',
+    'Sato', 'Suzuki', 'Muller', 'Rossi', 'Silva', 'Santos', 'Novak', 'Kowalski', 'Ivanov', 'Cohen', 'Walker', 'Young',
+]
+
+
+def synthetic_resume(rng, number=None):
+    """
+    Parsed resume drawn from rng. With a `number`, names come from the wider
+    pools and email, phone and LinkedIn URL are made unique to that number.
+    """
+    first_name = rng.choice(FIRST_NAMES if number is None else MORE_FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES if number is None else MORE_LAST_NAMES)
+    handle = f'{first_name.lower()}.{last_name.lower()}' + ('' if number is None else f'.{number}')
+    if number is None:
+        phone = f"+1-{rng.randint(100, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+    else:
+        phone = f"+1-{200 + number // 10_000_000 % 800}-{number // 10_000 % 1000:03d}-{number % 10_000:04d}"
+
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'email': f"{handle}@email.com",
+        'phone': phone,
+        'location': rng.choice(LOCATIONS),
+        'linkedin_url': f"https://linkedin.com/in/{handle.replace('.', '-')}",
+        'experience': [
+            {
+                'title': rng.choice(TITLES),
+                'company': rng.choice(COMPANIES),
+                'duration': f"{rng.randint(1, 5)} years",
+                'description': 'Led development of scalable web applications and managed cross-functional teams.'
+            }
+        ],
+        'education': [
+            {
+                'degree': rng.choice(DEGREES),
+                'field': rng.choice(FIELDS),
+                'university': rng.choice(UNIVERSITIES),
+                'year': rng.randint(2015, 2023)
+            }
+        ],
+        'skills': rng.sample(SKILLS, rng.randint(5, 12)),
+        'certifications': rng.sample(CERTIFICATIONS, rng.randint(0, 2)),
+        'summary': f"Experienced {rng.choice(SUMMARY_ROLES)} with expertise in modern technologies and agile methodologies.",
+        'ai_score': rng.randint(75, 95),
+        'quality_score': rng.randint(70, 90)
+    }
@@ -0,0 +1,71 @@
+import contextvars
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.core.files import File
+
+# Size of each chunk read from an uploaded file while streaming it to storage
+UPLOAD_CHUNK_SIZE = getattr(settings, 'RESUME_UPLOAD_CHUNK_SIZE', 64 * 1024)
+
+
+class HashingFile(File):
+    """
+    Wraps an uploaded file so storage backends read it chunk by chunk while
+    a SHA-256 digest of the content is computed in the same pass
+    """
+
+    def __init__(self, uploaded_file):
+        super().__init__(uploaded_file, name=uploaded_file.name)
+        self._sha256 = hashlib.sha256()
+        self._consumed = False
+
+    def chunks(self, chunk_size=None):
+        self._sha256 = hashlib.sha256()
+        for chunk in self.file.chunks(chunk_size or UPLOAD_CHUNK_SIZE):
+            self._sha256.update(chunk)
+            yield chunk
+        self._consumed = True
+
+    def hexdigest(self):
+        """Return the SHA-256 of the content, reading it if storage did not"""
+        if not self._consumed:
+            for _ in self.chunks():
+                pass
+        return self._sha256.hexdigest()
+
+
+class KeyedLocks:
+    """
+    One lock per key, created on first use. hold() takes all of its keys in
+    sorted order, so holders of overlapping key sets cannot deadlock.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _lock(self, key):
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def hold(self, *keys):
+        with ExitStack() as stack:
+            for key in sorted(set(keys)):
+                stack.enter_context(self._lock(key))
+            yield
+
+
+def map_concurrently(function, items, max_workers):
+    """
+    [function(item) for item in items] on up to max_workers threads, results in
+    item order. Each call runs in a copy of the caller's context, so request
+    metrics and log fields still reach the request that started the batch.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix='upload') as pool:
+        futures = [pool.submit(contextvars.copy_context().run, function, item) for item in items]
+        return [future.result() for future in futures]
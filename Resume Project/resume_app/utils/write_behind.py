@@ -0,0 +1,78 @@
+"""
+Write-behind buffer for low-value, high-frequency field updates.
+
+Logins record last_login in Mongo, but nothing reads it on the request path,
+so it does not need a synchronous round trip. Updates are coalesced per
+document in memory and written by a background thread in one bulk_write
+every interval; only the newest value per document is sent ($max keeps a
+late flush from moving the value backwards).
+"""
+import atexit
+import logging
+import threading
+from pymongo import UpdateOne
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    def __init__(self, get_collection, field, interval=None):
+        self.get_collection = get_collection
+        self.field = field
+        self.interval = interval or getattr(settings, 'LAST_LOGIN_FLUSH_INTERVAL', 5)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def record(self, key_field, key, value):
+        """Queue {key_field: key} -> {field: value}; later values for the same key replace earlier ones"""
+        with self._lock:
+            self._pending[(key_field, key)] = value
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f'write-behind-{self.field}', daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Write everything queued so far; returns the number of documents updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        ops = [
+            UpdateOne({key_field: key}, {'$max': {self.field: value}})
+            for (key_field, key), value in pending.items()
+        ]
+        try:
+            self.get_collection().bulk_write(ops, ordered=False)
+        except Exception as e:
+            logger.exception('Error flushing %s buffered %s update(s)', len(ops), self.field)
+            # Keep them for the next attempt unless newer values arrived meanwhile
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending.setdefault(key, value)
+            return 0
+        return len(ops)
+
+    def _run(self):
+        while not self._wakeup.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        self._wakeup.set()
+        self.flush()
+
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_buffer(name, field, get_collection):
+    """Process-wide buffer per (name, field), flushed once more at interpreter exit"""
+    with _buffers_lock:
+        if (name, field) not in _buffers:
+            buffer = WriteBehindBuffer(get_collection, field)
+            atexit.register(buffer.close)
+            _buffers[(name, field)] = buffer
+        return _buffers[(name, field)]
@@ -1,30 +1,198 @@
 from django.contrib.auth.models import User
-from django.contrib.auth import authenticate, login
+from django.contrib.auth import aauthenticate, alogin
 from django.contrib import messages
 from django.shortcuts import render, redirect
 from django import forms
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.views import LoginView
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.utils import timezone
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.debug import sensitive_post_parameters
+from asgiref.sync import sync_to_async
 import pymongo
+from pymongo import AsyncMongoClient
+from bson import ObjectId
+import asyncio
+import functools
 import hashlib
+import json
+import logging
 from datetime import datetime, timedelta
+import os
 import random
 import string
+import threading
+import time
+import weakref
+from contextlib import ExitStack
+from .utils.async_adapter import AsyncClientAdapter
+from .utils.blob_storage import BLOB_COLLECTION, local_blob_path, release_blob, spool_upload, store_blob
+from .utils.upload_utils import KeyedLocks, map_concurrently
+from .utils.chunked_upload import (
+    ALLOWED_EXTENSIONS, UPLOAD_BATCH_COLLECTION, OffsetMismatch, UploadError, batch_status, batch_ttl, claim_batch,
+    create_batch, discard_spool, open_spooled_files, write_chunk
+)
+from .utils.parser_pool import ResumeParseError, parse_resume, parser_backend, parser_stamp
+from .utils.identity_utils import identity_keys
+from .utils.candidate_query import (
+    InvalidQuery, afetch_candidate_page, build_candidate_filter, serialize_document, skill_facet_pipeline
+)
+from .utils.search_index import InvalidSearch, index_candidate, search_candidates
+from .utils.matching_engine import JOBS_COLLECTION, afind_job_skills, find_job_skills, get_matching_engine
+from .utils.similarity_index import IndexNotBuilt, add_to_similarity_index, embed_text, get_similarity_index
+from .utils.experience_timeline import experience_timeline
+from .utils.skill_taxonomy import SKILL_TAXONOMY_COLLECTION, get_skill_taxonomy
+from .utils.near_duplicates import decode_signature, estimate_similarity, link_near_duplicates, signature_fields
+from .utils.rollup_utils import (
+    ROLLUP_COLLECTION, dashboard_metrics, load_rollups, record_candidate_created, record_upload
+)
+from .utils.db_metrics import charge_files, command_tracker, render_metrics
+from .utils.progress_events import (
+    ROLLUP_CHANNEL, aevent_stream, broker, event_stream, publish_file_state, user_channel
+)
+from .utils.profile_cache import (
+    acache_profile, aget_profile, aget_verification_secrets, ainvalidate_profile, invalidate_profile
+)
+from .utils.synthetic_data import synthetic_resume
+from .utils.pipeline_utils import (
+    STAGE_EVENTS_COLLECTION, STAGE_DETAIL_FIELDS, STAGES, PipelineError, funnel_metrics, move_candidate,
+    stage_candidates
+)
+from .utils.history_utils import (
+    HISTORY_COLLECTION, PARSE_RESULTS_COLLECTION,
+    append_history, migrate_candidate_history, recent_history_update, save_parse_result
+)
+
+logger = logging.getLogger(__name__)
+
+# Indexes created once per process, the first time a connection is opened
+MONGODB_INDEXES = {
+    'resume_login': [
+        ([('username', pymongo.ASCENDING)], {}),
+    ],
+    'resume_uploads': [
+        ([('content_hash', pymongo.ASCENDING)], {}),
+        # Upload page: a recruiter's latest uploads and their counts by status
+        ([('uploaded_by', pymongo.ASCENDING), ('upload_date', pymongo.DESCENDING)], {}),
+        ([('uploaded_by', pymongo.ASCENDING), ('status', pymongo.ASCENDING)], {}),
+    ],
+    'candidates': [
+        ([('identity_keys', pymongo.ASCENDING)], {}),
+        # Skill filters and facets run on taxonomy IDs
+        ([('skill_ids', pymongo.ASCENDING)], {}),
+        # Experience filters: total years, and years in one title ($elemMatch on both keys)
+        ([('experience_years', pymongo.DESCENDING)], {}),
+        ([('title_years.title', pymongo.ASCENDING), ('title_years.years', pymongo.DESCENDING)], {}),
+        # Near-duplicate lookups: any shared MinHash band
+        ([('lsh_buckets', pymongo.ASCENDING)], {}),
+        # Keyset pagination: every listing sorts by (key desc, _id desc)
+        ([('created_date', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)], {}),
+        ([('ai_score', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)], {}),
+        ([('status', pymongo.ASCENDING), ('created_date', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)], {}),
+        ([('department', pymongo.ASCENDING), ('created_date', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)], {}),
+        ([('tags', pymongo.ASCENDING), ('created_date', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)], {}),
+        ([('last_updated', pymongo.ASCENDING)], {}),
+        ([('job_title_applied', pymongo.ASCENDING)], {}),
+        # Interviews and offers pages: candidates in a stage, most recently moved first
+        ([('status', pymongo.ASCENDING), ('stage_entered_at', pymongo.DESCENDING)], {}),
+    ],
+    STAGE_EVENTS_COLLECTION: [
+        ([('candidate_id', pymongo.ASCENDING), ('changed_at', pymongo.ASCENDING)], {}),
+        ([('changed_at', pymongo.DESCENDING)], {}),
+    ],
+    SKILL_TAXONOMY_COLLECTION: [
+        # An alias names exactly one skill
+        ([('aliases', pymongo.ASCENDING)], {'unique': True}),
+    ],
+    JOBS_COLLECTION: [
+        ([('title', pymongo.ASCENDING)], {'unique': True}),
+    ],
+    HISTORY_COLLECTION: [
+        ([('candidate_id', pymongo.ASCENDING), ('count', pymongo.ASCENDING)], {}),
+        # Buckets copied from embedded history are numbered, so the copy can be repeated safely
+        ([('candidate_id', pymongo.ASCENDING), ('seq', pymongo.ASCENDING)],
+         {'unique': True, 'partialFilterExpression': {'seq': {'$exists': True}}}),
+    ],
+    # Re-parse job: results stamped by an older parser version or another backend
+    PARSE_RESULTS_COLLECTION: [
+        ([('parser_version', pymongo.ASCENDING)], {}),
+        ([('parser_backend', pymongo.ASCENDING)], {}),
+    ],
+    BLOB_COLLECTION: [
+        ([('ref_count', pymongo.ASCENDING)], {}),
+    ],
+    ROLLUP_COLLECTION: [
+        ([('day', pymongo.ASCENDING), ('department', pymongo.ASCENDING)], {}),
+    ],
+    UPLOAD_BATCH_COLLECTION: [
+        # Abandoned chunked uploads expire; their spools are purged when batches are opened
+        ([('last_activity', pymongo.ASCENDING)], {'expireAfterSeconds': batch_ttl()}),
+    ],
+}
 
 class MongoDBConnection:
+    _indexes_ensured = False
+    # One pooled client per process: MongoClient is thread-safe, and opening a
+    # new one per request costs a DNS lookup, TLS handshake and server discovery
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
     def __init__(self):
+        self.client = self.get_client()
+        self._db = self.client[self.database_name()]
+        self.ensure_indexes()
+
+    @staticmethod
+    def database_name():
+        return getattr(settings, 'MONGODB_SETTINGS', {}).get('database', 'resume_admin')
+
+    @classmethod
+    def reset_client(cls, client=None):
+        """Close the shared client; the next connection uses `client` or one built from settings"""
+        with cls._client_lock:
+            if cls._client is not None and cls._client_pid == os.getpid():
+                cls._client.close()
+            cls._client = client
+            cls._client_pid = os.getpid() if client is not None else None
+            cls._indexes_ensured = False
+
+    @staticmethod
+    def client_arguments():
+        """Positional and keyword arguments shared by the sync and async clients"""
+        # Every command is timed and charged to the current request for /metrics
+        options = {'event_listeners': [command_tracker]}
         # Use connection string for Atlas
         if hasattr(settings, 'MONGODB_SETTINGS') and 'connection_string' in settings.MONGODB_SETTINGS:
-            self.client = pymongo.MongoClient(settings.MONGODB_SETTINGS['connection_string'])
-        else:
-            # Fallback to local connection
-            self.client = pymongo.MongoClient('localhost', 27017)
-        
-        self._db = self.client['resume_admin']
-        print(f"✅ Connected to MongoDB database: resume_admin")
+            return [settings.MONGODB_SETTINGS['connection_string']], options
+        # Fallback to local connection
+        return ['localhost', 27017], options
+
+    @classmethod
+    def get_client(cls):
+        # Clients are not fork-safe, so a forked worker opens its own
+        if cls._client is None or cls._client_pid != os.getpid():
+            with cls._client_lock:
+                if cls._client is None or cls._client_pid != os.getpid():
+                    args, options = cls.client_arguments()
+                    cls._client = pymongo.MongoClient(*args, **options)
+                    cls._client_pid = os.getpid()
+                    logger.info('Connected to MongoDB database %s', cls.database_name())
+        return cls._client
+
+    def ensure_indexes(self):
+        if MongoDBConnection._indexes_ensured:
+            return
+        try:
+            for collection_name, indexes in MONGODB_INDEXES.items():
+                for keys, options in indexes:
+                    self._db[collection_name].create_index(keys, **options)
+            MongoDBConnection._indexes_ensured = True
+        except Exception as e:
+            logger.exception('Error creating MongoDB indexes')
     
     def get_collection(self, collection_name='resume_login'):
         return self._db[collection_name]
@@ -41,29 +209,117 @@ class MongoDBConnection:
         collection = self.get_collection()
         return list(collection.find({}))
 
-class CustomLoginView(LoginView):
-    template_name = 'resume_app/login.html'
-    redirect_authenticated_user = True
-    
-    def get_success_url(self):
-        return '/'
-    
-    def form_valid(self, form):
-        username = form.cleaned_data.get('username')
-        password = form.cleaned_data.get('password')
-        
-        # Authenticate using our custom backend
-        user = authenticate(self.request, username=username, password=password)
-        
+class AsyncMongoDBConnection:
+    """
+    MongoDBConnection for async views, on pymongo's AsyncMongoClient.
+
+    An async client belongs to the event loop it was created on, so there is
+    one per loop: a single shared one per ASGI worker. Under WSGI (runserver,
+    wsgi.py) each async view runs in a loop of its own; async_mongo_view then
+    serves it through the shared sync client instead (see utils.async_adapter).
+    Indexes are created by MongoDBConnection.
+    """
+    _clients = weakref.WeakKeyDictionary()
+    _client_factory = None
+
+    def __init__(self):
+        self.client = self.get_client()
+        self._db = self.client[MongoDBConnection.database_name()]
+
+    @classmethod
+    def reset_client(cls, factory=None):
+        """Forget every loop's client; new ones are built by `factory()` or from settings"""
+        cls._clients = weakref.WeakKeyDictionary()
+        cls._client_factory = factory
+
+    @classmethod
+    def get_client(cls):
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is None:
+            if cls._client_factory is not None:
+                client = cls._client_factory()
+            else:
+                args, options = MongoDBConnection.client_arguments()
+                client = AsyncMongoClient(*args, **options)
+            cls._clients[loop] = client
+        return client
+
+    @classmethod
+    def use_sync_client(cls):
+        """Serve the running loop through the process's shared MongoClient, unless a factory is set"""
+        loop = asyncio.get_running_loop()
+        if loop not in cls._clients and cls._client_factory is None:
+            cls._clients[loop] = AsyncClientAdapter(MongoDBConnection.get_client())
+
+    @classmethod
+    async def close_client(cls):
+        """Close the running loop's client, if it has one"""
+        client = cls._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def get_collection(self, collection_name='resume_login'):
+        return self._db[collection_name]
+
+
+def async_mongo_view(view):
+    """
+    Outside an ASGI server the request's event loop lives only as long as the
+    request, so it is served through the shared sync client and forgotten
+    afterwards; under ASGI the worker's async client is kept for the next request
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        per_request_loop = not isinstance(request, ASGIRequest)
+        if per_request_loop:
+            AsyncMongoDBConnection.use_sync_client()
+        try:
+            return await view(request, *args, **kwargs)
+        finally:
+            if per_request_loop:
+                await AsyncMongoDBConnection.close_client()
+    return wrapper
+
+
+async def _resolve_user(request):
+    """
+    Load the user without blocking the event loop and pin it on request.user, so
+    templates and sync helpers called from an async view never query the ORM lazily
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+class LoginForm(forms.Form):
+    username = forms.CharField(max_length=150)
+    password = forms.CharField(strip=False, widget=forms.PasswordInput)
+
+
+@sensitive_post_parameters()
+@csrf_protect
+@never_cache
+@async_mongo_view
+async def login_view(request):
+    """Login page; credentials are checked by the async MongoDB backend"""
+    user = await _resolve_user(request)
+    if user.is_authenticated:
+        return redirect('/')
+
+    form = LoginForm(request.POST if request.method == 'POST' else None)
+    if form.is_valid():
+        user = await aauthenticate(
+            request, username=form.cleaned_data['username'], password=form.cleaned_data['password']
+        )
         if user is not None:
-            login(self.request, user)
+            await alogin(request, user)
             # Get user's display name from MongoDB or fallback to username
             display_name = user.first_name or user.username
-            messages.success(self.request, f'Welcome back, {display_name}!')
-            return redirect(self.get_success_url())
-        else:
-            messages.error(self.request, 'Invalid username or password.')
-            return self.form_invalid(form)
+            messages.success(request, f'Welcome back, {display_name}!')
+            return redirect('/')
+        form.add_error(None, 'Invalid username or password.')
+    return render(request, 'resume_app/login.html', {'form': form})
+
 
 class CustomUserCreationForm(forms.Form):
     full_name = forms.CharField(
@@ -109,7 +365,7 @@ class CustomUserCreationForm(forms.Form):
             if mongo.find_user({'username': username}):
                 raise forms.ValidationError("Username already exists.")
         except Exception as e:
-            print(f"Error checking username: {e}")
+            logger.exception('Error checking username')
         
         return username
 
@@ -122,7 +378,7 @@ class CustomUserCreationForm(forms.Form):
             if mongo.find_user({'email': email}):
                 raise forms.ValidationError("Email already registered.")
         except Exception as e:
-            print(f"Error checking email: {e}")
+            logger.exception('Error checking email')
         
         return email
 
@@ -191,13 +447,13 @@ def register(request):
                 
                 # Insert into MongoDB
                 result = mongo.insert_user(user_data)
-                print(f"✅ User saved to MongoDB with ID: {result.inserted_id}")
+                logger.info('User %s saved to MongoDB with ID %s', user_data['username'], result.inserted_id)
                 
                 messages.success(request, 'Account created successfully! Please log in.')
                 return redirect('login')
                 
             except Exception as e:
-                print(f"❌ Error saving to MongoDB: {e}")
+                logger.exception('Error saving to MongoDB')
                 messages.error(request, f'Registration failed: {e}')
                 
     else:
@@ -207,270 +463,650 @@ def register(request):
 
 @login_required
 def dashboard(request):
-    # Mock data for dashboard
-    context = {
-        'total_candidates': 128,
-        'time_to_hire': '32 days',
-        'offer_acceptance_rate': '78%',
-        'source_data': [40, 30, 20, 38],
-        'pipeline': {'applied': 60, 'interviewed': 25, 'hired': 15},
-    }
+    # Figures come from pre-aggregated rollups: one indexed read however large the data
+    try:
+        mongo = MongoDBConnection()
+        rollups = load_rollups(mongo.get_collection(ROLLUP_COLLECTION))
+    except Exception as e:
+        logger.exception('Error loading dashboard rollups')
+        messages.error(request, 'Dashboard figures are temporarily unavailable.')
+        rollups = {}
+    context = dashboard_metrics(rollups)
+    context['funnel'] = funnel_metrics(rollups.get('all', {}))
     return render(request, 'resume_app/dashboard.html', context)
 
 @login_required
 def candidates(request):
-    return render(request, 'resume_app/candidates.html')
+    return render(request, 'resume_app/candidates.html', {'stages': STAGES})
 
 @login_required
-def interviews(request):
-    return render(request, 'resume_app/interviews.html')
+@async_mongo_view
+async def candidates_api(request):
+    """JSON candidate listing with keyset pagination, filters and field projections"""
+    await _resolve_user(request)
+    try:
+        mongo = AsyncMongoDBConnection()
+        documents, next_cursor = await afetch_candidate_page(mongo.get_collection('candidates'), request.GET)
+        return JsonResponse({
+            'status': 'success',
+            'results': serialize_document(documents),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        })
+    except InvalidQuery as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        logger.exception('Error in candidates API')
+        return JsonResponse({'status': 'error', 'message': 'Could not load candidates'}, status=500)
 
 @login_required
-def offers(request):
-    return render(request, 'resume_app/offers.html')
+@async_mongo_view
+async def candidate_skills_api(request):
+    """Skill facet: candidate counts per taxonomy skill, under the listing's filters"""
+    await _resolve_user(request)
+    try:
+        mongo = AsyncMongoDBConnection()
+        cursor = await mongo.get_collection('candidates').aggregate(skill_facet_pipeline(request.GET))
+        counts = await cursor.to_list()
+        names = {
+            skill['_id']: skill['name'] async for skill in mongo.get_collection(SKILL_TAXONOMY_COLLECTION).find(
+                {'_id': {'$in': [count['_id'] for count in counts]}}, {'name': 1}
+            )
+        }
+        return JsonResponse({
+            'status': 'success',
+            'skills': [
+                {'id': count['_id'], 'name': names.get(count['_id'], str(count['_id'])), 'count': count['count']}
+                for count in counts
+            ]
+        })
+    except InvalidQuery as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        logger.exception('Error in skill facets')
+        return JsonResponse({'status': 'error', 'message': 'Could not load skills'}, status=500)
 
-def handle_resume_upload(request):
-    """Handle resume file uploads and AI processing"""
+def _top_matches(skills, k, candidate_ids):
+    # The matching engine syncs and scores in memory, so it runs in a worker thread
+    engine = get_matching_engine(MongoDBConnection().get_collection('candidates'))
+    return engine.top_k(skills, k=k, candidate_ids=candidate_ids)
+
+@login_required
+@async_mongo_view
+async def candidate_match_api(request):
+    """Top-k candidates for a job's required skills (skills=a,b or job_title=...)"""
+    await _resolve_user(request)
     try:
-        import os
-        from django.core.files.storage import default_storage
-        from django.core.files.base import ContentFile
+        mongo = AsyncMongoDBConnection()
+        candidate_collection = mongo.get_collection('candidates')
+        job_title = request.GET.get('job_title', '').strip()
+        skills = [skill.strip() for skill in request.GET.get('skills', '').split(',') if skill.strip()]
+        if not skills:
+            skills = await afind_job_skills(mongo.get_collection(JOBS_COLLECTION), job_title) or []
+        if not skills:
+            return JsonResponse({'status': 'error', 'message': 'skills or a known job_title is required'}, status=400)
+
+        k = min(max(int(request.GET.get('k', 20)), 1), 200)
+        applicant_ids = None
+        if job_title and request.GET.get('applicants_only'):
+            applicant_ids = [
+                doc['_id'] async for doc in candidate_collection.find({'job_title_applied': job_title}, {'_id': 1})
+            ]
 
-        uploaded_files = request.FILES.getlist('resume_files')
-        job_title = request.POST.get('job_title', '').strip()
-        department = request.POST.get('department', '').strip()
-        tags = request.POST.get('tags', '').strip()
+        matches = await sync_to_async(_top_matches, thread_sensitive=False)(skills, k, applicant_ids)
+        profiles = {
+            doc['_id']: doc async for doc in candidate_collection.find(
+                {'_id': {'$in': [candidate_id for candidate_id, _ in matches]}},
+                {'first_name': 1, 'last_name': 1, 'email': 1, 'job_title_applied': 1,
+                 'status': 1, 'skills': {'$slice': 8}}
+            )
+        }
+        return JsonResponse({
+            'status': 'success',
+            'skills': skills,
+            'results': [
+                serialize_document({**profiles.get(candidate_id, {'_id': candidate_id}), 'match_score': score})
+                for candidate_id, score in matches
+            ]
+        })
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        logger.exception('Error in candidate matching')
+        return JsonResponse({'status': 'error', 'message': 'Matching failed'}, status=500)
+
+def _similar_matches(candidate_id, text, k):
+    # Embedding and the index scan are CPU-bound, so they run in a worker thread.
+    # Returns None for an unknown candidate.
+    index = get_similarity_index(MongoDBConnection().get_collection('candidates'))
+    if not index.built:
+        raise IndexNotBuilt()
+    vector = index.vector_for(candidate_id) if candidate_id else embed_text(text)
+    if vector is None:
+        return None
+    return index.search(vector, k=k, exclude=candidate_id or None)
 
-        if not uploaded_files:
-            messages.error(request, 'Please select at least one resume file to upload.')
-            return redirect('resume_upload')
+@login_required
+@async_mongo_view
+async def similar_candidates_api(request):
+    """Nearest candidates to a candidate (candidate_id=...) or to a pasted job description (text=...)"""
+    await _resolve_user(request)
+    try:
+        candidate_collection = AsyncMongoDBConnection().get_collection('candidates')
+        candidate_id = (request.GET.get('candidate_id') or request.POST.get('candidate_id') or '').strip()
+        text = (request.GET.get('text') or request.POST.get('text') or '').strip()
+        if not candidate_id and not text:
+            return JsonResponse({'status': 'error', 'message': 'candidate_id or text is required'}, status=400)
+
+        k = min(max(int(request.GET.get('k', 20)), 1), 100)
+        matches = await sync_to_async(_similar_matches, thread_sensitive=False)(candidate_id, text, k)
+        if matches is None:
+            return JsonResponse({'status': 'error', 'message': 'Unknown candidate'}, status=404)
+        object_ids = [ObjectId(match) if ObjectId.is_valid(match) else match for match, _ in matches]
+        profiles = {
+            str(doc['_id']): doc async for doc in candidate_collection.find(
+                {'_id': {'$in': object_ids}},
+                {'first_name': 1, 'last_name': 1, 'email': 1, 'job_title_applied': 1,
+                 'status': 1, 'skills': {'$slice': 8}}
+            )
+        }
+        return JsonResponse({
+            'status': 'success',
+            'results': [
+                serialize_document({**profiles.get(match, {'_id': match}), 'similarity': score})
+                for match, score in matches
+            ]
+        })
+    except IndexNotBuilt:
+        # Logged once per process by the index; a 5xx here would log every request again
+        return JsonResponse({'status': 'success', 'results': [], 'index_built': False})
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        logger.exception('Error in similar candidates search')
+        return JsonResponse({'status': 'error', 'message': 'Similarity search failed'}, status=500)
+
+@login_required
+@async_mongo_view
+async def candidate_duplicates_api(request, candidate_id):
+    """Candidates linked as likely the same person, with their estimated resume similarity"""
+    await _resolve_user(request)
+    if not ObjectId.is_valid(candidate_id):
+        return JsonResponse({'status': 'error', 'message': 'Invalid candidate id'}, status=400)
+    try:
+        candidate_collection = AsyncMongoDBConnection().get_collection('candidates')
+        candidate = await candidate_collection.find_one(
+            {'_id': ObjectId(candidate_id)}, {'minhash': 1, 'likely_duplicates': 1}
+        )
+        if candidate is None:
+            return JsonResponse({'status': 'error', 'message': 'Unknown candidate'}, status=404)
+
+        signature = decode_signature(candidate['minhash']) if candidate.get('minhash') else None
+        results = []
+        async for duplicate in candidate_collection.find(
+            {'_id': {'$in': candidate.get('likely_duplicates', [])}},
+            {'first_name': 1, 'last_name': 1, 'email': 1, 'job_title_applied': 1, 'status': 1,
+             'created_date': 1, 'minhash': 1}
+        ):
+            other = duplicate.pop('minhash', None)
+            duplicate['similarity'] = (
+                round(estimate_similarity(signature, decode_signature(other)), 3)
+                if signature is not None and other else None
+            )
+            results.append(duplicate)
+        results.sort(key=lambda duplicate: -(duplicate['similarity'] or 0))
+        return JsonResponse({'status': 'success', 'results': serialize_document(results)})
+    except Exception as e:
+        logger.exception('Error loading near-duplicates of %s', candidate_id)
+        return JsonResponse({'status': 'error', 'message': 'Could not load duplicates'}, status=500)
+
+# Listing filters the search index does not hold: applied in Mongo, then searched within
+SEARCH_MONGO_FILTERS = ('tags', 'skill_ids', 'min_years', 'max_years', 'experience_title', 'min_title_years')
+
+def _search_candidates(query, mongo_filter, **options):
+    # Every candidate passing the Mongo-only filters is streamed into the index's
+    # scope table, so the text query, not recency, decides which of them rank
+    candidate_ids = None
+    if mongo_filter:
+        cursor = MongoDBConnection().get_collection('candidates').find(mongo_filter, {'_id': 1}).batch_size(10000)
+        candidate_ids = (doc['_id'] for doc in cursor)
+    return search_candidates(query, candidate_ids=candidate_ids, **options)
+
+@login_required
+@async_mongo_view
+async def candidate_search_api(request):
+    """Full-text candidate search over parsed resume fields, ranked by BM25"""
+    await _resolve_user(request)
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'status': 'error', 'message': 'q is required'}, status=400)
+
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+        offset = min(max(int(request.GET.get('offset', 0)), 0), 1000)
+        min_score = float(request.GET['min_score']) if request.GET.get('min_score') else None
+        max_score = float(request.GET['max_score']) if request.GET.get('max_score') else None
 
+        mongo_filter = build_candidate_filter(
+            {key: request.GET[key] for key in SEARCH_MONGO_FILTERS if request.GET.get(key)}
+        )
+        results, truncated = await sync_to_async(_search_candidates, thread_sensitive=False)(
+            query, mongo_filter,
+            status=request.GET.get('status') or None,
+            department=request.GET.get('department') or None,
+            min_score=min_score,
+            max_score=max_score,
+            limit=limit,
+            offset=offset
+        )
+        return JsonResponse({
+            'status': 'success',
+            'results': results,
+            'has_more': len(results) == limit,
+            'truncated': truncated
+        })
+    except (InvalidSearch, InvalidQuery, ValueError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        logger.exception('Error in candidate search')
+        return JsonResponse({'status': 'error', 'message': 'Search failed'}, status=500)
+
+@login_required
+def candidate_stage_api(request, candidate_id):
+    """Move a candidate to another pipeline stage (POST stage=..., plus optional stage details)"""
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'POST required'}, status=405)
+    if not ObjectId.is_valid(candidate_id):
+        return JsonResponse({'status': 'error', 'message': 'Invalid candidate id'}, status=400)
+
+    stage = request.POST.get('stage', '').strip()
+    details = {field: request.POST.get(field, '').strip() for field in STAGE_DETAIL_FIELDS.get(stage, [])}
+    try:
         mongo = MongoDBConnection()
-        upload_collection = mongo.get_collection('resume_uploads')
-        candidate_collection = mongo.get_collection('candidates')
+        event = move_candidate(
+            mongo.get_collection('candidates'),
+            mongo.get_collection(STAGE_EVENTS_COLLECTION),
+            mongo.get_collection(ROLLUP_COLLECTION),
+            ObjectId(candidate_id), stage, request.user.username,
+            details=details, note=request.POST.get('note', '').strip()
+        )
+        return JsonResponse({'status': 'success', 'event': serialize_document(event)})
+    except PipelineError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except Exception as e:
+        logger.exception('Error moving candidate %s to %s', candidate_id, stage)
+        return JsonResponse({'status': 'error', 'message': 'Could not update stage'}, status=500)
 
-        successful_uploads = 0
-        failed_uploads = 0
-        duplicate_count = 0
+@login_required
+def pipeline_funnel_api(request):
+    """Funnel conversion and time-in-stage figures from the rollup totals"""
+    try:
+        mongo = MongoDBConnection()
+        rollups = load_rollups(mongo.get_collection(ROLLUP_COLLECTION))
+        return JsonResponse({'status': 'success', 'funnel': funnel_metrics(rollups['all'])})
+    except Exception as e:
+        logger.exception('Error loading pipeline funnel')
+        return JsonResponse({'status': 'error', 'message': 'Could not load funnel'}, status=500)
 
-        for uploaded_file in uploaded_files:
-            try:
-                # Validate file type
-                allowed_extensions = ['.pdf', '.doc', '.docx', '.txt']
-                file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-
-                if file_extension not in allowed_extensions:
-                    messages.warning(request, f'File {uploaded_file.name} has unsupported format. Skipped.')
-                    failed_uploads += 1
-                    continue
-
-                # Validate file size (5MB limit)
-                if uploaded_file.size > 5 * 1024 * 1024:
-                    messages.warning(request, f'File {uploaded_file.name} is too large (max 5MB). Skipped.')
-                    failed_uploads += 1
-                    continue
-
-                # Save file
-                file_path = default_storage.save(
-                    f'resumes/{datetime.now().strftime("%Y/%m/%d")}/{uploaded_file.name}',
-                    ContentFile(uploaded_file.read())
-                )
+@login_required
+def interviews(request):
+    try:
+        mongo = MongoDBConnection()
+        candidates_in_stage = stage_candidates(mongo.get_collection('candidates'), ['interview'])
+    except Exception as e:
+        logger.exception('Error loading interviews')
+        messages.error(request, 'An error occurred while loading interviews.')
+        candidates_in_stage = []
+    return render(request, 'resume_app/interviews.html', {'interviews': candidates_in_stage})
 
-                # Simulate AI parsing (in real implementation, you'd use actual AI/ML libraries)
-                parsed_data = simulate_ai_parsing(uploaded_file.name, file_extension)
-
-                # Check for duplicates
-                existing_candidate = candidate_collection.find_one({
-                    '$or': [
-                        {'email': parsed_data.get('email')},
-                        {'phone': parsed_data.get('phone')},
-                        {'$and': [
-                            {'first_name': parsed_data.get('first_name')},
-                            {'last_name': parsed_data.get('last_name')}
-                        ]}
-                    ]
-                })
+@login_required
+def offers(request):
+    try:
+        mongo = MongoDBConnection()
+        candidates_in_stage = stage_candidates(mongo.get_collection('candidates'), ['offer', 'hired'])
+    except Exception as e:
+        logger.exception('Error loading offers')
+        messages.error(request, 'An error occurred while loading offers.')
+        candidates_in_stage = []
+    return render(request, 'resume_app/offers.html', {'offers': candidates_in_stage})
+
+def process_resume_batch(uploaded_files, username, job_title='', department='', tags='', batch_id=None):
+    """
+    Store, parse and record a batch of resume files uploaded by `username`.
+    Returns one (succeeded, is_duplicate, warning) per file, in file order.
+    Each file's progress is published on the user's event channel under batch_id.
+    """
+    batch_id = batch_id or str(ObjectId())
+    charge_files(len(uploaded_files))
+    mongo = MongoDBConnection()
+    upload_collection = mongo.get_collection('resume_uploads')
+    candidate_collection = mongo.get_collection('candidates')
+    blob_collection = mongo.get_collection(BLOB_COLLECTION)
+    history_collection = mongo.get_collection(HISTORY_COLLECTION)
+    parse_results_collection = mongo.get_collection(PARSE_RESULTS_COLLECTION)
+    rollup_collection = mongo.get_collection(ROLLUP_COLLECTION)
+    job_skills = find_job_skills(mongo.get_collection(JOBS_COLLECTION), job_title)
+    taxonomy = get_skill_taxonomy(mongo.get_collection(SKILL_TAXONOMY_COLLECTION))
+
+    # Files of the batch run concurrently; these serialize the ones that could
+    # turn out to be duplicates of each other (same bytes or same candidate)
+    batch_locks = KeyedLocks()
+
+    def process_file(uploaded_file, held, notify):
+        """Store, parse and record one file; returns (succeeded, is_duplicate, warning)"""
+        # Blob referenced by this file but not yet by an upload record
+        unrecorded_blob = None
+        try:
+            # Validate file type
+            file_extension = os.path.splitext(uploaded_file.name)[1].lower()
 
-                if existing_candidate:
-                    duplicate_count += 1
-                    # Update existing candidate with new resume
-                    candidate_collection.update_one(
-                        {'_id': existing_candidate['_id']},
-                        {
-                            '$set': {
-                                'last_updated': datetime.now(),
-                                'resume_file_path': file_path,
-                                'updated_by': request.user.username
-                            },
-                            '$push': {
-                                'resume_history': {
-                                    'file_path': file_path,
-                                    'upload_date': datetime.now(),
-                                    'uploaded_by': request.user.username
-                                }
-                            }
-                        }
-                    )
-                    candidate_id = existing_candidate['_id']
-                else:
-                    # Create new candidate profile
-                    candidate_data = {
-                        'first_name': parsed_data.get('first_name', ''),
-                        'last_name': parsed_data.get('last_name', ''),
-                        'email': parsed_data.get('email', ''),
-                        'phone': parsed_data.get('phone', ''),
-                        'location': parsed_data.get('location', ''),
-                        'linkedin_url': parsed_data.get('linkedin_url', ''),
-                        'experience': parsed_data.get('experience', []),
-                        'education': parsed_data.get('education', []),
-                        'skills': parsed_data.get('skills', []),
-                        'certifications': parsed_data.get('certifications', []),
-                        'summary': parsed_data.get('summary', ''),
-                        'resume_file_path': file_path,
-                        'job_title_applied': job_title,
-                        'department': department,
-                        'tags': [tag.strip() for tag in tags.split(',') if tag.strip()],
-                        'ai_score': parsed_data.get('ai_score', 0),
-                        'quality_score': parsed_data.get('quality_score', 0),
-                        'status': 'new',
-                        'source': 'resume_upload',
-                        'created_date': datetime.now(),
-                        'created_by': request.user.username,
-                        'last_updated': datetime.now(),
-                        'resume_history': [{
-                            'file_path': file_path,
-                            'upload_date': datetime.now(),
-                            'uploaded_by': request.user.username
-                        }]
-                    }
+            if file_extension not in ALLOWED_EXTENSIONS:
+                return False, False, f'File {uploaded_file.name} has unsupported format. Skipped.'
+
+            # Validate file size (5MB limit)
+            if uploaded_file.size > 5 * 1024 * 1024:
+                return False, False, f'File {uploaded_file.name} is too large (max 5MB). Skipped.'
 
-                    result = candidate_collection.insert_one(candidate_data)
-                    candidate_id = result.inserted_id
+            # Hash the file while spooling it, then store it content-addressed
+            spool_path, content_hash = spool_upload(uploaded_file)
+            held.enter_context(batch_locks.hold(('content_hash', content_hash)))
+            file_path = store_blob(
+                blob_collection, spool_path, content_hash, file_extension, uploaded_file.size
+            )
+            unrecorded_blob = content_hash
+            notify('stored')
 
-                # Record upload activity
+            # Byte-identical resume already processed: skip parsing entirely
+            previous_upload = upload_collection.find_one(
+                {'content_hash': content_hash, 'status': 'completed'},
+                {'candidate_id': 1, 'parse_result_id': 1}
+            )
+            if previous_upload:
                 upload_record = {
                     'filename': uploaded_file.name,
                     'file_path': file_path,
                     'file_size': uploaded_file.size,
                     'file_type': file_extension,
-                    'candidate_id': candidate_id,
-                    'parsed_data': parsed_data,
+                    'content_hash': content_hash,
+                    'candidate_id': previous_upload.get('candidate_id'),
+                    'parse_result_id': previous_upload.get('parse_result_id'),
                     'job_title': job_title,
                     'department': department,
                     'tags': [tag.strip() for tag in tags.split(',') if tag.strip()],
                     'status': 'completed',
                     'upload_date': datetime.now(),
-                    'uploaded_by': request.user.username,
-                    'processing_time': random.uniform(0.5, 3.0),  # Simulated processing time
-                    'is_duplicate': existing_candidate is not None
+                    'uploaded_by': username,
+                    'processing_time': 0.0,
+                    'is_duplicate': True,
+                    'duplicate_of': previous_upload['_id']
+                }
+                upload_collection.insert_one(upload_record)
+                unrecorded_blob = None
+                record_upload(rollup_collection, upload_record)
+                notify('deduplicated', candidate_id=previous_upload.get('candidate_id'))
+                return True, True, None
+
+            # Parse the stored blob in the warm worker pool, which opens the file itself
+            notify('parsing')
+            parse_started = time.perf_counter()
+            try:
+                with local_blob_path(file_path) as local_path:
+                    parsed_data, stamp = parse_resume_data(local_path, uploaded_file.name, file_extension)
+            except ResumeParseError as e:
+                upload_record = {
+                    'filename': uploaded_file.name,
+                    'file_path': file_path,
+                    'file_size': uploaded_file.size,
+                    'file_type': file_extension,
+                    'content_hash': content_hash,
+                    'job_title': job_title,
+                    'department': department,
+                    'tags': [tag.strip() for tag in tags.split(',') if tag.strip()],
+                    'status': 'failed',
+                    'error': str(e),
+                    'upload_date': datetime.now(),
+                    'uploaded_by': username,
+                    'processing_time': time.perf_counter() - parse_started,
+                    'is_duplicate': False
                 }
-
                 upload_collection.insert_one(upload_record)
-                successful_uploads += 1
+                unrecorded_blob = None
+                record_upload(rollup_collection, upload_record)
+                return False, False, f'File {uploaded_file.name} could not be parsed: {e}'
+            processing_time = time.perf_counter() - parse_started
+            parse_result_id = save_parse_result(parse_results_collection, content_hash, parsed_data, stamp)
+            history_entry = {
+                'file_path': file_path,
+                'content_hash': content_hash,
+                'upload_date': datetime.now(),
+                'uploaded_by': username
+            }
 
-            except Exception as e:
-                print(f"Error processing file {uploaded_file.name}: {e}")
-                failed_uploads += 1
-                continue
+            # Check for duplicates through the indexed identity keys
+            candidate_keys = identity_keys(parsed_data)
+            held.enter_context(batch_locks.hold(*[('identity', key) for key in candidate_keys]))
+            existing_candidate = candidate_collection.find_one(
+                {'identity_keys': {'$in': candidate_keys}}, {'_id': 1, 'resume_count': 1}
+            ) if candidate_keys else None
+
+            if existing_candidate:
+                if 'resume_count' not in existing_candidate:
+                    # Written before the history migration: bucket its full history before trimming
+                    migrate_candidate_history(
+                        candidate_collection, history_collection,
+                        candidate_collection.find_one({'_id': existing_candidate['_id']}, {'resume_history': 1})
+                    )
+                # Update existing candidate with new resume
+                candidate_collection.update_one(
+                    {'_id': existing_candidate['_id']},
+                    {
+                        '$set': {
+                            'last_updated': datetime.now(),
+                            'resume_file_path': file_path,
+                            'updated_by': username
+                        },
+                        '$addToSet': {'identity_keys': {'$each': candidate_keys}},
+                        **recent_history_update(history_entry)
+                    }
+                )
+                candidate_id = existing_candidate['_id']
+            else:
+                # Create new candidate profile
+                candidate_data = {
+                    'first_name': parsed_data.get('first_name', ''),
+                    'last_name': parsed_data.get('last_name', ''),
+                    'email': parsed_data.get('email', ''),
+                    'phone': parsed_data.get('phone', ''),
+                    'location': parsed_data.get('location', ''),
+                    'linkedin_url': parsed_data.get('linkedin_url', ''),
+                    **parsed_profile_fields(parsed_data, taxonomy),
+                    'resume_file_path': file_path,
+                    'identity_keys': candidate_keys,
+                    'job_title_applied': job_title,
+                    'department': department,
+                    'tags': [tag.strip() for tag in tags.split(',') if tag.strip()],
+                    'ai_score': parsed_data.get('ai_score', 0),
+                    'status': 'new',
+                    'stage_entered_at': datetime.now(),
+                    'source': 'resume_upload',
+                    'created_date': datetime.now(),
+                    'created_by': username,
+                    'last_updated': datetime.now(),
+                    'resume_history': [history_entry],
+                    'resume_count': 1
+                }
+
+                # Score against the job posting's required skills
+                if job_skills:
+                    candidate_data['ai_score'] = get_matching_engine(candidate_collection).score_skills(
+                        job_skills, candidate_data['skill_ids']
+                    )
+
+                result = candidate_collection.insert_one(candidate_data)
+                candidate_id = result.inserted_id
+                index_candidate(candidate_data)
+                add_to_similarity_index(candidate_id, candidate_data)
+                record_candidate_created(rollup_collection, candidate_data)
+                # Same person re-exported, or the same template: linked for review, never merged
+                near_duplicates = link_near_duplicates(candidate_collection, candidate_id, candidate_data)
+                if near_duplicates:
+                    notify('near_duplicate', candidate_id=candidate_id,
+                           likely_duplicates=[match_id for match_id, _ in near_duplicates])
+
+            append_history(history_collection, candidate_id, history_entry)
+
+            # Record upload activity
+            upload_record = {
+                'filename': uploaded_file.name,
+                'file_path': file_path,
+                'file_size': uploaded_file.size,
+                'file_type': file_extension,
+                'content_hash': content_hash,
+                'candidate_id': candidate_id,
+                'parse_result_id': parse_result_id,
+                'job_title': job_title,
+                'department': department,
+                'tags': [tag.strip() for tag in tags.split(',') if tag.strip()],
+                'status': 'completed',
+                'upload_date': datetime.now(),
+                'uploaded_by': username,
+                'processing_time': processing_time,
+                'is_duplicate': existing_candidate is not None
+            }
+
+            upload_collection.insert_one(upload_record)
+            unrecorded_blob = None
+            record_upload(rollup_collection, upload_record)
+            return True, existing_candidate is not None, None
+
+        except Exception as e:
+            logger.exception('Error processing file %s', uploaded_file.name)
+            if unrecorded_blob is not None:
+                # No upload holds the reference store_blob added, so gc_resume_blobs may reclaim the blob
+                release_blob(blob_collection, unrecorded_blob)
+            return False, False, None
+
+    def run(numbered_file):
+        index, uploaded_file = numbered_file
+        notify = functools.partial(publish_file_state, username, batch_id, index, uploaded_file.name)
+        # Locks taken while processing a file are released when it is done
+        with ExitStack() as held:
+            succeeded, is_duplicate, warning = process_file(uploaded_file, held, notify)
+        if succeeded:
+            notify('completed', is_duplicate=is_duplicate)
+        else:
+            notify('failed', message=warning or f'File {uploaded_file.name} could not be processed.')
+        return succeeded, is_duplicate, warning
+
+    return map_concurrently(
+        run, list(enumerate(uploaded_files)), getattr(settings, 'RESUME_UPLOAD_CONCURRENCY', 8)
+    )
+
+def report_upload_outcomes(request, outcomes):
+    """Flash the per-file warnings and the batch totals; returns the totals"""
+    # Messages are added here, in file order, rather than from the worker threads
+    successful_uploads = 0
+    failed_uploads = 0
+    duplicate_count = 0
+    for succeeded, is_duplicate, warning in outcomes:
+        if warning:
+            messages.warning(request, warning)
+        successful_uploads += succeeded
+        failed_uploads += not succeeded
+        duplicate_count += is_duplicate
+
+    # Provide feedback to user
+    if successful_uploads > 0:
+        messages.success(request, f'Successfully processed {successful_uploads} resume(s).')
 
-        # Provide feedback to user
-        if successful_uploads > 0:
-            messages.success(request, f'Successfully processed {successful_uploads} resume(s).')
+    if duplicate_count > 0:
+        messages.info(request, f'{duplicate_count} duplicate candidate(s) found and updated.')
 
-        if duplicate_count > 0:
-            messages.info(request, f'{duplicate_count} duplicate candidate(s) found and updated.')
+    if failed_uploads > 0:
+        messages.warning(request, f'{failed_uploads} file(s) failed to process.')
+
+    return {'successful': successful_uploads, 'duplicates': duplicate_count, 'failed': failed_uploads}
+
+def handle_resume_upload(request):
+    """Handle resume file uploads and AI processing"""
+    try:
+        uploaded_files = request.FILES.getlist('resume_files')
+        job_title = request.POST.get('job_title', '').strip()
+        department = request.POST.get('department', '').strip()
+        tags = request.POST.get('tags', '').strip()
+
+        if not uploaded_files:
+            messages.error(request, 'Please select at least one resume file to upload.')
+            return redirect('resume_upload')
 
-        if failed_uploads > 0:
-            messages.warning(request, f'{failed_uploads} file(s) failed to process.')
+        outcomes = process_resume_batch(uploaded_files, request.user.username, job_title, department, tags)
+        report_upload_outcomes(request, outcomes)
 
     except Exception as e:
-        print(f"Error in resume upload handler: {e}")
+        logger.exception('Error in resume upload handler')
         messages.error(request, 'An error occurred while processing the uploads.')
 
     return redirect('resume_upload')
 
+def parse_resume_data(path, filename, file_extension):
+    """Parse the resume file at a local path with the configured backend; returns (parsed_data, parser stamp)"""
+    backend = parser_backend()
+    if backend == 'simulated':
+        parsed_data = simulate_ai_parsing(filename, file_extension)
+    else:
+        parsed_data = parse_resume(path, file_extension)
+    return parsed_data, parser_stamp(backend)
+
+def parsed_profile_fields(parsed_data, taxonomy):
+    """
+    Candidate fields derived from a parse result, stored at creation and
+    rewritten by a re-parse. Contact details are left out: they identify the
+    candidate and may have been edited since.
+    """
+    fields = {
+        'experience': parsed_data.get('experience', []),
+        'education': parsed_data.get('education', []),
+        'skills': parsed_data.get('skills', []),
+        'skill_ids': taxonomy.skill_ids(parsed_data.get('skills', [])),
+        'certifications': parsed_data.get('certifications', []),
+        'summary': parsed_data.get('summary', ''),
+        'quality_score': parsed_data.get('quality_score', 0),
+    }
+    # Start/end months per entry, total and per-title years
+    fields.update(experience_timeline(fields['experience']))
+    fields.update(signature_fields(parsed_data))
+    return fields
+
 def simulate_ai_parsing(filename, file_extension):
     """Simulate AI parsing of resume content"""
     # In a real implementation, this would use actual AI/ML libraries
     # like spaCy, transformers, or custom trained models
 
     # Generate realistic mock data based on filename
-    import hashlib
     seed = int(hashlib.md5(filename.encode()).hexdigest()[:8], 16)
-    random.seed(seed)
-
-    first_names = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'Robert', 'Lisa', 'James', 'Maria']
-    last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
-
-    skills_pool = [
-        'Python', 'JavaScript', 'Java', 'React', 'Node.js', 'SQL', 'MongoDB', 'AWS', 'Docker', 'Kubernetes',
-        'Machine Learning', 'Data Analysis', 'Project Management', 'Agile', 'Scrum', 'Git', 'Linux', 'Azure',
-        'Angular', 'Vue.js', 'Django', 'Flask', 'Spring Boot', 'Microservices', 'REST APIs', 'GraphQL'
-    ]
-
-    companies = ['Google', 'Microsoft', 'Amazon', 'Apple', 'Meta', 'Netflix', 'Spotify', 'Uber', 'Airbnb', 'Tesla']
-    universities = ['MIT', 'Stanford', 'Harvard', 'Berkeley', 'CMU', 'Caltech', 'Princeton', 'Yale', 'Columbia', 'Cornell']
-
-    first_name = random.choice(first_names)
-    last_name = random.choice(last_names)
-
-    return {
-        'first_name': first_name,
-        'last_name': last_name,
-        'email': f"{first_name.lower()}.{last_name.lower()}@email.com",
-        'phone': f"+1-{random.randint(100,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}",
-        'location': random.choice(['New York, NY', 'San Francisco, CA', 'Seattle, WA', 'Austin, TX', 'Boston, MA']),
-        'linkedin_url': f"https://linkedin.com/in/{first_name.lower()}-{last_name.lower()}",
-        'experience': [
-            {
-                'title': random.choice(['Software Engineer', 'Senior Developer', 'Tech Lead', 'Product Manager']),
-                'company': random.choice(companies),
-                'duration': f"{random.randint(1,5)} years",
-                'description': 'Led development of scalable web applications and managed cross-functional teams.'
-            }
-        ],
-        'education': [
-            {
-                'degree': random.choice(['Bachelor of Science', 'Master of Science', 'Bachelor of Engineering']),
-                'field': random.choice(['Computer Science', 'Software Engineering', 'Information Technology']),
-                'university': random.choice(universities),
-                'year': random.randint(2015, 2023)
-            }
-        ],
-        'skills': random.sample(skills_pool, random.randint(5, 12)),
-        'certifications': random.sample(['AWS Certified', 'Google Cloud Certified', 'Microsoft Azure Certified'], random.randint(0, 2)),
-        'summary': f"Experienced {random.choice(['software engineer', 'developer', 'technical lead'])} with expertise in modern technologies and agile methodologies.",
-        'ai_score': random.randint(75, 95),
-        'quality_score': random.randint(70, 90)
-    }
+    return synthetic_resume(random.Random(seed))
 
 @login_required
-def resume_upload(request):
+@async_mongo_view
+async def resume_upload(request):
     """Resume Upload page for recruiters with AI-powered parsing"""
+    user = await _resolve_user(request)
     if request.method == 'POST':
-        return handle_resume_upload(request)
+        # Parsing is blocking work, so the upload is handled in a worker thread
+        return await sync_to_async(handle_resume_upload, thread_sensitive=False)(request)
 
     try:
-        # Get recent uploads and statistics
-        mongo = MongoDBConnection()
-
-        # Get recent uploads for this user
-        recent_uploads = list(mongo.get_collection('resume_uploads').find(
-            {'uploaded_by': request.user.username}
-        ).sort('upload_date', -1).limit(10))
-
-        # Get upload statistics
-        total_uploads = mongo.get_collection('resume_uploads').count_documents(
-            {'uploaded_by': request.user.username}
-        )
-
-        # Get processing statistics
-        processing_count = mongo.get_collection('resume_uploads').count_documents(
-            {'uploaded_by': request.user.username, 'status': 'processing'}
-        )
-
-        completed_count = mongo.get_collection('resume_uploads').count_documents(
-            {'uploaded_by': request.user.username, 'status': 'completed'}
+        mongo = AsyncMongoDBConnection()
+        uploads = mongo.get_collection('resume_uploads')
+
+        # Recent uploads, the statistics and the profile the template context
+        # reads are independent, so they are fetched concurrently
+        recent_uploads, total_uploads, processing_count, completed_count, _ = await asyncio.gather(
+            uploads.find({'uploaded_by': user.username}).sort('upload_date', -1).limit(10).to_list(),
+            uploads.count_documents({'uploaded_by': user.username}),
+            uploads.count_documents({'uploaded_by': user.username, 'status': 'processing'}),
+            uploads.count_documents({'uploaded_by': user.username, 'status': 'completed'}),
+            aget_profile(user.username, mongo.get_collection()),
         )
 
         context = {
@@ -484,10 +1120,162 @@ def resume_upload(request):
         return render(request, 'resume_app/resume_upload.html', context)
 
     except Exception as e:
-        print(f"Error in resume upload page: {e}")
+        logger.exception('Error in resume upload page')
         messages.error(request, 'An error occurred while loading the upload page.')
         return redirect('dashboard')
 
+def threaded_view(view):
+    """
+    Serve a blocking view from a worker thread: under ASGI it then neither
+    blocks the event loop nor queues behind the other sync views
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        await _resolve_user(request)
+        return await sync_to_async(view, thread_sensitive=False)(request, *args, **kwargs)
+    return wrapper
+
+def _upload_batch(request, batch_id):
+    """(collection, batch) for one of the current user's chunked upload batches; batch is None if unknown"""
+    collection = MongoDBConnection().get_collection(UPLOAD_BATCH_COLLECTION)
+    if not ObjectId.is_valid(batch_id):
+        return collection, None
+    batch = collection.find_one(
+        {'_id': ObjectId(batch_id), 'uploaded_by': request.user.username}, {'files.chunks': 0}
+    )
+    return collection, batch
+
+@login_required
+@threaded_view
+def upload_batches_api(request):
+    """Open a chunked upload batch: POST JSON {files: [{name, size}], job_title, department, tags}"""
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'POST required'}, status=405)
+    try:
+        payload = json.loads(request.body)
+        if not isinstance(payload, dict) or not isinstance(payload.get('files'), list):
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Expected a JSON object with a files list'}, status=400)
+
+    try:
+        collection = MongoDBConnection().get_collection(UPLOAD_BATCH_COLLECTION)
+        batch = create_batch(
+            collection, request.user.username, payload['files'],
+            job_title=str(payload.get('job_title', '')).strip(),
+            department=str(payload.get('department', '')).strip(),
+            tags=str(payload.get('tags', '')).strip()
+        )
+        return JsonResponse({'status': 'success', **batch_status(batch)}, status=201)
+    except UploadError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=e.status)
+    except Exception as e:
+        logger.exception('Error opening upload batch')
+        return JsonResponse({'status': 'error', 'message': 'Could not start the upload'}, status=500)
+
+@login_required
+@threaded_view
+def upload_batch_api(request, batch_id):
+    """Status of a chunked upload batch, with the offset each file resumes from"""
+    collection, batch = _upload_batch(request, batch_id)
+    if batch is None:
+        return JsonResponse({'status': 'error', 'message': 'Unknown upload batch'}, status=404)
+    return JsonResponse({'status': 'success', **batch_status(batch)})
+
+@login_required
+@threaded_view
+def upload_chunk_api(request, batch_id, index):
+    """PUT the next chunk of file `index` at ?offset=N; X-Chunk-SHA256 is checked when sent"""
+    if request.method != 'PUT':
+        return JsonResponse({'status': 'error', 'message': 'PUT required'}, status=405)
+    collection, batch = _upload_batch(request, batch_id)
+    if batch is None:
+        return JsonResponse({'status': 'error', 'message': 'Unknown upload batch'}, status=404)
+    try:
+        offset = int(request.GET.get('offset', ''))
+        length = int(request.headers.get('Content-Length') or 0)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'offset must be an integer'}, status=400)
+
+    try:
+        received = write_chunk(
+            collection, batch, index, offset, request, length, checksum=request.headers.get('X-Chunk-SHA256')
+        )
+        return JsonResponse({'status': 'success', 'offset': received})
+    except OffsetMismatch as e:
+        return JsonResponse({'status': 'error', 'message': str(e), 'offset': e.offset}, status=e.status)
+    except UploadError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=e.status)
+    except Exception as e:
+        logger.exception('Error writing chunk %s of upload batch %s', index, batch_id)
+        return JsonResponse({'status': 'error', 'message': 'Could not store the chunk'}, status=500)
+
+@login_required
+@threaded_view
+def upload_complete_api(request, batch_id):
+    """Process a fully uploaded batch through the same pipeline as a form upload"""
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'POST required'}, status=405)
+    collection, batch = _upload_batch(request, batch_id)
+    if batch is None:
+        return JsonResponse({'status': 'error', 'message': 'Unknown upload batch'}, status=404)
+
+    try:
+        if not claim_batch(collection, batch):
+            return JsonResponse({'status': 'error', 'message': 'Batch is already processed'}, status=409)
+    except UploadError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=e.status)
+
+    files = []
+    try:
+        files = open_spooled_files(batch)
+        outcomes = process_resume_batch(
+            files, request.user.username, batch['job_title'], batch['department'], batch['tags'],
+            batch_id=str(batch['_id'])
+        )
+    except Exception as e:
+        logger.exception('Error processing upload batch %s', batch_id)
+        # Give the batch back, so completing it again retries without re-uploading
+        collection.update_one({'_id': batch['_id']}, {'$set': {'status': 'open'}})
+        return JsonResponse({'status': 'error', 'message': 'Could not process the uploads'}, status=500)
+    finally:
+        for file in files:
+            file.close()
+
+    totals = report_upload_outcomes(request, outcomes)
+    collection.update_one(
+        {'_id': batch['_id']},
+        {'$set': {'status': 'completed', 'result': totals, 'last_activity': datetime.now()}}
+    )
+    discard_spool(batch['_id'])
+    return JsonResponse({'status': 'success', **totals})
+
+@login_required
+async def progress_events(request):
+    """
+    Server-sent events for the current user: upload file states ('file') and
+    dashboard rollup increments ('rollup'). One long-lived stream per tab;
+    EventSource reconnects with Last-Event-ID and is sent what it missed.
+    """
+    user = await _resolve_user(request)
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+
+    # Under ASGI the stream is a coroutine on the worker's loop; under WSGI it
+    # keeps its thread, as the loop this view runs in ends with the view
+    asynchronous = isinstance(request, ASGIRequest)
+    subscription = broker.subscribe(
+        [user_channel(user.username), ROLLUP_CHANNEL], last_event_id, asynchronous=asynchronous
+    )
+    stream = aevent_stream(subscription) if asynchronous else event_stream(subscription)
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 def handle_password_change(request):
     """Handle password change form submission"""
     try:
@@ -526,8 +1314,7 @@ def handle_password_change(request):
             {'username': request.user.username},
             {
                 '$set': {
-                    'password_hash': new_password_hash,
-                    'last_login': datetime.now()
+                    'password_hash': new_password_hash
                 }
             }
         )
@@ -538,7 +1325,7 @@ def handle_password_change(request):
             messages.error(request, 'Failed to update password.')
 
     except Exception as e:
-        print(f"Error changing password: {e}")
+        logger.exception('Error changing password')
         messages.error(request, 'An error occurred while changing password.')
 
     return redirect('settings')
@@ -562,14 +1349,14 @@ def handle_profile_update(request):
             'full_name': f"{first_name} {last_name}".strip(),
             'profile.location': address,
             'profile.device_info': device_info,
-            'profile.browser_info': browser_info,
-            'last_login': datetime.now()
+            'profile.browser_info': browser_info
         }
 
         result = mongo.get_collection().update_one(
             {'username': request.user.username},
             {'$set': update_data}
         )
+        invalidate_profile(request.user.username)
 
         if result.modified_count > 0:
             messages.success(request, 'Profile updated successfully!')
@@ -577,7 +1364,7 @@ def handle_profile_update(request):
             messages.info(request, 'No changes were made to your profile.')
 
     except Exception as e:
-        print(f"Error updating profile: {e}")
+        logger.exception('Error updating profile')
         messages.error(request, 'An error occurred while updating profile.')
 
     return redirect('settings')
@@ -618,14 +1405,14 @@ def handle_notifications_update(request):
             'preferences.timezone_pref': timezone_pref,
             'preferences.push_notifications': push_notifications,
             'preferences.sms_notifications': sms_notifications,
-            'profile.phone': phone_number,
-            'last_login': datetime.now()
+            'profile.phone': phone_number
         }
 
         result = mongo.get_collection().update_one(
             {'username': request.user.username},
             {'$set': notification_data}
         )
+        invalidate_profile(request.user.username)
 
         if result.modified_count > 0:
             messages.success(request, 'Notification preferences updated successfully!')
@@ -633,7 +1420,7 @@ def handle_notifications_update(request):
             messages.info(request, 'No changes were made to your notification preferences.')
 
     except Exception as e:
-        print(f"Error updating notifications: {e}")
+        logger.exception('Error updating notifications')
         messages.error(request, 'An error occurred while updating notification preferences.')
 
     return redirect('settings')
@@ -656,7 +1443,7 @@ def handle_verification_request(request):
             messages.error(request, 'Invalid verification type.')
 
     except Exception as e:
-        print(f"Error handling verification: {e}")
+        logger.exception('Error handling verification')
         messages.error(request, 'An error occurred during verification process.')
 
     return redirect('settings')
@@ -674,8 +1461,7 @@ def handle_email_verification(request, mongo):
         verification_data = {
             'verification.email_code': verification_code,
             'verification.email_code_expires': datetime.now() + timedelta(minutes=15),
-            'verification.email_attempts': 0,
-            'last_login': datetime.now()
+            'verification.email_attempts': 0
         }
 
         mongo.get_collection().update_one(
@@ -688,7 +1474,7 @@ def handle_email_verification(request, mongo):
         messages.success(request, f'Email verification code sent! (Demo code: {verification_code})')
 
     except Exception as e:
-        print(f"Error in email verification: {e}")
+        logger.exception('Error in email verification')
         messages.error(request, 'Failed to send email verification code.')
 
     return redirect('settings')
@@ -712,20 +1498,20 @@ def handle_phone_verification(request, mongo):
             'verification.phone_code': sms_code,
             'verification.phone_code_expires': datetime.now() + timedelta(minutes=10),
             'verification.phone_attempts': 0,
-            'profile.phone': phone_number,
-            'last_login': datetime.now()
+            'profile.phone': phone_number
         }
 
         mongo.get_collection().update_one(
             {'username': request.user.username},
             {'$set': verification_data}
         )
+        invalidate_profile(request.user.username)
 
         # In a real application, you would send this code via SMS
         messages.success(request, f'SMS verification code sent to {phone_number}! (Demo code: {sms_code})')
 
     except Exception as e:
-        print(f"Error in phone verification: {e}")
+        logger.exception('Error in phone verification')
         messages.error(request, 'Failed to send SMS verification code.')
 
     return redirect('settings')
@@ -745,19 +1531,19 @@ def handle_identity_verification(request, mongo):
             'verification.identity_document_type': document_type,
             'verification.identity_document_number': document_number,
             'verification.identity_status': 'pending',
-            'verification.identity_submitted_at': datetime.now(),
-            'last_login': datetime.now()
+            'verification.identity_submitted_at': datetime.now()
         }
 
         mongo.get_collection().update_one(
             {'username': request.user.username},
             {'$set': verification_data}
         )
+        invalidate_profile(request.user.username)
 
         messages.success(request, 'Identity verification request submitted successfully! Review may take 1-3 business days.')
 
     except Exception as e:
-        print(f"Error in identity verification: {e}")
+        logger.exception('Error in identity verification')
         messages.error(request, 'Failed to submit identity verification.')
 
     return redirect('settings')
@@ -774,14 +1560,14 @@ def handle_two_factor_setup(request, mongo):
             verification_data = {
                 'verification.two_factor_enabled': True,
                 'verification.two_factor_backup_codes': backup_codes,
-                'verification.two_factor_setup_date': datetime.now(),
-                'last_login': datetime.now()
+                'verification.two_factor_setup_date': datetime.now()
             }
 
             mongo.get_collection().update_one(
                 {'username': request.user.username},
                 {'$set': verification_data}
             )
+            invalidate_profile(request.user.username)
 
             messages.success(request, 'Two-factor authentication enabled successfully! Please save your backup codes.')
 
@@ -789,46 +1575,46 @@ def handle_two_factor_setup(request, mongo):
             verification_data = {
                 'verification.two_factor_enabled': False,
                 'verification.two_factor_backup_codes': [],
-                'verification.two_factor_disabled_date': datetime.now(),
-                'last_login': datetime.now()
+                'verification.two_factor_disabled_date': datetime.now()
             }
 
             mongo.get_collection().update_one(
                 {'username': request.user.username},
                 {'$set': verification_data}
             )
+            invalidate_profile(request.user.username)
 
             messages.success(request, 'Two-factor authentication disabled successfully.')
 
     except Exception as e:
-        print(f"Error in two-factor setup: {e}")
+        logger.exception('Error in two-factor setup')
         messages.error(request, 'Failed to update two-factor authentication settings.')
 
     return redirect('settings')
 
 @login_required
-def settings_page(request):
+@async_mongo_view
+async def settings_page(request):
     """Settings page view with MongoDB integration"""
-    if not request.user.is_authenticated:
+    if not (await _resolve_user(request)).is_authenticated:
         return redirect('login')
 
     # Handle form submissions
     if request.method == 'POST':
-        form_type = request.POST.get('form_type')
-
-        if form_type == 'password':
-            return handle_password_change(request)
-        elif form_type == 'profile':
-            return handle_profile_update(request)
-        elif form_type == 'notifications':
-            return handle_notifications_update(request)
-        elif form_type == 'verification':
-            return handle_verification_request(request)
+        form_handlers = {
+            'password': handle_password_change,
+            'profile': handle_profile_update,
+            'notifications': handle_notifications_update,
+            'verification': handle_verification_request,
+        }
+        handler = form_handlers.get(request.POST.get('form_type'))
+        if handler is not None:
+            return await sync_to_async(handler, thread_sensitive=False)(request)
 
     try:
-        # Get user data from MongoDB
-        mongo = MongoDBConnection()
-        user_data = mongo.find_user({'username': request.user.username})
+        # Get user data from the profile cache (read from MongoDB on a miss)
+        collection = AsyncMongoDBConnection().get_collection()
+        user_data = await aget_profile(request.user.username, collection)
         
         if not user_data:
             # If user not found in MongoDB, create basic data matching schema
@@ -868,7 +1654,8 @@ def settings_page(request):
             }
             
             # Save this default data to MongoDB
-            mongo.insert_user(user_data)
+            await collection.insert_one(user_data)
+            user_data = await acache_profile(request.user.username, user_data)
         
         # Ensure profile exists and has employee_id
         if 'profile' not in user_data or not user_data['profile'].get('employee_id'):
@@ -877,11 +1664,18 @@ def settings_page(request):
             user_data['profile']['employee_id'] = f"EMP{datetime.now().strftime('%Y%m%d%H%M%S')}"
             
             # Update MongoDB with employee_id
-            mongo.get_collection().update_one(
+            await collection.update_one(
                 {'username': request.user.username},
                 {'$set': {'profile.employee_id': user_data['profile']['employee_id']}},
                 upsert=True
             )
+            await ainvalidate_profile(request.user.username)
+
+        # The document number and backup codes are kept out of the profile cache
+        verification = user_data.get('verification')
+        if verification:
+            secrets = await aget_verification_secrets(request.user.username, collection)
+            user_data = {**user_data, 'verification': {**verification, **secrets}}
         
         context = {
             'user_data': user_data,
@@ -890,10 +1684,17 @@ def settings_page(request):
         return render(request, 'resume_app/settings.html', context)
         
     except Exception as e:
-        print(f"Error in settings page: {e}")
+        logger.exception('Error in settings page')
         messages.error(request, 'An error occurred while loading settings.')
         return redirect('dashboard')
 
+def metrics(request):
+    """Prometheus scrape endpoint for per-view MongoDB query counts and timings"""
+    allowed = request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    if not allowed and not request.user.is_staff:
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 def debug_mongodb(request):
     """Debug view to check MongoDB data"""
     try:
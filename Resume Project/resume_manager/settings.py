@@ -42,6 +42,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'resume_app.middleware.RequestLoggingMiddleware',
+    'resume_app.middleware.DBMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -139,10 +141,111 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 # Resume storage settings
 RESUME_STORAGE_PATH = BASE_DIR / 'resumes'
+RESUME_BLOB_PREFIX = 'resumes/blobs'  # content-addressed store, fanned out by hash
+
+# Resume parsing ('regex' runs Resume Data Extraction/resume_scraper.py, 'simulated' fakes data)
+RESUME_PARSER_BACKEND = 'regex'
+RESUME_PARSER_PATH = BASE_DIR / 'Resume Data Extraction' / 'resume_scraper.py'
+RESUME_PARSER_WORKERS = None  # defaults to the CPU count
+RESUME_PARSE_TIMEOUT = 20  # seconds per document
+
+# Country code assumed for 10-digit candidate phone numbers when building identity keys
+CANDIDATE_DEFAULT_COUNTRY_CODE = '1'
+
+# Candidates embed only their latest resumes; the full history is kept in buckets
+RESUME_HISTORY_RECENT_LIMIT = 5
+RESUME_HISTORY_BUCKET_SIZE = 50
+
+# Local full-text index (SQLite FTS5) over parsed candidate fields
+SEARCH_INDEX_PATH = BASE_DIR / 'search_index.sqlite3'
+SEARCH_MAX_RANKED = 20000  # broad queries are BM25-ranked over this many newest matches
+
+# Job matching engine: seconds between pulls of new/updated candidates into the skill matrix
+MATCHING_SYNC_INTERVAL = 5
+
+# Similar-candidates index: memory-mapped IVF builds written by build_similarity_index
+SIMILARITY_INDEX_PATH = BASE_DIR / 'similarity_index'
+SIMILARITY_NPROBE = 32  # IVF lists scored per query; higher trades latency for recall
+SIMILARITY_SYNC_INTERVAL = 5
+
+# Near-duplicate resumes: estimated Jaccard similarity of their shingles from which they are linked
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+# Local-memory cache by default; point this at Redis or Memcached so that
+# profile invalidations reach every worker process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'resume-manager',
+    }
+}
+
+# Seconds a cached user profile is served before it is read from MongoDB again
+PROFILE_CACHE_TIMEOUT = 300
+
+# MongoDB budgets per request; requests over either one are logged and counted in /metrics.
+# Measured with load_test: pages and APIs make at most 6 commands, and each uploaded
+# file about 10 (blob, parse result, candidate, history, rollups).
+# MONGO_QUERY_BUDGETS overrides the budget of single views by URL name.
+MONGO_QUERY_BUDGET = 10
+MONGO_QUERY_BUDGETS = {}
+MONGO_QUERY_BUDGET_PER_FILE = 12
+MONGO_TIME_BUDGET_MS = 250
+MONGO_METRICS_HEADERS = DEBUG  # add X-DB-Queries / X-DB-Time-Ms to responses
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# Structured logging: JSON lines written by a background thread, so request
+# threads never block on stderr. Successful requests and other high-volume
+# success messages (logged with extra={'sampled': True}) are kept at this rate.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_SUCCESS_SAMPLE_RATE = float(os.environ.get('LOG_SUCCESS_SAMPLE_RATE', '0.1'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'resume_app.utils.log_utils.JSONFormatter'},
+    },
+    'filters': {
+        'sample_success': {
+            '()': 'resume_app.utils.log_utils.SamplingFilter',
+            'rate': LOG_SUCCESS_SAMPLE_RATE,
+        },
+    },
+    'handlers': {
+        'queued_json': {
+            'class': 'resume_app.utils.log_utils.QueuedStreamHandler',
+            'formatter': 'json',
+            'filters': ['sample_success'],
+        },
+    },
+    'loggers': {
+        'resume_app': {'handlers': ['queued_json'], 'level': LOG_LEVEL, 'propagate': False},
+        'resume_extraction': {'handlers': ['queued_json'], 'level': LOG_LEVEL, 'propagate': False},
+        'django.request': {'handlers': ['queued_json'], 'level': 'ERROR', 'propagate': False},
+    },
+}
+
+# Seconds between batched writes of users' last_login to MongoDB
+LAST_LOGIN_FLUSH_INTERVAL = 5
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+# Uploads above this size are spooled to a temporary file instead of memory,
+# so a batch of 5MB resumes does not sit in RAM while it is processed
+FILE_UPLOAD_MAX_MEMORY_SIZE = 262144  # 256KB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+RESUME_UPLOAD_CHUNK_SIZE = 65536  # 64KB chunks when streaming resumes to storage
+# Files of one multi-file upload processed in parallel threads; 1 processes them one at a time
+RESUME_UPLOAD_CONCURRENCY = 8
+# Chunked, resumable uploads (api/uploads/): chunk size handed to the client,
+# local spool for partly received files and how long an idle batch is kept
+RESUME_CHUNK_SIZE = 1024 * 1024  # 1MB
+RESUME_CHUNK_SPOOL_DIR = None  # defaults to <temp dir>/resume-chunks
+RESUME_UPLOAD_BATCH_TTL = 24 * 3600
+RESUME_UPLOAD_MAX_BATCH = 500
+
+# Seconds between keep-alive comments on idle server-sent event streams (api/events/)
+SSE_HEARTBEAT_SECONDS = 15
 
 # Add this for debugging
 DEBUG = True
@@ -19,19 +19,33 @@ from django.urls import path
 from django.contrib.auth.views import LogoutView
 from django.conf import settings
 from django.conf.urls.static import static
-from resume_app.views import CustomLoginView, dashboard, candidates, interviews, offers, settings_page, register, resume_upload
+from resume_app.views import login_view, dashboard, candidates, candidates_api, candidate_skills_api, candidate_search_api, candidate_match_api, similar_candidates_api, candidate_duplicates_api, candidate_stage_api, pipeline_funnel_api, interviews, offers, settings_page, register, resume_upload, upload_batches_api, upload_batch_api, upload_chunk_api, upload_complete_api, progress_events, metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('login/', CustomLoginView.as_view(), name='login'),
+    path('login/', login_view, name='login'),
     path('register/', register, name='register'),
     path('logout/', LogoutView.as_view(next_page='login'), name='logout'),
     path('', dashboard, name='dashboard'),
     path('candidates/', candidates, name='candidates'),
+    path('api/candidates/', candidates_api, name='candidates_api'),
+    path('api/candidates/search/', candidate_search_api, name='candidate_search_api'),
+    path('api/candidates/skills/', candidate_skills_api, name='candidate_skills_api'),
+    path('api/candidates/match/', candidate_match_api, name='candidate_match_api'),
+    path('api/candidates/similar/', similar_candidates_api, name='similar_candidates_api'),
+    path('api/candidates/<str:candidate_id>/stage/', candidate_stage_api, name='candidate_stage_api'),
+    path('api/candidates/<str:candidate_id>/duplicates/', candidate_duplicates_api, name='candidate_duplicates_api'),
+    path('api/pipeline/funnel/', pipeline_funnel_api, name='pipeline_funnel_api'),
     path('interviews/', interviews, name='interviews'),
     path('offers/', offers, name='offers'),
     path('resume-upload/', resume_upload, name='resume_upload'),
+    path('api/uploads/', upload_batches_api, name='upload_batches_api'),
+    path('api/uploads/<str:batch_id>/', upload_batch_api, name='upload_batch_api'),
+    path('api/uploads/<str:batch_id>/files/<int:index>/', upload_chunk_api, name='upload_chunk_api'),
+    path('api/uploads/<str:batch_id>/complete/', upload_complete_api, name='upload_complete_api'),
+    path('api/events/', progress_events, name='progress_events'),
     path('settings/', settings_page, name='settings'),
+    path('metrics', metrics, name='metrics'),
 ]
 
 # Serve media files during development
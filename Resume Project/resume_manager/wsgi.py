@@ -14,3 +14,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_manager.settings')
 
 application = get_wsgi_application()
+
+# Start the resume parser workers before any Mongo client exists in this process
+from resume_app.utils.parser_pool import warm_parser_pool  # noqa: E402
+warm_parser_pool()
+
+# The skill matrix, which every match request and scored upload needs, loads
+# in the background from the first request on, never at import
+from resume_app.utils.matching_engine import warm_matching_engine_on_first_request  # noqa: E402
+from resume_app.views import MongoDBConnection  # noqa: E402
+warm_matching_engine_on_first_request(lambda: MongoDBConnection().get_collection('candidates'))